@@ -0,0 +1,74 @@
+"""
+Latency of the completion-log queries on a large log (default: one million rows).
+Run from the project root:  python -m benchmarks.bench_history [rows]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+from contextlib import redirect_stdout
+import io
+from datetime import datetime, timedelta
+
+from engine import database
+
+BUDGET_MS = 10.0
+START = datetime(2016, 1, 1)
+
+
+def populate(rows: int, templates: int = 200):
+    conn = database._connect()
+    batch = []
+    for i in range(rows):
+        ts = (START + timedelta(seconds=i * 300)).strftime("%Y-%m-%d %H:%M:%S")
+        batch.append((str(random.randrange(templates)), f"{i}.docx", ts))
+        if len(batch) == 50000:
+            with conn:
+                conn.executemany("INSERT INTO completed_reports (template_id, filename, completed_at) VALUES (?, ?, ?)", batch)
+            batch = []
+    if batch:
+        with conn:
+            conn.executemany("INSERT INTO completed_reports (template_id, filename, completed_at) VALUES (?, ?, ?)", batch)
+
+
+def timed(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv) -> int:
+    rows = int(argv[0]) if argv else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_FILE = os.path.join(tmp, "report_log.db")
+        with redirect_stdout(io.StringIO()):
+            database.init_db()
+        started = time.perf_counter()
+        populate(rows)
+        print(f"populated {rows} rows in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        database.log_task_completions([(i, f"batch_{i}.docx") for i in range(100)])
+        print(f"log_task_completions(100): {(time.perf_counter() - started) * 1000:.2f} ms")
+
+        failed = False
+        for label, fn in [
+            ("get_completed_template_ids", database.get_completed_template_ids),
+            (f"get_all_completed_tasks(limit={database.HISTORY_LIMIT})",
+             lambda: database.get_all_completed_tasks(limit=database.HISTORY_LIMIT)),
+        ]:
+            ms = timed(fn)
+            ok = ms <= BUDGET_MS
+            failed |= not ok
+            print(f"{label}: {ms:.2f} ms {'ok' if ok else f'OVER BUDGET ({BUDGET_MS} ms)'}")
+        database._local.conn.close()
+        database._local.conn = None
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
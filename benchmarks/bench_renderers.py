@@ -0,0 +1,66 @@
+"""
+Throughput of the python-docx renderer vs the compiled zip renderer on every template.
+Run from the project root:  python -m benchmarks.bench_renderers [iterations]
+"""
+import io
+import sys
+import time
+import zipfile
+from contextlib import redirect_stdout
+from lxml import etree
+
+from engine.docx_filler import render_template_bytes
+
+TEMPLATES = [f"default{i}.docx" for i in range(1, 16)]
+
+
+def sample_data(template_filename: str) -> dict:
+    data = {"number": "1234", "num2": "1001", "date": "17/10/2026"}
+    if template_filename == "default12.docx":
+        week = [{f"{r:02}_{c}": str(r + c) for c in range(1, 5)} for r in range(1, 24)]
+        data["weeks"] = [week] * 4
+    return data
+
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def document_text(payload: bytes) -> list:
+    # Visible text per paragraph; run boundaries may legitimately differ between renderers
+    with zipfile.ZipFile(io.BytesIO(payload)) as zf:
+        root = etree.fromstring(zf.read("word/document.xml"))
+    return ["".join(t.text or "" for t in p.iter(W + "t")) for p in root.iter(W + "p")]
+
+
+def bench(template_filename: str, renderer: str, iterations: int) -> float:
+    render_template_bytes(sample_data(template_filename), template_filename, renderer)  # warm caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render_template_bytes(sample_data(template_filename), template_filename, renderer)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    totals = {"docx": 0.0, "compiled": 0.0}
+
+    quiet = io.StringIO()
+    print(f"{'template':<16}{'docx ms':>10}{'compiled ms':>13}{'speedup':>9}  equal")
+    for name in TEMPLATES:
+        with redirect_stdout(quiet):
+            same = document_text(render_template_bytes(sample_data(name), name, "docx")) == \
+                document_text(render_template_bytes(sample_data(name), name, "compiled"))
+            t_docx = bench(name, "docx", iterations)
+            t_compiled = bench(name, "compiled", iterations)
+        totals["docx"] += t_docx
+        totals["compiled"] += t_compiled
+        print(f"{name:<16}{t_docx * 1000:>10.2f}{t_compiled * 1000:>13.2f}{t_docx / t_compiled:>8.1f}x  {same}")
+
+    print(f"{'all 15':<16}{totals['docx'] * 1000:>10.2f}{totals['compiled'] * 1000:>13.2f}"
+          f"{totals['docx'] / totals['compiled']:>8.1f}x")
+    print(f"throughput: docx {len(TEMPLATES) / totals['docx']:.0f} docs/s, "
+          f"compiled {len(TEMPLATES) / totals['compiled']:.0f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Range queries of the schedule engine over many templates.
+Run from the project root:  python -m benchmarks.bench_schedule [templates]
+"""
+import sys
+import time
+import random
+from datetime import date, timedelta
+
+from engine.schedule import ScheduleEngine
+
+
+def random_templates(count: int) -> list:
+    rng = random.Random(1)
+    templates = []
+    for i in range(count):
+        s_type = rng.choice(["daily", "weekly", "monthly", "yearly", "semi_annual"])
+        schedule = {"type": s_type}
+        if s_type == "weekly":
+            schedule["days"] = rng.sample(range(7), rng.randint(1, 3))
+        elif s_type != "daily":
+            schedule["days"] = rng.sample(range(1, 29), rng.randint(1, 3))
+        if s_type == "yearly":
+            schedule["months"] = rng.sample(range(1, 13), 2)
+        templates.append({"id": i, "filename": f"t{i}.docx", "schedule": schedule})
+    return templates
+
+
+def main(argv) -> int:
+    count = int(argv[0]) if argv else 5000
+    year_start = date(date.today().year, 1, 1)
+    year_end = date(year_start.year, 12, 31)
+
+    started = time.perf_counter()
+    engine = ScheduleEngine(random_templates(count))
+    due = engine.due_between(year_start, year_end)
+    print(f"compile + first year query: {(time.perf_counter() - started) * 1000:.1f} ms ({len(due)} due)")
+
+    started = time.perf_counter()
+    engine.due_between(year_start, year_end)
+    print(f"year query: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    started = time.perf_counter()
+    for offset in range(365):
+        engine.due_on(year_start + timedelta(days=offset))
+    print(f"per-day query: {(time.perf_counter() - started) * 1000 / 365:.2f} ms")
+
+    for mode in ("Today", "This Week", "Monthly"):
+        started = time.perf_counter()
+        due = engine.for_mode(mode)
+        print(f"{mode}: {len(due)} due in {(time.perf_counter() - started) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""
+Time to first window, checked against a budget.
+Run from the project root:  python -m benchmarks.bench_startup [runs]
+
+Each run starts main.py in a fresh interpreter (offscreen unless QT_QPA_PLATFORM is set)
+and reads the "First window after" line it prints. It also checks that importing the main
+window does not pull in the modules that are meant to load on first use. Exits non-zero
+when the median run is over STARTUP_BUDGET_MS or a deferred module is imported early.
+"""
+import os
+import re
+import sys
+import statistics
+import subprocess
+
+STARTUP_BUDGET_MS = 1500
+# Needed only once a dialog, preview, import or export runs
+DEFERRED_MODULES = ("docx", "lxml", "fitz", "openpyxl", "comtypes", "yaml")
+
+_FIRST_WINDOW_RE = re.compile(r"First window after (\d+) ms")
+
+
+def first_window_ms() -> int:
+    env = dict(os.environ, DWPT_EXIT_AFTER_SHOW="1")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    proc = subprocess.run([sys.executable, "main.py"], env=env, capture_output=True, text=True, timeout=120)
+    match = _FIRST_WINDOW_RE.search(proc.stdout)
+    if not match:
+        raise RuntimeError(f"main.py exited with {proc.returncode} before showing a window:\n{proc.stderr[-2000:]}")
+    return int(match.group(1))
+
+
+def eager_imports() -> list:
+    code = (
+        "import sys, gui.main_window; "
+        f"print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr[-2000:])
+    return proc.stdout.split()
+
+
+def main(argv) -> int:
+    runs = int(argv[0]) if argv else 3
+    failed = False
+
+    eager = eager_imports()
+    print(f"deferred modules imported by gui.main_window: {', '.join(eager) or 'none'}")
+    failed |= bool(eager)
+
+    timings = [first_window_ms() for _ in range(runs)]
+    median = statistics.median(timings)
+    print(f"first window: median {median:.0f} ms over {runs} run(s) {timings}, budget {STARTUP_BUDGET_MS} ms")
+    failed |= median > STARTUP_BUDGET_MS
+
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
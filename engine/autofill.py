@@ -1,55 +1,135 @@
 import os
+import copy
 import json
+import sqlite3
+import threading
+from datetime import datetime
 
 AUTOFILL_PATH = os.path.join("data", "autofill.json")
+AUTOFILL_DB = os.path.join("data", "autofill.db")
 os.makedirs("data", exist_ok=True)
 
+_local = threading.local()
+_migrate_lock = threading.Lock()
+_cache_lock = threading.Lock()
+_cache = {"stamp": None, "entries": {}}
+# Bumped on every save/clear of an id, so a load that raced with one does not cache stale data
+_generations = {}
 
-def save_autofill_data(template_id: str, data: dict):
-    print(f"[DEBUG] Saving autofill for template ID {template_id}")
-    all_data = {}
-    if os.path.exists(AUTOFILL_PATH):
-        try:
-            with open(AUTOFILL_PATH, "r", encoding="utf-8") as f:
-                all_data = json.load(f)
-        except Exception as e:
-            print(f"[ERROR] Failed to load existing autofill.json: {e}")
 
-    all_data[str(template_id)] = data
+def _db_stamp():
+    try:
+        st = os.stat(AUTOFILL_DB)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
 
+
+def _migrate_json(conn):
+    """Imports the legacy autofill.json once, then renames it so it is never read again."""
+    if not os.path.exists(AUTOFILL_PATH):
+        return
     try:
-        with open(AUTOFILL_PATH, "w", encoding="utf-8") as f:
-            json.dump(all_data, f, ensure_ascii=False, indent=2)
-        print(f"[DEBUG] Autofill saved to {AUTOFILL_PATH}")
+        with open(AUTOFILL_PATH, "r", encoding="utf-8") as f:
+            all_data = json.load(f)
+    except Exception as e:
+        print(f"[ERROR] Failed to load existing autofill.json: {e}")
+        return
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO autofill (template_id, payload, updated_at) VALUES (?, ?, ?)",
+            [(str(tid), json.dumps(data, ensure_ascii=False), now) for tid, data in all_data.items()],
+        )
+    os.replace(AUTOFILL_PATH, AUTOFILL_PATH + ".migrated")
+    print(f"[DEBUG] Migrated {len(all_data)} autofill entries from {AUTOFILL_PATH} to {AUTOFILL_DB}")
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(AUTOFILL_DB, timeout=10)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS autofill (
+                template_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                updated_at TEXT
+            )
+        ''')
+        conn.commit()
+        with _migrate_lock:
+            _migrate_json(conn)
+        _local.conn = conn
+    return conn
+
+
+def _cached_entries():
+    # Must be called with _cache_lock held; drops the cache if the db changed on disk
+    stamp = _db_stamp()
+    if stamp != _cache["stamp"]:
+        _cache["entries"] = {}
+        _cache["stamp"] = stamp
+    return _cache["entries"]
+
+
+def _write(conn, template_id: str, sql: str, params: tuple, value: dict) -> int:
+    """Runs one write and caches `value` for the id under the same lock, taking the db stamp
+    of our own write so it does not drop the rest of the cache. Returns the rowcount."""
+    with _cache_lock:
+        entries = _cached_entries()
+        with conn:
+            rowcount = conn.execute(sql, params).rowcount
+        _generations[template_id] = _generations.get(template_id, 0) + 1
+        _cache["stamp"] = _db_stamp()
+        entries[template_id] = value
+    return rowcount
+
+
+def save_autofill_data(template_id: str, data: dict):
+    print(f"[DEBUG] Saving autofill for template ID {template_id}")
+    try:
+        payload = json.dumps(data, ensure_ascii=False)
+        _write(
+            _connect(), str(template_id),
+            "INSERT OR REPLACE INTO autofill (template_id, payload, updated_at) VALUES (?, ?, ?)",
+            (str(template_id), payload, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            json.loads(payload),
+        )
+        print(f"[DEBUG] Autofill saved to {AUTOFILL_DB}")
     except Exception as e:
         print(f"[ERROR] Failed to save autofill data: {e}")
 
 
 def load_autofill_data(template_id: str) -> dict:
-    if not os.path.exists(AUTOFILL_PATH):
-        print(f"[DEBUG] Autofill file not found: {AUTOFILL_PATH}")
-        return {}
-
+    template_id = str(template_id)
     try:
-        with open(AUTOFILL_PATH, "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-            return all_data.get(str(template_id), {})
+        conn = _connect()
+        while True:
+            with _cache_lock:
+                entries = _cached_entries()
+                if template_id in entries:
+                    return copy.deepcopy(entries[template_id])
+                generation = _generations.get(template_id, 0)
+
+            row = conn.execute("SELECT payload FROM autofill WHERE template_id = ?", (template_id,)).fetchone()
+            data = json.loads(row[0]) if row else {}
+            with _cache_lock:
+                if _generations.get(template_id, 0) == generation:
+                    _cached_entries().setdefault(template_id, data)
+                    return copy.deepcopy(data)
+            # Saved or cleared while we were reading: what we read may be stale, look again
     except Exception as e:
         print(f"[ERROR] Failed to load autofill: {e}")
         return {}
 
 
 def clear_autofill_data(template_id: str):
-    if not os.path.exists(AUTOFILL_PATH):
-        return
-
     try:
-        with open(AUTOFILL_PATH, "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-        if str(template_id) in all_data:
-            del all_data[str(template_id)]
-            with open(AUTOFILL_PATH, "w", encoding="utf-8") as f:
-                json.dump(all_data, f, ensure_ascii=False, indent=2)
+        # A cleared id loads as {}, so that is what is cached
+        deleted = _write(_connect(), str(template_id), "DELETE FROM autofill WHERE template_id = ?",
+                         (str(template_id),), {})
+        if deleted:
             print(f"[DEBUG] Cleared autofill for {template_id}")
     except Exception as e:
         print(f"[ERROR] Failed to clear autofill for {template_id}: {e}")
@@ -0,0 +1,147 @@
+"""
+Headless batch export, for cron jobs and servers without a display.
+
+    python -m engine.batch --mode today [--date 2026-10-17] [--jobs 8] [--ids 1001,1003]
+                           [--dry-run] [--no-log] [--output summary.json]
+
+Selects the templates due for the mode on the given date with the same schedule engine as
+the dashboard, exports them through engine.export_pipeline and prints a JSON summary with
+per-template timings. Log lines go to stderr so stdout holds only the JSON. Exits 1 when
+any export failed or was cancelled (SIGINT/SIGTERM), 2 on invalid arguments.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from engine.config_snapshot import load_templates
+from engine.database import init_db
+from engine.export_pipeline import run_export, count_statuses, default_jobs
+from engine.pdf_service import get_pdf_service
+from engine.schedule import EXPORT_MODES, ScheduleEngine
+
+MODE_ALIASES = {
+    "today": "Today",
+    "week": "This Week",
+    "month": "Monthly",
+}
+
+
+def parse_mode(value: str) -> str:
+    mode = MODE_ALIASES.get(value.lower(), value)
+    if mode not in EXPORT_MODES:
+        raise argparse.ArgumentTypeError(
+            f"unknown mode {value!r} (choose from {', '.join(list(MODE_ALIASES) + list(EXPORT_MODES))})")
+    return mode
+
+
+def parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m engine.batch", description="Export the reports due for a mode.")
+    parser.add_argument("--mode", type=parse_mode, default="Today", help="today, week or month (default: today)")
+    parser.add_argument("--date", type=parse_date, default=None, help="reference date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--jobs", type=int, default=None, help="fill processes (default: DWPT_EXPORT_JOBS or CPU count)")
+    parser.add_argument("--convert-jobs", type=int, default=None, help="documents converted at once")
+    parser.add_argument("--ids", default=None, help="comma-separated template ids to restrict the export to")
+    parser.add_argument("--dry-run", action="store_true", help="list the due templates without exporting")
+    parser.add_argument("--no-log", action="store_true", help="do not record completions in the database")
+    parser.add_argument("--output", default=None, help="also write the JSON summary to this file")
+    return parser
+
+
+@contextmanager
+def stdout_to_stderr():
+    """Points fd 1 at stderr (this process and the fill workers it spawns); yields the real stdout."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    os.dup2(2, 1)
+    try:
+        with os.fdopen(os.dup(saved), "w", encoding="utf-8") as real_stdout:
+            yield real_stdout
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+
+
+def export_due(mode: str, day: date, jobs: int = None, convert_jobs: int = None, ids=None,
+               dry_run: bool = False, log_completion: bool = True, is_cancelled=None) -> dict:
+    """Runs the export and returns the summary dict."""
+    started = time.perf_counter()
+    templates = load_templates()
+    engine = ScheduleEngine(templates)
+    due = engine.for_mode(mode, day)
+    if ids is not None:
+        due = [t for t in due if str(t["id"]) in ids]
+
+    bounds, _ = EXPORT_MODES[mode]
+    start, end = bounds(day)
+    summary = {
+        "mode": mode,
+        "date": day.isoformat(),
+        "range": [start.isoformat(), end.isoformat()],
+        "jobs": max(1, jobs or default_jobs()),
+        "due": len(due),
+    }
+    if dry_run:
+        summary["templates"] = [{"id": str(t["id"]), "filename": t["filename"]} for t in due]
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return summary
+
+    init_db()
+    results = run_export(due, jobs=jobs, convert_jobs=convert_jobs, is_cancelled=is_cancelled,
+                         log_completion=log_completion) if due else []
+    summary.update(count_statuses(results))
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    summary["pdf_service"] = get_pdf_service().metrics()
+    summary["templates"] = results
+    return summary
+
+
+def main(argv) -> int:
+    args = build_parser().parse_args(argv)
+    ids = {i.strip() for i in args.ids.split(",") if i.strip()} if args.ids else None
+
+    cancelled = []
+
+    def request_cancel(signum, _frame):
+        print(f"[WARN] Signal {signum} received, cancelling export", file=sys.stderr)
+        cancelled.append(signum)
+
+    signal.signal(signal.SIGINT, request_cancel)
+    signal.signal(signal.SIGTERM, request_cancel)
+
+    with stdout_to_stderr() as out:
+        try:
+            summary = export_due(
+                args.mode, args.date or date.today(), jobs=args.jobs, convert_jobs=args.convert_jobs,
+                ids=ids, dry_run=args.dry_run, log_completion=not args.no_log,
+                is_cancelled=lambda: bool(cancelled),
+            )
+        except Exception as e:
+            print(f"[ERROR] Batch export failed: {e}")
+            summary = {"mode": args.mode, "error": str(e)}
+
+        text = json.dumps(summary, ensure_ascii=False, indent=2)
+        out.write(text + "\n")
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+
+    if "error" in summary:
+        return 1
+    return 1 if summary.get("failed") or summary.get("cancelled") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,184 @@
+import re
+import io
+import zlib
+import struct
+import zipfile
+from xml.sax.saxutils import escape
+from lxml import etree
+from docx.oxml import parse_xml
+
+from engine.placeholders import substitute_element, scalar_values, SubstitutionReport
+from engine.template_cache import load_cached
+
+# Parts whose placeholders are compiled into slots; every other member is copied as-is
+_CONTENT_PART_RE = re.compile(r"^word/(document|header\d*|footer\d*)\.xml$")
+
+# Slot markers use private-use code points, which never occur in our templates
+_SLOT_OPEN = "\ue000"
+_SLOT_CLOSE = "\ue001"
+_SLOT_RE = re.compile(re.escape(_SLOT_OPEN.encode("utf-8")) + rb"(\d+)" + re.escape(_SLOT_CLOSE.encode("utf-8")))
+
+# Same characters lxml refuses when python-docx sets run text
+_INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+
+class _SlotRecorder(dict):
+    """Values mapping that accepts every placeholder and replaces it with a numbered marker."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = []
+
+    def __contains__(self, name):
+        return True
+
+    def __getitem__(self, name):
+        self.names.append(name)
+        return f"{_SLOT_OPEN}{len(self.names) - 1}{_SLOT_CLOSE}"
+
+
+class CompiledTemplate:
+    """
+    A template split into literal XML chunks and placeholder slots.
+    `members` keeps the zip order; each entry is (ZipInfo, raw compressed bytes) for copied
+    members or (ZipInfo, tokens) for compiled parts, where tokens alternate bytes / slot name.
+    """
+
+    def __init__(self, template_filename, members):
+        self.template_filename = template_filename
+        self.members = members
+
+    @property
+    def slot_names(self) -> set:
+        names = set()
+        for info, payload in self.members:
+            if isinstance(payload, list):
+                names.update(t for t in payload if isinstance(t, str))
+        return names
+
+
+def _read_raw_member(f, info: zipfile.ZipInfo) -> bytes:
+    f.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    name_len, extra_len = header[10], header[11]
+    f.seek(info.header_offset + _LOCAL_HEADER.size + name_len + extra_len)
+    return f.read(info.compress_size)
+
+
+def _compile_part(xml: bytes) -> list:
+    root = parse_xml(xml)
+    recorder = _SlotRecorder()
+    substitute_element(root, recorder)
+    serialized = etree.tostring(root, encoding="UTF-8", standalone=True)
+
+    tokens = []
+    pos = 0
+    for match in _SLOT_RE.finditer(serialized):
+        tokens.append(serialized[pos:match.start()])
+        tokens.append(recorder.names[int(match.group(1))])
+        pos = match.end()
+    tokens.append(serialized[pos:])
+    return tokens
+
+
+def compile_template_file(path: str) -> CompiledTemplate:
+    members = []
+    with open(path, "rb") as f, zipfile.ZipFile(f) as zf:
+        for info in zf.infolist():
+            if _CONTENT_PART_RE.match(info.filename):
+                members.append((info, _compile_part(zf.read(info))))
+            else:
+                members.append((info, _read_raw_member(f, info)))
+    return CompiledTemplate(path, members)
+
+
+def get_compiled_template(template_filename: str) -> CompiledTemplate:
+    return load_cached(template_filename, "compiled", compile_template_file)
+
+
+def _render_tokens(tokens: list, values: dict, report: SubstitutionReport) -> bytes:
+    out = []
+    for token in tokens:
+        if isinstance(token, bytes):
+            out.append(token)
+            continue
+        if token in values:
+            report.record(token, True)
+            out.append(values[token])
+        else:
+            report.record(token, False)
+            out.append(("{{" + token + "}}").encode("utf-8"))
+    return b"".join(out)
+
+
+def _encode_values(data: dict) -> dict:
+    values = {}
+    for key, value in scalar_values(data).items():
+        if _INVALID_XML_RE.search(value):
+            raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+        values[key] = escape(value).encode("utf-8")
+    return values
+
+
+def _write_zip(members) -> bytes:
+    """
+    Writes (ZipInfo, compressed bytes, crc, uncompressed size) entries into a new archive
+    without recompressing them.
+    """
+    out = io.BytesIO()
+    central = []
+    for info, raw, crc, size in members:
+        name = info.filename.encode("utf-8")
+        flags = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+        dos_time = (info.date_time[3] << 11) | (info.date_time[4] << 5) | (info.date_time[5] // 2)
+        dos_date = ((info.date_time[0] - 1980) << 9) | (info.date_time[1] << 5) | info.date_time[2]
+        offset = out.tell()
+
+        out.write(_LOCAL_HEADER.pack(
+            b"PK\003\004", info.extract_version, info.reserved, flags, info.compress_type,
+            dos_time, dos_date, crc, len(raw), size, len(name), 0,
+        ))
+        out.write(name)
+        out.write(raw)
+
+        central.append(_CENTRAL_DIR.pack(
+            b"PK\001\002", info.create_version, info.create_system, info.extract_version,
+            info.reserved, flags, info.compress_type, dos_time, dos_date, crc, len(raw), size,
+            len(name), 0, 0, 0, info.internal_attr, info.external_attr, offset,
+        ) + name)
+
+    cd_offset = out.tell()
+    for entry in central:
+        out.write(entry)
+    cd_size = out.tell() - cd_offset
+    out.write(_END_RECORD.pack(b"PK\005\006", 0, 0, len(central), len(central), cd_size, cd_offset, 0))
+    return out.getvalue()
+
+
+def render_compiled(compiled: CompiledTemplate, data: dict):
+    """
+    Renders scalar placeholders of a compiled template straight into a new .docx.
+    Returns (docx bytes, SubstitutionReport).
+    """
+    values = _encode_values(data)
+    report = SubstitutionReport(data.keys())
+
+    members = []
+    for info, payload in compiled.members:
+        if isinstance(payload, bytes):
+            members.append((info, payload, info.CRC, info.file_size))
+            continue
+        xml = _render_tokens(payload, values, report)
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            raw = compressor.compress(xml) + compressor.flush()
+        else:
+            raw = xml
+        members.append((info, raw, zlib.crc32(xml), len(xml)))
+
+    return _write_zip(members), report
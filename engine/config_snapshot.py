@@ -0,0 +1,204 @@
+"""
+Compiled snapshot of the YAML configuration.
+
+Each source (config/task_rules.yaml, config/template_fields.yaml) is parsed once with the
+libyaml loader when available, validated, and stored in data/config_snapshot.json together
+with its mtime, size and sha256. A later load uses the snapshot as is while the source's
+mtime and size are unchanged; when either changed the source is hashed, and it is parsed
+again only if the sha256 differs too (a touched but unchanged file just updates mtime/size).
+
+    python -m engine.config_snapshot     validate both files and rebuild the snapshot
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import threading
+
+from engine.schedule import SCHEDULE_TYPES
+
+RULES_PATH = os.path.join("config", "task_rules.yaml")
+FIELDS_PATH = os.path.join("config", "template_fields.yaml")
+SNAPSHOT_PATH = os.path.join("data", "config_snapshot.json")
+SNAPSHOT_VERSION = 1
+
+_REMINDER_RE = re.compile(r"^\d{1,2}:\d{2}$")
+
+_lock = threading.RLock()
+_snapshot = None  # {"version", "sources": {path: {"sha256", "mtime_ns", "size", "data"}}}
+
+
+def validate_task_rules(data) -> list:
+    """Problems in task_rules.yaml as readable lines."""
+    if not isinstance(data, dict) or not isinstance(data.get("templates", []), list):
+        return [f"{RULES_PATH}: expected a 'templates' list"]
+    problems = []
+    seen = set()
+    for i, template in enumerate(data.get("templates") or []):
+        where = f"{RULES_PATH}: templates[{i}]"
+        if not isinstance(template, dict):
+            problems.append(f"{where}: not a mapping")
+            continue
+        for key in ("id", "filename"):
+            if key not in template:
+                problems.append(f"{where}: missing '{key}'")
+        if template.get("id") in seen:
+            problems.append(f"{where}: duplicate id {template.get('id')}")
+        seen.add(template.get("id"))
+
+        schedule = template.get("schedule")
+        s_type = schedule if isinstance(schedule, str) else (schedule or {}).get("type", "daily")
+        if s_type not in SCHEDULE_TYPES:
+            problems.append(f"{where}: unknown schedule type {s_type!r}")
+        if isinstance(schedule, dict):
+            for key in ("days", "months"):
+                values = schedule.get(key) or []
+                if not isinstance(values, list) or not all(isinstance(v, int) for v in values):
+                    problems.append(f"{where}: schedule.{key} must be a list of integers")
+
+        reminder = template.get("reminder_time")
+        if reminder is not None and not isinstance(reminder, int) and not _REMINDER_RE.match(str(reminder)):
+            problems.append(f"{where}: reminder_time {reminder!r} is not HH:MM")
+    return problems
+
+
+def validate_template_fields(data) -> list:
+    from engine.field_config import compile_fields
+
+    if not isinstance(data, dict):
+        return [f"{FIELDS_PATH}: expected a mapping of template filenames"]
+    problems = []
+    compile_fields(data, problems)
+    return [f"{FIELDS_PATH}: {problem}" for problem in problems]
+
+
+VALIDATORS = {
+    RULES_PATH: validate_task_rules,
+    FIELDS_PATH: validate_template_fields,
+}
+
+
+def yaml_loader():
+    """The libyaml-backed safe loader when PyYAML was built with it."""
+    import yaml  # only needed when a source has to be parsed
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_yaml(payload: bytes):
+    import yaml
+
+    return yaml.load(payload, Loader=yaml_loader())
+
+
+def _load_snapshot() -> dict:
+    # Must be called with _lock held
+    global _snapshot
+    if _snapshot is None:
+        try:
+            with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                _snapshot = json.load(f)
+        except (OSError, ValueError):
+            _snapshot = None
+        if not isinstance(_snapshot, dict) or _snapshot.get("version") != SNAPSHOT_VERSION:
+            _snapshot = {"version": SNAPSHOT_VERSION, "sources": {}}
+    return _snapshot
+
+
+def _save_snapshot(snapshot: dict):
+    try:
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+        tmp_path = f"{SNAPSHOT_PATH}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except OSError as e:
+        print(f"[WARN] Could not write {SNAPSHOT_PATH}: {e}")
+
+
+def _snapshot_safe(data) -> bool:
+    """True when the data survives a JSON round trip unchanged (no dates, non-string keys...)."""
+    try:
+        return json.loads(json.dumps(data)) == data
+    except (TypeError, ValueError):
+        return False
+
+
+def load_yaml(path: str, problems: list = None):
+    """The parsed content of a config file, from the snapshot when the source is unchanged.
+    Validation problems of a fresh parse go into `problems` when given, as warnings otherwise."""
+    with _lock:
+        snapshot = _load_snapshot()
+        entry = snapshot["sources"].get(path)
+        st = os.stat(path)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["data"]
+
+        with open(path, "rb") as f:
+            payload = f.read()
+        digest = hashlib.sha256(payload).hexdigest()
+        if entry and entry["sha256"] == digest:
+            # Touched but not changed
+            entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+            _save_snapshot(snapshot)
+            return entry["data"]
+
+        data = parse_yaml(payload)
+        print(f"[DEBUG] Parsed {path} ({yaml_loader().__name__})")
+        validator = VALIDATORS.get(path)
+        found = validator(data) if validator else []
+        if problems is not None:
+            problems.extend(found)
+        else:
+            for problem in found:
+                print(f"[WARN] {problem}")
+
+        if _snapshot_safe(data):
+            snapshot["sources"][path] = {
+                "sha256": digest, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data,
+            }
+            _save_snapshot(snapshot)
+        else:
+            snapshot["sources"].pop(path, None)
+            print(f"[WARN] {path} has values JSON cannot hold; it will be parsed on every load")
+        return data
+
+
+def load_templates(strict: bool = False) -> list:
+    """The `templates` list of task_rules.yaml; [] when it cannot be read, unless `strict`."""
+    try:
+        data = load_yaml(RULES_PATH)
+    except Exception as e:
+        if strict:
+            raise
+        print(f"[ERROR] Failed to load {RULES_PATH}: {e}")
+        return []
+    return (data or {}).get("templates") or []
+
+
+def compile_config() -> list:
+    """Re-parses and validates every source and rewrites the snapshot; returns the problems."""
+    global _snapshot
+    problems = []
+    with _lock:
+        _snapshot = {"version": SNAPSHOT_VERSION, "sources": {}}
+        for path in VALIDATORS:
+            try:
+                load_yaml(path, problems)
+            except Exception as e:
+                problems.append(f"{path}: {e}")
+    return problems
+
+
+def main(argv=None) -> int:
+    problems = compile_config()
+    for problem in problems:
+        print(problem)
+    sources = _load_snapshot()["sources"]
+    print(f"{len(sources)} source(s) compiled into {SNAPSHOT_PATH}, {len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
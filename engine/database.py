@@ -1,54 +1,117 @@
 import sqlite3
+import threading
 from datetime import datetime
 import os
 
 DB_FILE = os.path.join("data", "report_log.db")
+HISTORY_LIMIT = 1000
 
-def init_db():
-    os.makedirs("data", exist_ok=True)
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
+# (version, statements); applied in order, tracked with PRAGMA user_version
+MIGRATIONS = [
+    (1, [
+        '''
         CREATE TABLE IF NOT EXISTS completed_reports (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             template_id TEXT,
             filename TEXT,
             completed_at TEXT
         )
-    ''')
-    conn.commit()
-    conn.close()
+        ''',
+    ]),
+    (2, [
+        'CREATE INDEX IF NOT EXISTS idx_completed_reports_template ON completed_reports (template_id)',
+        'CREATE INDEX IF NOT EXISTS idx_completed_reports_completed_at ON completed_reports (completed_at)',
+    ]),
+    (3, [
+        # One row per template so the dashboard never scans the whole log
+        '''
+        CREATE TABLE IF NOT EXISTS template_status (
+            template_id TEXT PRIMARY KEY,
+            last_completed_at TEXT,
+            completed_count INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        INSERT OR REPLACE INTO template_status (template_id, last_completed_at, completed_count)
+        SELECT template_id, MAX(completed_at), COUNT(*) FROM completed_reports GROUP BY template_id
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_completed_reports_status
+        AFTER INSERT ON completed_reports
+        BEGIN
+            INSERT INTO template_status (template_id, last_completed_at, completed_count)
+            VALUES (NEW.template_id, NEW.completed_at, 1)
+            ON CONFLICT(template_id) DO UPDATE SET
+                last_completed_at = MAX(last_completed_at, excluded.last_completed_at),
+                completed_count = completed_count + 1;
+        END
+        ''',
+    ]),
+]
+
+_local = threading.local()
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_FILE:
+        os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+        conn = sqlite3.connect(DB_FILE, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        _local.conn, _local.path = conn, DB_FILE
+    return conn
+
+
+def _migrate(conn):
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        with conn:
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute(f'PRAGMA user_version = {target}')
+        print(f"[DEBUG] Migrated {DB_FILE} to schema version {target}")
+
+
+def init_db():
+    _migrate(_connect())
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
 
 def log_task_completion(template_id, filename):
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO completed_reports (template_id, filename, completed_at)
-        VALUES (?, ?, ?)
-    ''', (str(template_id), os.path.basename(filename), now))
-    conn.commit()
-    conn.close()
+    log_task_completions([(template_id, filename)])
+
+
+def log_task_completions(entries):
+    """Logs several (template_id, filename) completions in one transaction."""
+    now = _now()
+    conn = _connect()
+    with conn:
+        conn.executemany('''
+            INSERT INTO completed_reports (template_id, filename, completed_at)
+            VALUES (?, ?, ?)
+        ''', [(str(template_id), os.path.basename(filename), now) for template_id, filename in entries])
+
 
 def get_completed_template_ids():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('SELECT DISTINCT template_id FROM completed_reports')
-    ids = [row[0] for row in c.fetchall()]
-    conn.close()
-    return ids
-
-def get_all_completed_tasks():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('SELECT template_id, filename, completed_at FROM completed_reports ORDER BY completed_at DESC')
-    rows = c.fetchall()
-    conn.close()
-    return rows
+    c = _connect().execute('SELECT template_id FROM template_status')
+    return [row[0] for row in c.fetchall()]
+
+
+def get_all_completed_tasks(limit=None):
+    sql = 'SELECT template_id, filename, completed_at FROM completed_reports ORDER BY completed_at DESC'
+    if limit:
+        return _connect().execute(sql + ' LIMIT ?', (int(limit),)).fetchall()
+    return _connect().execute(sql).fetchall()
+
 
 def clear_all_completed_tasks():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('DELETE FROM completed_reports')
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    with conn:
+        conn.execute('DELETE FROM completed_reports')
+        conn.execute('DELETE FROM template_status')
@@ -1,81 +1,21 @@
+import io
 import os
-from docx import Document
 from datetime import datetime
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Pt
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from tempfile import NamedTemporaryFile
 
 from engine.utils import compute_monthly_summary
+from engine.template_cache import load_template
+from engine.compiled_renderer import get_compiled_template, render_compiled
+from engine.placeholders import substitute_document, substitute_text
+from engine.table_rows import expand_rows
+from engine.table_binding import get_table_bindings, bound_rows
+from engine.field_config import table_columns
 
 
-def fill_template(data: dict, template_filename: str, preview_mode: bool = False) -> str:
-    template_path = os.path.abspath(os.path.join("templates", template_filename))
-    doc = Document(template_path)
+RENDERERS = ("docx", "compiled")
 
-    align_map = {
-        "left": WD_ALIGN_PARAGRAPH.LEFT,
-        "center": WD_ALIGN_PARAGRAPH.CENTER,
-        "right": WD_ALIGN_PARAGRAPH.RIGHT
-    }
 
-    # 🔁 Replace placeholders in paragraphs
-    for p in doc.paragraphs:
-        full_text = "".join(run.text for run in p.runs)
-        replaced = full_text
-        for key, value in data.items():
-            placeholder = f"{{{{{key}}}}}"
-            if placeholder in replaced:
-                replaced = replaced.replace(placeholder, str(value))
-
-        if replaced != full_text:
-            for run in p.runs:
-                run.text = ""
-            if p.runs:
-                p.runs[0].text = replaced
-            else:
-                p.add_run(replaced)
-            if "{{" in replaced:
-                print("[WARN] Unreplaced placeholder found:", replaced)
-
-    # 🔁 Replace placeholders in tables
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for key, value in data.items():
-                    placeholder = f"{{{{{key}}}}}"
-                    if isinstance(value, str) and placeholder in cell.text:
-                        cell.text = cell.text.replace(placeholder, value)
-
-        # Structured tables (dynamic rows)
-        for key, value in data.items():
-            if isinstance(value, list) and value and isinstance(value[0], dict):
-                placeholder_row = None
-                for row in table.rows:
-                    if any("{{" in cell.text for cell in row.cells):
-                        placeholder_row = row
-                        break
-                if not placeholder_row:
-                    continue
-
-                tbl = table._tbl
-                tbl.remove(placeholder_row._tr)
-
-                for row_data in value:
-                    new_row = table.add_row()
-                    for j, (col_name, cell_data) in enumerate(row_data.items()):
-                        text = str(cell_data.get("text", ""))
-                        align = align_map.get(cell_data.get("align", "left"), WD_ALIGN_PARAGRAPH.LEFT)
-                        cell = new_row.cells[j]
-                        cell.text = ""
-                        p = cell.paragraphs[0]
-                        run = p.add_run(text)
-                        run.font.size = Pt(10)
-                        p.alignment = align
-
-                        
-        # 📊 Compute summary from weekly data (general case)
+def prepare_data(data: dict, template_filename: str) -> dict:
+    # 📊 Compute summary from weekly data (general case)
     if "week_data" in data and isinstance(data["week_data"], list):
         weeks = data["week_data"]
 
@@ -85,48 +25,118 @@ def fill_template(data: dict, template_filename: str, preview_mode: bool = False
         data["monthly_total_incidents"] = sum(safe_int(w.get("incidents", 0)) for w in weeks)
         data["monthly_total_repairs"] = sum(safe_int(w.get("repairs", 0)) for w in weeks)
 
-        # ✅ Compute monthly summary (for default12.docx)
+    # ✅ Compute monthly summary (for default12.docx)
     if template_filename == "default12.docx":
         weeks = data.get("weeks", [])
         if isinstance(weeks, list) and len(weeks) == 4:
             summary = compute_monthly_summary(weeks)
             data.update(summary)
 
+    return data
+
+
+def has_dynamic_tables(data: dict) -> bool:
+    return any(isinstance(v, list) and v and isinstance(v[0], dict) for v in data.values())
+
+
+def build_document(data: dict, template_filename: str):
+    """
+    Fills the template through the python-docx object model and returns the Document.
+    """
+    doc = load_template(template_filename)
+
+    # 🔁 Replace scalar placeholders (body, tables, headers, footers) in one pass
+    report = substitute_document(doc, data)
+
+    # Structured tables (dynamic rows): only the rows each list field is bound to
+    configured = table_columns(template_filename)
+    fields = {
+        key: configured.get(key) or list(value[0])
+        for key, value in data.items()
+        if isinstance(value, list) and value and isinstance(value[0], dict)
+    }
+    if fields:
+        for key, tr in bound_rows(doc, get_table_bindings(template_filename), fields, template_filename):
+            report.consume([key])
+            report.consume(expand_rows(tr, data[key]))
+
+    report.log(template_filename)
+    return doc
+
+
+def render_template_bytes(data: dict, template_filename: str, renderer: str = "docx") -> bytes:
+    """
+    Fills the template and returns the .docx content.
+    renderer="compiled" writes precompiled XML chunks straight into the zip; it only handles
+    scalar placeholders, so data with dynamic tables always goes through python-docx.
+    """
+    if renderer not in RENDERERS:
+        raise ValueError(f"Unknown renderer: {renderer}")
 
-    # 📄 Save output file
-    if preview_mode:
-        temp_file = NamedTemporaryFile(delete=False, suffix=".docx")
-        doc.save(temp_file.name)
-        print(f"[DEBUG] Filled template (preview): {template_filename} -> {temp_file.name}")
-        return temp_file.name
+    prepare_data(data, template_filename)
 
+    if renderer == "compiled" and not has_dynamic_tables(data):
+        payload, report = render_compiled(get_compiled_template(template_filename), data)
+        report.log(template_filename)
+        return payload
+
+    buffer = io.BytesIO()
+    build_document(data, template_filename).save(buffer)
+    return buffer.getvalue()
+
+
+def _write_bytes(path: str, payload: bytes):
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def _reserve_path(path: str) -> str:
+    # Exclusive create, so parallel exports within the same second never share a file
+    root, ext = os.path.splitext(path)
+    n = 1
+    while True:
+        try:
+            with open(path, "xb"):
+                return path
+        except FileExistsError:
+            path = f"{root}_{n}{ext}"
+            n += 1
+
+
+def fill_template(data: dict, template_filename: str, renderer: str = "docx") -> str:
+    payload = render_template_bytes(data, template_filename, renderer)
+    output_path = save_output(data, payload)
+    print(f"[DEBUG] Filling template: {template_filename} -> {output_path}")
+    return output_path
+
+
+def save_output(data: dict, payload: bytes) -> str:
+    """Writes a filled document to data/{number}_{timestamp}.docx and returns its path."""
     number = data.get("number", "").strip() or data.get("num2", "").strip() or "report"
     timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
     filename = f"{number}_{timestamp}.docx"
     output_path = os.path.abspath(os.path.join("data", filename))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     try:
-        doc.save(output_path)
+        output_path = _reserve_path(output_path)
+        _write_bytes(output_path, payload)
     except PermissionError:
         backup = output_path.replace(".docx", f"_backup_{datetime.now().strftime('%H%M%S')}.docx")
-        doc.save(backup)
+        _write_bytes(backup, payload)
         output_path = backup
 
-    print(f"[DEBUG] Filling template: {template_filename} -> {output_path}")
     return output_path
 
 
 def generate_preview_text(data: dict, template_filename: str) -> str:
-    path = os.path.join("templates", template_filename)
-    doc = Document(path)
+    doc = load_template(template_filename)
     output = []
 
+    values = {k: v for k, v in data.items() if isinstance(v, str)}
+
     def replace(text):
-        for k, v in data.items():
-            placeholder = "{{" + k + "}}"
-            if isinstance(v, str):
-                text = text.replace(placeholder, v)
-        return text
+        return substitute_text(text, values)
 
     for para in doc.paragraphs:
         text = replace(para.text)
@@ -0,0 +1,196 @@
+"""
+Two-stage batch export: fill documents in a process pool, convert them to PDF through the
+converter service, with a bounded number of filled documents waiting between the stages.
+Qt-free so it can be driven by ExportWorker as well as from the command line.
+"""
+import os
+import time
+import traceback
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from engine.autofill import load_autofill_data
+from engine.docx_filler import fill_template
+from engine.database import log_task_completions
+from engine.pdf_service import get_pdf_service
+
+
+def default_jobs() -> int:
+    return int(os.environ.get("DWPT_EXPORT_JOBS", os.cpu_count() or 1))
+
+
+def _fill_one(data: dict, template_filename: str):
+    # Runs in a pool worker process
+    started = time.perf_counter()
+    docx_path = fill_template(data, template_filename, renderer="compiled")
+    return docx_path, time.perf_counter() - started
+
+
+def _in_process_fallback(executor):
+    print("[WARN] Fill process pool broke, continuing in-process")
+    executor.shutdown(wait=False, cancel_futures=True)
+    return ThreadPoolExecutor(max_workers=1), 1
+
+
+def _new_result(template: dict) -> dict:
+    return {
+        "id": str(template["id"]),
+        "filename": template["filename"],
+        "status": "pending",
+        "docx": None,
+        "pdf": None,
+        "error": None,
+        "fill_ms": None,
+        "convert_ms": None,
+    }
+
+
+def _discard_outputs(result: dict):
+    # Files of an export that was cancelled before it completed
+    docx_path = result["docx"]
+    for path in (docx_path, docx_path.replace(".docx", ".pdf")) if docx_path else ():
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"[WARN] Could not remove {path}: {e}")
+    result["docx"] = result["pdf"] = None
+
+
+def count_statuses(results: list) -> dict:
+    """{"exported", "skipped", "failed", "cancelled"} counts of run_export results."""
+    counts = {"exported": 0, "skipped": 0, "failed": 0, "cancelled": 0}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return counts
+
+
+def run_export(templates: list, jobs: int = None, convert_jobs: int = None, queue_size: int = None,
+               progress=None, is_cancelled=None, log_completion: bool = True) -> list:
+    """
+    Exports `templates` and returns one result dict per template, in input order.
+    status is "exported", "skipped" (no autofill data), "failed" or "cancelled".
+
+    jobs          fill processes (1 fills in a background thread of this process)
+    convert_jobs  documents handed to the PDF service at once (default: its worker count)
+    queue_size    filled documents allowed to wait for conversion
+    progress      callback(done, total)
+    is_cancelled  callable polled between steps; pending work is dropped once it returns True,
+                  and the files of templates that did not complete are removed
+    """
+    jobs = max(1, jobs or default_jobs())
+    service = get_pdf_service()
+    convert_jobs = max(1, convert_jobs or service.workers)
+    queue_size = max(1, queue_size or 2 * convert_jobs)
+    is_cancelled = is_cancelled or (lambda: False)
+
+    results = [_new_result(t) for t in templates]
+    total = len(templates)
+    done = 0
+
+    def finish(i, status, error=None):
+        nonlocal done
+        results[i]["status"] = status
+        results[i]["error"] = error
+        done += 1
+        if progress:
+            progress(done, total)
+
+    pending = deque()
+    for i, template in enumerate(templates):
+        data = load_autofill_data(str(template["id"]))
+        if not data:
+            finish(i, "skipped")
+            continue
+        data["num2"] = str(template["id"])
+        pending.append((i, data))
+
+    fill_workers = min(jobs, len(pending)) or 1
+    if fill_workers > 1:
+        executor = ProcessPoolExecutor(max_workers=fill_workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    filling = {}
+    ready = deque()
+    converting = {}
+    cancelled = False
+    try:
+        while pending or filling or ready or converting:
+            if is_cancelled():
+                cancelled = True
+                break
+
+            while pending and len(filling) < fill_workers and len(filling) + len(ready) < queue_size:
+                i, data = pending.popleft()
+                try:
+                    future = executor.submit(_fill_one, data, templates[i]["filename"])
+                except BrokenProcessPool:
+                    executor, fill_workers = _in_process_fallback(executor)
+                    future = executor.submit(_fill_one, data, templates[i]["filename"])
+                filling[future] = (i, data)
+
+            while ready and len(converting) < convert_jobs:
+                i, docx_path = ready.popleft()
+                pdf_path = docx_path.replace(".docx", ".pdf")
+                future = service.submit(docx_path, pdf_path)
+                converting[future] = (i, time.perf_counter())
+
+            finished, _ = wait(list(filling) + list(converting), timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in filling:
+                    i, data = filling.pop(future)
+                    try:
+                        docx_path, seconds = future.result()
+                    except BrokenProcessPool:
+                        # A crashed worker takes the whole pool down; finish the rest in-process
+                        if isinstance(executor, ProcessPoolExecutor):
+                            executor, fill_workers = _in_process_fallback(executor)
+                        pending.appendleft((i, data))
+                        continue
+                    except Exception as e:
+                        print(f"[ERROR] Failed to fill {templates[i]['filename']}: {e}")
+                        finish(i, "failed", str(e))
+                        continue
+                    results[i]["docx"] = docx_path
+                    results[i]["fill_ms"] = round(seconds * 1000, 1)
+                    ready.append((i, docx_path))
+                else:
+                    i, started = converting.pop(future)
+                    results[i]["convert_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    try:
+                        results[i]["pdf"] = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Failed to convert {templates[i]['filename']}: {e}")
+                        finish(i, "failed", str(e))
+                        continue
+                    finish(i, "exported")
+    except Exception:
+        print(traceback.format_exc())
+        raise
+    finally:
+        for future in list(filling) + list(converting):
+            future.cancel()
+        if cancelled:
+            # Let the fills and conversions already running finish so their files can be removed
+            running = [f for f in list(filling) + list(converting) if not f.cancelled()]
+            wait(running)
+            for future in running:
+                if future in filling and future.exception() is None:
+                    results[filling[future][0]]["docx"] = future.result()[0]
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for result in results:
+        if result["status"] == "pending":
+            result["status"] = "cancelled"
+            _discard_outputs(result)
+
+    if log_completion:
+        log_task_completions([
+            (template["id"], result["docx"])
+            for template, result in zip(templates, results) if result["status"] == "exported"
+        ])
+
+    return results
@@ -0,0 +1,158 @@
+"""
+Registry of config/template_fields.yaml.
+
+The file is loaded through engine.config_snapshot and re-read only when its mtime changes. load_all_fields() and
+load_field_config() return the raw mappings (hashed into render keys, checked by the
+template index); field_specs() returns the same fields validated into FieldSpec objects
+for the form builder.
+"""
+import os
+import threading
+
+from engine.config_snapshot import FIELDS_PATH, load_yaml
+
+FIELD_TYPES = ("text", "date", "combo", "table", "multiweek")
+COLUMN_TYPES = ("text", "date", "combo", "number")
+ALIGNS = ("left", "center", "right")
+
+_lock = threading.Lock()
+_cache = {"mtime_ns": None, "data": {}, "specs": {}}
+
+
+class ColumnSpec:
+    __slots__ = ("name", "type", "options", "align")
+
+    def __init__(self, name: str, c_type: str = "text", options: tuple = (), align: str = "left"):
+        self.name = name
+        self.type = c_type
+        self.options = options
+        self.align = align
+
+    def __repr__(self):
+        return f"ColumnSpec({self.name!r}, {self.type!r})"
+
+    def as_dict(self) -> dict:
+        """The column as TableInput takes it."""
+        return {"name": self.name, "type": self.type, "options": list(self.options), "align": self.align}
+
+
+class FieldSpec:
+    __slots__ = ("name", "type", "options", "columns")
+
+    def __init__(self, name: str, f_type: str, options: tuple = (), columns: tuple = ()):
+        self.name = name
+        self.type = f_type
+        self.options = options
+        self.columns = columns
+
+    def __repr__(self):
+        return f"FieldSpec({self.name!r}, {self.type!r})"
+
+    @property
+    def heavy(self) -> bool:
+        """Sections worth building only when the user opens them."""
+        return self.type in ("table", "multiweek")
+
+
+def _options(raw, where: str, report) -> tuple:
+    if raw is None:
+        return ()
+    if not isinstance(raw, list):
+        report(f"{where}: options must be a list")
+        return ()
+    return tuple(str(o) for o in raw)
+
+
+def _compile_column(raw, where: str, report):
+    if not isinstance(raw, dict) or not raw.get("name"):
+        report(f"{where}: column without a name ignored")
+        return None
+    where = f"{where}.{raw['name']}"
+    c_type = raw.get("type", "text")
+    if c_type not in COLUMN_TYPES:
+        report(f"{where}: unknown column type {c_type!r}, using text")
+        c_type = "text"
+    align = raw.get("align", "left")
+    if align not in ALIGNS:
+        report(f"{where}: unknown align {align!r}, using left")
+        align = "left"
+    return ColumnSpec(str(raw["name"]), c_type, _options(raw.get("options"), where, report), align)
+
+
+def _compile_field(raw, where: str, report):
+    if not isinstance(raw, dict) or not raw.get("name"):
+        report(f"{where}: field without a name ignored")
+        return None
+    where = f"{where}.{raw['name']}"
+    f_type = raw.get("type", "text")
+    if f_type not in FIELD_TYPES:
+        report(f"{where}: unknown field type {f_type!r} ignored")
+        return None
+    columns = ()
+    if f_type == "table":
+        columns = tuple(c for c in (_compile_column(col, where, report) for col in raw.get("columns") or []) if c)
+        if not columns:
+            report(f"{where}: table without columns")
+    return FieldSpec(str(raw["name"]), f_type, _options(raw.get("options"), where, report), columns)
+
+
+def compile_fields(data: dict, problems: list = None) -> dict:
+    """{template filename: tuple of FieldSpec}; invalid entries are skipped and reported,
+    into `problems` when given, as warnings otherwise."""
+    report = problems.append if problems is not None else (lambda problem: print(f"[WARN] {problem}"))
+    specs = {}
+    for template_filename, fields in (data or {}).items():
+        if not isinstance(fields, list):
+            specs[template_filename] = ()
+            continue
+        compiled = (_compile_field(field, f"{template_filename}[{i}]", report) for i, field in enumerate(fields))
+        specs[template_filename] = tuple(f for f in compiled if f)
+    return specs
+
+
+def _refresh():
+    # Must be called with _lock held
+    try:
+        mtime_ns = os.stat(FIELDS_PATH).st_mtime_ns
+    except OSError as e:
+        print(f"[ERROR] Failed to read {FIELDS_PATH}: {e}")
+        return
+
+    if mtime_ns != _cache["mtime_ns"]:
+        data = load_yaml(FIELDS_PATH) or {}
+        _cache["data"] = data
+        # Problems were reported when the snapshot was compiled
+        _cache["specs"] = compile_fields(data, problems=[])
+        _cache["mtime_ns"] = mtime_ns
+
+
+def load_all_fields() -> dict:
+    with _lock:
+        _refresh()
+        return _cache["data"]
+
+
+def load_field_config(template_filename: str) -> list:
+    return load_all_fields().get(template_filename) or []
+
+
+def field_specs(template_filename: str) -> tuple:
+    with _lock:
+        _refresh()
+        return _cache["specs"].get(template_filename, ())
+
+
+def fields_version():
+    """Changes whenever the registry reloads; lets callers drop state built from old specs."""
+    with _lock:
+        _refresh()
+        return _cache["mtime_ns"]
+
+
+def table_columns(template_filename: str) -> dict:
+    """{field name: [column names]} for every table field of the template."""
+    return {
+        field.name: [col.name for col in field.columns]
+        for field in field_specs(template_filename)
+        if field.type == "table"
+    }
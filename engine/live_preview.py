@@ -0,0 +1,169 @@
+"""
+Lightweight HTML rendition of a template body for the live preview pane of TaskDialog.
+
+The body is split once per template version into units (top-level paragraphs and table
+rows), each knowing which placeholders it shows. update() re-renders only the units whose
+placeholders changed; rows bound to a list field depend on that field as a whole and show
+at most LIVE_PREVIEW_MAX_ROWS records. Headers, footers and formatting are left to the
+full PDF preview.
+"""
+import html
+import time
+from docx import Document
+from docx.oxml.ns import qn
+
+from engine.docx_filler import prepare_data
+from engine.field_config import table_columns
+from engine.placeholders import PLACEHOLDER_RE, paragraph_text, placeholder_names, scalar_values
+from engine.table_binding import get_table_bindings
+from engine.template_cache import load_cached
+
+LIVE_PREVIEW_MAX_ROWS = 200
+
+_P = qn("w:p")
+_TBL = qn("w:tbl")
+_TR = qn("w:tr")
+_TC = qn("w:tc")
+
+_FILLED = '<span style="background-color:#fff3b0;">{}</span>'
+_MISSING = '<span style="color:#999;">{{{{{}}}}}</span>'
+
+
+def _cell_text(tc) -> str:
+    return "\n".join(paragraph_text(p) for p in tc.iter(_P))
+
+
+def _body_blocks(doc) -> list:
+    """[("p", text, names)] and [("table", table index, [(cell texts, names)])] in body order."""
+    body = doc.element.body
+    table_index = {tbl: i for i, tbl in enumerate(body.iter(_TBL))}
+    blocks = []
+    for child in body:
+        if child.tag == _P:
+            text = paragraph_text(child)
+            blocks.append(("p", text, frozenset(placeholder_names(text))))
+        elif child.tag == _TBL:
+            rows = []
+            for tr in (c for c in child if c.tag == _TR):
+                cells = [_cell_text(tc) for tc in tr if tc.tag == _TC]
+                rows.append((cells, frozenset(n for cell in cells for n in placeholder_names(cell))))
+            blocks.append(("table", table_index[child], rows))
+    return blocks
+
+
+def _cell_value(value) -> str:
+    return str(value.get("text", "")) if isinstance(value, dict) else str(value)
+
+
+def _fill(text: str, values: dict) -> str:
+    out = []
+    pos = 0
+    for match in PLACEHOLDER_RE.finditer(text):
+        out.append(html.escape(text[pos:match.start()]))
+        name = match.group(1).strip()
+        if name in values:
+            out.append(_FILLED.format(html.escape(values[name])))
+        else:
+            out.append(_MISSING.format(html.escape(name)))
+        pos = match.end()
+    out.append(html.escape(text[pos:]))
+    return "".join(out).replace("\n", "<br>")
+
+
+class LivePreview:
+    def __init__(self, template_filename: str):
+        self.template_filename = template_filename
+        self.blocks = load_cached(
+            template_filename, "live_blocks",
+            lambda path: _body_blocks(load_cached(template_filename, "document", Document)),
+        )
+        bindings = get_table_bindings(template_filename)
+        self.repeating = bindings.assign(table_columns(template_filename), template_filename)
+
+        # unit -> html; a unit is ("p", block) or ("row", block, row)
+        self._html = {}
+        self._deps = {}
+        for bi, block in enumerate(self.blocks):
+            if block[0] == "p":
+                self._depend(block[2], ("p", bi))
+            else:
+                for ri, (_, names) in enumerate(block[2]):
+                    field = self.repeating.get((block[1], ri))
+                    self._depend([field] if field else names, ("row", bi, ri))
+
+        self.data = {}
+        self.scalars = {}
+        self.lists = {}
+        self.last_update_ms = 0.0
+        self.last_units = 0
+        self.last_error = None
+
+    def _depend(self, names, unit):
+        for name in names:
+            self._deps.setdefault(name, set()).add(unit)
+
+    def _render_unit(self, unit) -> str:
+        block = self.blocks[unit[1]]
+        if unit[0] == "p":
+            return f"<p>{_fill(block[1], self.scalars) or '&nbsp;'}</p>"
+
+        cells, _ = block[2][unit[2]]
+        field = self.repeating.get((block[1], unit[2]))
+        if field is None:
+            return "<tr>" + "".join(f"<td>{_fill(c, self.scalars)}</td>" for c in cells) + "</tr>"
+
+        records = self.lists.get(field) or []
+        if not records:
+            return "<tr>" + "".join(f"<td>{_fill(c, {})}</td>" for c in cells) + "</tr>"
+        rows = []
+        for record in records[:LIVE_PREVIEW_MAX_ROWS]:
+            values = dict(self.scalars)
+            values.update({k: _cell_value(v) for k, v in record.items()})
+            rows.append("<tr>" + "".join(f"<td>{_fill(c, values)}</td>" for c in cells) + "</tr>")
+        hidden = len(records) - LIVE_PREVIEW_MAX_ROWS
+        if hidden > 0:
+            rows.append(f'<tr><td colspan="{len(cells)}" style="color:#999;">… {hidden} more row(s)</td></tr>')
+        return "".join(rows)
+
+    def update(self, changes: dict) -> str:
+        """Merges changed field values and returns the full HTML, re-rendering affected units only."""
+        started = time.perf_counter()
+        first = not self._html
+        self.data.update(changes)
+        try:
+            prepared = prepare_data(dict(self.data), self.template_filename)
+            self.last_error = None
+        except Exception as e:
+            # e.g. multi-week input the monthly summary cannot read: show the raw values meanwhile
+            if str(e) != self.last_error:
+                print(f"[WARN] Live preview of {self.template_filename}: cannot prepare data: {e}")
+            self.last_error = str(e)
+            prepared = dict(self.data)
+        scalars = scalar_values(prepared)
+        lists = {k: v for k, v in prepared.items() if isinstance(v, list) and (not v or isinstance(v[0], dict))}
+
+        changed = {k for k in scalars.keys() | self.scalars.keys() if scalars.get(k) != self.scalars.get(k)}
+        changed |= {k for k in lists.keys() | self.lists.keys() if lists.get(k) != self.lists.get(k)}
+        self.scalars, self.lists = scalars, lists
+
+        if first:
+            units = {("p", bi) for bi, b in enumerate(self.blocks) if b[0] == "p"}
+            units |= {("row", bi, ri) for bi, b in enumerate(self.blocks) if b[0] == "table" for ri in range(len(b[2]))}
+        else:
+            units = set().union(*(self._deps.get(k, ()) for k in changed)) if changed else set()
+        for unit in units:
+            self._html[unit] = self._render_unit(unit)
+
+        self.last_units = len(units)
+        self.last_update_ms = (time.perf_counter() - started) * 1000
+        return self.html()
+
+    def html(self) -> str:
+        parts = []
+        for bi, block in enumerate(self.blocks):
+            if block[0] == "p":
+                parts.append(self._html.get(("p", bi), ""))
+            else:
+                rows = "".join(self._html.get(("row", bi, ri), "") for ri in range(len(block[2])))
+                parts.append(f'<table border="1" cellspacing="0" cellpadding="3" width="100%">{rows}</table>')
+        return "".join(parts)
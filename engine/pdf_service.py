@@ -0,0 +1,413 @@
+"""
+PDF conversion service: a pool of warm converter workers behind one queue.
+
+Each worker thread owns one backend instance (a Word COM application, a headless
+LibreOffice, or the fake backend used in tests) and keeps it alive between documents.
+A backend that dies mid-conversion is restarted and the job retried once.
+
+The backend is chosen with DWPT_PDF_BACKEND (word | libreoffice | fake); the default is
+Word on Windows and LibreOffice elsewhere. DWPT_PDF_WORKERS sets the pool size.
+
+convert_bytes() takes and returns document bytes; the converters still need real paths, so
+it stages them in a private directory under scratch_root() (tmpfs /dev/shm where there is
+one, or DWPT_SCRATCH) and removes it before returning.
+"""
+import os
+import time
+import queue
+import atexit
+import shutil
+import platform
+import tempfile
+import threading
+import subprocess
+import traceback
+from collections import deque
+from concurrent.futures import Future
+
+
+def scratch_root() -> str:
+    configured = os.environ.get("DWPT_SCRATCH")
+    if configured:
+        return configured
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+class ConverterBackend:
+    name = "base"
+
+    def start(self):
+        pass
+
+    def convert(self, input_path: str, output_path: str):
+        raise NotImplementedError
+
+    def alive(self) -> bool:
+        return True
+
+    def stop(self):
+        pass
+
+
+class WordBackend(ConverterBackend):
+    """One persistent Word.Application per worker thread (COM objects are apartment-bound)."""
+
+    name = "word"
+
+    def __init__(self):
+        self.word = None
+
+    def start(self):
+        import comtypes
+        import comtypes.client
+        comtypes.CoInitialize()
+        self.word = comtypes.client.CreateObject("Word.Application")
+        self.word.Visible = False
+        self.word.DisplayAlerts = 0
+
+    def convert(self, input_path: str, output_path: str):
+        doc = self.word.Documents.Open(input_path)
+        try:
+            doc.SaveAs(output_path, FileFormat=17)
+        finally:
+            doc.Close(False)
+
+    def alive(self) -> bool:
+        try:
+            self.word.Documents.Count
+            return True
+        except Exception:
+            return False
+
+    def stop(self):
+        import comtypes
+        try:
+            if self.word is not None:
+                self.word.Quit()
+        except Exception:
+            pass
+        self.word = None
+        comtypes.CoUninitialize()
+
+
+def _file_url(path: str) -> str:
+    from pathlib import Path
+    return Path(os.path.abspath(path)).as_uri()
+
+
+class LibreOfficeBackend(ConverterBackend):
+    """
+    Headless soffice with its own user profile. When the python `uno` bindings are available a
+    single soffice process is kept running and driven over a pipe; otherwise each conversion
+    runs `soffice --convert-to pdf` against the same, already initialised profile.
+    """
+
+    name = "libreoffice"
+
+    def __init__(self, binary: str = None):
+        self.binary = binary or os.environ.get("DWPT_SOFFICE") or shutil.which("soffice") or shutil.which("libreoffice")
+        self.profile_dir = None
+        self.process = None
+        self.desktop = None
+
+    def start(self):
+        if not self.binary:
+            raise RuntimeError("LibreOffice (soffice) was not found; set DWPT_SOFFICE")
+        self.profile_dir = tempfile.mkdtemp(prefix="dwpt_soffice_")
+        try:
+            import uno  # noqa: F401
+        except ImportError:
+            print("[DEBUG] python-uno not available, using soffice --convert-to per document")
+            return
+        self._start_listener()
+
+    def _base_args(self) -> list:
+        return [
+            self.binary, "--headless", "--invisible", "--nologo", "--norestore", "--nodefault",
+            f"-env:UserInstallation={_file_url(self.profile_dir)}",
+        ]
+
+    def _start_listener(self):
+        import uno
+        pipe = f"dwpt_{os.getpid()}_{threading.get_ident()}"
+        self.process = subprocess.Popen(
+            self._base_args() + [f"--accept=pipe,name={pipe};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                ctx = resolver.resolve(f"uno:pipe,name={pipe};urp;StarOffice.ComponentContext")
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("LibreOffice listener did not start")
+                time.sleep(0.25)
+        self.desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+    @staticmethod
+    def _props(**kwargs):
+        from com.sun.star.beans import PropertyValue
+        props = []
+        for key, value in kwargs.items():
+            prop = PropertyValue()
+            prop.Name, prop.Value = key, value
+            props.append(prop)
+        return tuple(props)
+
+    def convert(self, input_path: str, output_path: str):
+        if self.desktop is None:
+            self._convert_cli(input_path, output_path)
+            return
+        doc = self.desktop.loadComponentFromURL(_file_url(input_path), "_blank", 0, self._props(Hidden=True))
+        try:
+            doc.storeToURL(_file_url(output_path), self._props(FilterName="writer_pdf_Export"))
+        finally:
+            doc.close(True)
+
+    def _convert_cli(self, input_path: str, output_path: str):
+        out_dir = tempfile.mkdtemp(prefix="dwpt_pdf_", dir=self.profile_dir)
+        try:
+            subprocess.run(
+                self._base_args() + ["--convert-to", "pdf", "--outdir", out_dir, input_path],
+                check=True, timeout=180, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            produced = os.path.join(out_dir, os.path.splitext(os.path.basename(input_path))[0] + ".pdf")
+            if not os.path.exists(produced):
+                raise RuntimeError(f"soffice produced no PDF for {input_path}")
+            shutil.move(produced, output_path)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    def alive(self) -> bool:
+        if self.process is None:
+            return self.desktop is None
+        return self.process.poll() is None
+
+    def stop(self):
+        try:
+            if self.desktop is not None:
+                self.desktop.terminate()
+        except Exception:
+            pass
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.desktop = None
+        self.process = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+
+_FAKE_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+class FakeBackend(ConverterBackend):
+    """Writes a one-page blank PDF. `delay` simulates conversion time, `crash_after` a dying backend."""
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0, crash_after: int = None):
+        self.delay = delay
+        self.crash_after = crash_after
+        self.converted = 0
+        self._alive = False
+
+    def start(self):
+        self._alive = True
+
+    def convert(self, input_path: str, output_path: str):
+        if self.crash_after is not None and self.converted >= self.crash_after:
+            self._alive = False
+            raise RuntimeError("fake backend crashed")
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(input_path)
+        if self.delay:
+            time.sleep(self.delay)
+        with open(output_path, "wb") as f:
+            f.write(_FAKE_PDF)
+        self.converted += 1
+
+    def alive(self) -> bool:
+        return self._alive
+
+    def stop(self):
+        self._alive = False
+
+
+BACKENDS = {
+    "word": WordBackend,
+    "libreoffice": LibreOfficeBackend,
+    "fake": FakeBackend,
+}
+
+
+class PdfConversionService:
+    def __init__(self, backend_factory, workers: int = 1, name: str = None):
+        self.backend_factory = backend_factory
+        self.workers = max(1, workers)
+        self.name = name or getattr(backend_factory, "name", "custom")
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=500)
+        self._stats = {"converted": 0, "failed": 0, "restarts": 0}
+
+    def start(self):
+        """Starts the worker threads; each one brings its backend up before taking jobs."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"pdf-{self.name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, input_path: str, output_path: str) -> Future:
+        self.start()
+        future = Future()
+        self._jobs.put((os.path.abspath(input_path), os.path.abspath(output_path), future))
+        return future
+
+    def convert(self, input_path: str, output_path: str, timeout: float = None) -> str:
+        return self.submit(input_path, output_path).result(timeout)
+
+    def convert_bytes(self, docx_bytes: bytes, timeout: float = None) -> bytes:
+        scratch = tempfile.mkdtemp(prefix="dwpt_convert_", dir=scratch_root())
+        try:
+            input_path = os.path.join(scratch, "document.docx")
+            output_path = os.path.join(scratch, "document.pdf")
+            with open(input_path, "wb") as f:
+                f.write(docx_bytes)
+            self.convert(input_path, output_path, timeout)
+            with open(output_path, "rb") as f:
+                return f.read()
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def shutdown(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._jobs.put(None)
+        for thread in threads:
+            thread.join(timeout=30)
+
+    def _new_backend(self):
+        backend = self.backend_factory()
+        backend.start()
+        return backend
+
+    def _stop_backend(self, backend):
+        try:
+            backend.stop()
+        except Exception:
+            traceback.print_exc()
+
+    def _worker_loop(self):
+        backend = None
+        try:
+            backend = self._new_backend()
+        except Exception as e:
+            print(f"[ERROR] Failed to start {self.name} PDF backend: {e}")
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            input_path, output_path, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            started = time.perf_counter()
+            for attempt in (1, 2):
+                try:
+                    if backend is None:
+                        backend = self._new_backend()
+                    backend.convert(input_path, output_path)
+                except Exception as e:
+                    crashed = backend is None or not backend.alive()
+                    if crashed and backend is not None:
+                        print(f"[WARN] {self.name} PDF backend died, restarting: {e}")
+                        self._stop_backend(backend)
+                        backend = None
+                        with self._lock:
+                            self._stats["restarts"] += 1
+                    if crashed and attempt == 1:
+                        continue
+                    with self._lock:
+                        self._stats["failed"] += 1
+                    future.set_exception(e)
+                else:
+                    elapsed = time.perf_counter() - started
+                    with self._lock:
+                        self._stats["converted"] += 1
+                        self._latencies.append(elapsed)
+                    future.set_result(output_path)
+                break
+
+        if backend is not None:
+            self._stop_backend(backend)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self._stats)
+        stats.update({"backend": self.name, "workers": self.workers, "queued": self._jobs.qsize()})
+        if latencies:
+            def pct(p): return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+            stats.update({
+                "avg_ms": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50_ms": pct(0.5),
+                "p95_ms": pct(0.95),
+                "max_ms": round(latencies[-1] * 1000, 1),
+            })
+        return stats
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def default_backend_name() -> str:
+    return os.environ.get("DWPT_PDF_BACKEND") or ("word" if platform.system() == "Windows" else "libreoffice")
+
+
+def get_pdf_service() -> PdfConversionService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            name = default_backend_name()
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown PDF backend: {name}")
+            default_workers = 1 if name == "word" else 2
+            workers = int(os.environ.get("DWPT_PDF_WORKERS", default_workers))
+            _service = PdfConversionService(BACKENDS[name], workers=workers, name=name)
+        return _service
+
+
+def set_pdf_service(service: PdfConversionService):
+    """Replaces the process-wide service (e.g. with a FakeBackend pool in tests)."""
+    global _service
+    with _service_lock:
+        old, _service = _service, service
+    if old is not None and old is not service:
+        old.shutdown()
+
+
+@atexit.register
+def _shutdown_service():
+    if _service is not None:
+        _service.shutdown()
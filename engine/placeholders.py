@@ -0,0 +1,179 @@
+import re
+from bisect import bisect_right
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+
+PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+)\}\}")
+
+_P = qn("w:p")
+_T = qn("w:t")
+_XML_SPACE = qn("xml:space")
+
+
+class SubstitutionReport:
+    """
+    Coverage of one fill: which placeholders were filled, which had no value (missing)
+    and which data keys never matched a placeholder (unused).
+    """
+
+    def __init__(self, keys):
+        self.keys = set(keys)
+        self.used = set()
+        self.missing = set()
+
+    @property
+    def unused(self):
+        return self.keys - self.used
+
+    def record(self, name, filled):
+        if filled:
+            self.used.add(name)
+        else:
+            self.missing.add(name)
+
+    def consume(self, names):
+        # Placeholders handled outside the scalar pass (e.g. dynamic table rows)
+        names = set(names)
+        self.used |= names
+        self.missing -= names
+
+    def as_dict(self) -> dict:
+        return {
+            "used": sorted(self.used),
+            "missing": sorted(self.missing),
+            "unused": sorted(self.unused),
+        }
+
+    def log(self, template_filename: str):
+        if self.missing:
+            print(f"[WARN] {template_filename}: no value for placeholders {sorted(self.missing)}")
+        if self.unused:
+            print(f"[DEBUG] {template_filename}: unused data keys {sorted(self.unused)}")
+
+
+def placeholder_names(text: str) -> list:
+    return [m.group(1).strip() for m in PLACEHOLDER_RE.finditer(text)]
+
+
+def substitute_text(text: str, values: dict, report: SubstitutionReport = None) -> str:
+    def repl(match):
+        name = match.group(1).strip()
+        filled = name in values
+        if report is not None:
+            report.record(name, filled)
+        return values[name] if filled else match.group(0)
+
+    if "{{" not in text:
+        return text
+    return PLACEHOLDER_RE.sub(repl, text)
+
+
+def _owning_paragraph(node):
+    while node is not None and node.tag != _P:
+        node = node.getparent()
+    return node
+
+
+def _text_nodes(p):
+    # w:t nodes of this paragraph only, skipping paragraphs nested in text boxes
+    return [t for t in p.iter(_T) if _owning_paragraph(t) is p]
+
+
+def paragraph_text(p) -> str:
+    return "".join(t.text or "" for t in _text_nodes(p))
+
+
+def substitute_paragraph(p, values: dict, report: SubstitutionReport = None) -> int:
+    """
+    Replaces {{key}} placeholders in a w:p element in one pass, even when a placeholder is
+    split across several runs. Only the w:t nodes a placeholder touches are rewritten, so
+    each run keeps its formatting; the replacement takes the formatting of the run where
+    the placeholder starts. Returns the number of placeholders filled.
+    """
+    nodes = _text_nodes(p)
+    if not nodes:
+        return 0
+
+    texts = [t.text or "" for t in nodes]
+    full_text = "".join(texts)
+    if "{{" not in full_text:
+        return 0
+
+    matches = list(PLACEHOLDER_RE.finditer(full_text))
+    if not matches:
+        return 0
+
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text)
+
+    filled = 0
+    # Work backwards so offsets of earlier matches stay valid
+    for match in reversed(matches):
+        name = match.group(1).strip()
+        if name not in values:
+            if report is not None:
+                report.record(name, False)
+            continue
+        if report is not None:
+            report.record(name, True)
+
+        begin, end = match.span()
+        i = bisect_right(starts, begin) - 1
+        j = bisect_right(starts, end - 1) - 1
+        local_begin = begin - starts[i]
+        local_end = end - starts[j]
+
+        first = nodes[i]
+        if i == j:
+            text = first.text or ""
+            first.text = text[:local_begin] + values[name] + text[local_end:]
+        else:
+            first.text = (first.text or "")[:local_begin] + values[name]
+            for node in nodes[i + 1:j]:
+                node.text = ""
+            last = nodes[j]
+            last.text = (last.text or "")[local_end:]
+            last.set(_XML_SPACE, "preserve")
+        first.set(_XML_SPACE, "preserve")
+        filled += 1
+
+    return filled
+
+
+def substitute_element(element, values: dict, report: SubstitutionReport = None) -> int:
+    filled = 0
+    for p in element.iter(_P):
+        filled += substitute_paragraph(p, values, report)
+    return filled
+
+
+def header_footer_elements(doc) -> list:
+    return [
+        rel.target_part.element
+        for rel in doc.part.rels.values()
+        if rel.reltype in (RT.HEADER, RT.FOOTER) and not rel.is_external
+    ]
+
+
+def scalar_values(data: dict) -> dict:
+    return {
+        key: str(value)
+        for key, value in data.items()
+        if not isinstance(value, (list, dict))
+    }
+
+
+def substitute_document(doc, data: dict) -> SubstitutionReport:
+    """
+    Fills every scalar placeholder in the body, headers and footers of `doc`.
+    List values (dynamic tables) are left for the caller.
+    """
+    values = scalar_values(data)
+    report = SubstitutionReport(data.keys())
+    substitute_element(doc.element.body, values, report)
+    for element in header_footer_elements(doc):
+        substitute_element(element, values, report)
+    return report
@@ -0,0 +1,234 @@
+"""
+Content-addressed cache of rendered reports.
+
+A render is keyed by the template's content hash, its field configuration, the normalized
+input data and RENDER_ENGINE_VERSION, so preview and generate of unchanged data share one
+fill and one PDF conversion. Entries live in data/render_cache/ as <key>.docx and
+<key>.<backend>.pdf; the least recently used files are evicted once the directory grows
+past DWPT_RENDER_CACHE_MB (default 256).
+
+Previews stay in memory (persist=False): their renders go to an in-process LRU of
+PREVIEW_MEMORY_BYTES and are only written to the directory if the same report is then
+generated.
+"""
+import os
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from engine.docx_filler import render_template_bytes, save_output
+from engine.field_config import load_field_config
+from engine.pdf_service import get_pdf_service
+from engine.template_cache import template_digest
+
+# Bump when the renderers change their output for the same input
+RENDER_ENGINE_VERSION = 1
+RENDER_CACHE_DIR = os.path.join("data", "render_cache")
+RENDERER = "compiled"
+PREVIEW_MEMORY_BYTES = 64 * 1024 * 1024
+
+_lock = threading.Lock()
+_index = None  # {filename: [size, last_used]} of the cache directory, loaded on first use
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_memory = OrderedDict()  # {filename: payload} of renders not written to disk
+_memory_size = 0
+
+
+def max_cache_bytes() -> int:
+    return int(float(os.environ.get("DWPT_RENDER_CACHE_MB", 256)) * 1024 * 1024)
+
+
+def render_key(data: dict, template_filename: str) -> str:
+    normalized = json.dumps(
+        {
+            "engine": RENDER_ENGINE_VERSION,
+            "renderer": RENDERER,
+            "template": template_digest(template_filename),
+            "fields": load_field_config(template_filename),
+            "data": data,
+        },
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _load_index() -> dict:
+    # Must be called with _lock held
+    global _index
+    if _index is None:
+        _index = {}
+        os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+        for entry in os.scandir(RENDER_CACHE_DIR):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                _index[entry.name] = [st.st_size, st.st_mtime]
+    return _index
+
+
+def _read(name: str, count: bool = True):
+    """(payload, in_memory) from the memory LRU or the directory, or (None, False)."""
+    path = os.path.join(RENDER_CACHE_DIR, name)
+    with _lock:
+        payload = _memory.get(name)
+        if payload is not None:
+            _memory.move_to_end(name)
+            if count:
+                _stats["hits"] += 1
+            return payload, True
+
+        index = _load_index()
+        payload = None
+        if name in index:
+            try:
+                with open(path, "rb") as f:
+                    payload = f.read()
+                index[name][1] = _touch(path)
+            except OSError:
+                index.pop(name, None)
+        if count:
+            _stats["hits" if payload is not None else "misses"] += 1
+    return payload, False
+
+
+def _remember(name: str, payload: bytes):
+    global _memory_size
+    with _lock:
+        old = _memory.pop(name, None)
+        if old is not None:
+            _memory_size -= len(old)
+        _memory[name] = payload
+        _memory_size += len(payload)
+        while _memory_size > PREVIEW_MEMORY_BYTES and len(_memory) > 1:
+            _, evicted = _memory.popitem(last=False)
+            _memory_size -= len(evicted)
+
+
+def _store(name: str, payload: bytes, persist: bool):
+    global _memory_size
+    if not persist:
+        _remember(name, payload)
+        return
+    _write(name, payload)
+    with _lock:
+        old = _memory.pop(name, None)
+        if old is not None:
+            _memory_size -= len(old)
+
+
+def _touch(path: str) -> float:
+    try:
+        os.utime(path)
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def _write(name: str, payload: bytes):
+    path = os.path.join(RENDER_CACHE_DIR, name)
+    with _lock:
+        index = _load_index()
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        index[name] = [len(payload), _touch(path)]
+        _evict(index, keep=name)
+
+
+def _evict(index: dict, keep: str):
+    # Must be called with _lock held
+    limit = max_cache_bytes()
+    total = sum(size for size, _ in index.values())
+    if total <= limit:
+        return
+    for name, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+        if total <= limit:
+            break
+        if name == keep:
+            continue
+        try:
+            os.remove(os.path.join(RENDER_CACHE_DIR, name))
+        except OSError:
+            pass
+        del index[name]
+        total -= size
+        _stats["evictions"] += 1
+
+
+def render_docx(data: dict, template_filename: str, key: str = None, persist: bool = True,
+                _count: bool = True) -> bytes:
+    """persist=False keeps a new render in memory only (previews)."""
+    key = key or render_key(data, template_filename)
+    name = f"{key}.docx"
+    payload, in_memory = _read(name, _count)
+    if payload is None:
+        payload = render_template_bytes(copy.deepcopy(data), template_filename, RENDERER)
+        _store(name, payload, persist)
+    else:
+        print(f"[DEBUG] Render cache hit: {template_filename} ({key[:12]})")
+        if in_memory and persist:
+            _store(name, payload, persist)
+    return payload
+
+
+def render_pdf(data: dict, template_filename: str, key: str = None, persist: bool = True) -> bytes:
+    key = key or render_key(data, template_filename)
+    service = get_pdf_service()
+    name = f"{key}.{service.name}.pdf"
+    payload, in_memory = _read(name)
+    if payload is None:
+        # Part of this lookup: the docx step does not count as a second miss
+        docx_bytes = render_docx(data, template_filename, key, persist, _count=False)
+        payload = service.convert_bytes(docx_bytes)
+        _store(name, payload, persist)
+    else:
+        print(f"[DEBUG] Render cache hit: {template_filename} PDF ({key[:12]})")
+        if in_memory and persist:
+            _store(name, payload, persist)
+    return payload
+
+
+def materialize_report(data: dict, template_filename: str, progress=None) -> tuple:
+    """Writes the timestamped .docx and .pdf into data/ from the cache; returns both paths.
+    `progress(percent)` is called once the document is filled."""
+    key = render_key(data, template_filename)
+    docx_bytes = render_docx(data, template_filename, key)
+    if progress:
+        progress(50)
+    pdf_bytes = render_pdf(data, template_filename, key)
+    docx_path = save_output(data, docx_bytes)
+    pdf_path = docx_path[:-len(".docx")] + ".pdf"
+    with open(pdf_path, "wb") as f:
+        f.write(pdf_bytes)
+    return docx_path, pdf_path
+
+
+def render_cache_stats() -> dict:
+    with _lock:
+        index = _load_index()
+        stats = dict(_stats)
+        stats["entries"] = len(index)
+        stats["bytes"] = sum(size for size, _ in index.values())
+        stats["memory_entries"] = len(_memory)
+        stats["memory_bytes"] = _memory_size
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+    return stats
+
+
+def clear_render_cache():
+    """Empties the directory and the memory LRU and resets the counters."""
+    global _index, _memory_size
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+        _memory.clear()
+        _memory_size = 0
+        for name in list(_load_index()):
+            try:
+                os.remove(os.path.join(RENDER_CACHE_DIR, name))
+            except OSError:
+                pass
+        _index = {}
@@ -0,0 +1,200 @@
+"""
+Compiled report schedules.
+
+Each `schedule` block of config/task_rules.yaml is compiled once into day-of-year bitsets
+(one int per calendar year, built on first use), so "is it due on D" and "is it due at all
+between A and B" are a couple of integer operations. ScheduleEngine groups templates that
+share a schedule, which keeps range queries over thousands of templates in the millisecond
+range.
+
+Weekly `days` use Python's weekday() numbering (Monday = 0), as the dashboard always has.
+"""
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+SCHEDULE_TYPES = ("daily", "weekly", "monthly", "yearly", "semi_annual")
+SEMI_ANNUAL_MONTHS = (1, 7)
+
+# A yearly Feb 29 schedule can be up to 8 years away (e.g. 2096 -> 2104)
+_NEXT_DUE_HORIZON = 9
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def normalize_schedule(schedule) -> tuple:
+    """(type, days, months) for a schedule block, which may also be a bare type string."""
+    if isinstance(schedule, str):
+        schedule = {"type": schedule}
+    schedule = schedule or {}
+    days = tuple(sorted({int(d) for d in schedule.get("days") or []}))
+    months = tuple(sorted({int(m) for m in schedule.get("months") or []}))
+    return schedule.get("type", "daily"), days, months
+
+
+@lru_cache(maxsize=64)
+def _calendar_masks(year: int):
+    """Per-year building blocks: (all days, by weekday, by day of month, by month)."""
+    weekday = [0] * 7
+    mday = [0] * 32
+    month = [0] * 13
+    offset = 0
+    for m in range(1, 13):
+        first_weekday, length = calendar.monthrange(year, m)
+        for d in range(1, length + 1):
+            bit = 1 << (offset + d - 1)
+            weekday[(first_weekday + d - 1) % 7] |= bit
+            mday[d] |= bit
+            month[m] |= bit
+        offset += length
+    return (1 << offset) - 1, weekday, mday, month
+
+
+def _day_bit(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def _span_mask(year: int, start: date, end: date) -> int:
+    """Bits of `year` that fall inside [start, end]."""
+    full = _calendar_masks(year)[0]
+    lo = _day_bit(start) if start.year == year else 0
+    hi = _day_bit(end) if end.year == year else full.bit_length() - 1
+    if lo > hi:
+        return 0
+    return ((1 << (hi + 1)) - 1) & ~((1 << lo) - 1)
+
+
+def _spans(start: date, end: date) -> list:
+    return [(year, _span_mask(year, start, end)) for year in range(start.year, end.year + 1)]
+
+
+class Schedule:
+    __slots__ = ("type", "days", "months", "_years")
+
+    def __init__(self, s_type: str, days: tuple = (), months: tuple = ()):
+        self.type = s_type
+        self.days = days
+        self.months = months
+        self._years = {}
+
+    def __repr__(self):
+        return f"Schedule({self.type!r}, days={list(self.days)}, months={list(self.months)})"
+
+    def _build_year(self, year: int) -> int:
+        full, weekday, mday, month = _calendar_masks(year)
+
+        def any_of(table, keys):
+            mask = 0
+            for key in keys:
+                if 0 <= key < len(table):
+                    mask |= table[key]
+            return mask
+
+        if self.type == "daily":
+            return full
+        if self.type == "weekly":
+            return any_of(weekday, self.days)
+        if self.type == "monthly":
+            return any_of(mday, self.days or (1,))
+        if self.type == "yearly":
+            return any_of(mday, self.days) & any_of(month, self.months)
+        if self.type == "semi_annual":
+            return any_of(mday, self.days) & any_of(month, SEMI_ANNUAL_MONTHS)
+        return 0
+
+    def year_mask(self, year: int) -> int:
+        mask = self._years.get(year)
+        if mask is None:
+            mask = self._years[year] = self._build_year(year)
+        return mask
+
+    def is_due(self, day) -> bool:
+        day = _as_date(day)
+        return bool(self.year_mask(day.year) >> _day_bit(day) & 1)
+
+    def due_between(self, start, end) -> bool:
+        return self._hits(_spans(_as_date(start), _as_date(end)))
+
+    def _hits(self, spans: list) -> bool:
+        return any(self.year_mask(year) & mask for year, mask in spans)
+
+    def next_due(self, after) -> date:
+        """First due date strictly after `after`, or None if the schedule never fires."""
+        after = _as_date(after)
+        for year in range(after.year, after.year + _NEXT_DUE_HORIZON):
+            mask = self.year_mask(year)
+            if year == after.year:
+                mask &= ~((1 << (_day_bit(after) + 1)) - 1)
+            if mask:
+                return date(year, 1, 1) + timedelta(days=(mask & -mask).bit_length() - 1)
+        return None
+
+
+@lru_cache(maxsize=None)
+def _compile(key: tuple) -> Schedule:
+    if key[0] not in SCHEDULE_TYPES:
+        print(f"[WARN] Unknown schedule type '{key[0]}', it will never be due")
+    return Schedule(*key)
+
+
+def compile_schedule(schedule) -> Schedule:
+    """Shared compiled Schedule for a schedule block; identical blocks compile once."""
+    return _compile(normalize_schedule(schedule))
+
+
+def week_bounds(day) -> tuple:
+    day = _as_date(day)
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def month_bounds(day) -> tuple:
+    day = _as_date(day)
+    return day.replace(day=1), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+# Export modes: which dates they cover and, optionally, which schedule types they keep
+EXPORT_MODES = {
+    "Today": (lambda d: (d, d), None),
+    "all_today": (lambda d: (d, d), None),
+    "This Week": (week_bounds, None),
+    "Monthly": (month_bounds, ("monthly",)),
+}
+
+
+class ScheduleEngine:
+    def __init__(self, templates: list):
+        self.templates = list(templates)
+        groups = {}
+        for i, template in enumerate(self.templates):
+            groups.setdefault(self.schedule_for(template), []).append(i)
+        # Templates sharing a schedule block are answered by one bitset test
+        self._groups = list(groups.items())
+
+    def schedule_for(self, template: dict) -> Schedule:
+        return compile_schedule(template.get("schedule", {}))
+
+    def due_between(self, start, end, types=None) -> list:
+        """Templates due on at least one date in [start, end], in configuration order."""
+        spans = _spans(_as_date(start), _as_date(end))
+        due = []
+        for schedule, indices in self._groups:
+            if (types is None or schedule.type in types) and schedule._hits(spans):
+                due.extend(indices)
+        return [self.templates[i] for i in sorted(due)]
+
+    def due_on(self, day, types=None) -> list:
+        return self.due_between(day, day, types)
+
+    def for_mode(self, mode: str, today=None) -> list:
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode: {mode}")
+        bounds, types = EXPORT_MODES[mode]
+        start, end = bounds(_as_date(today or date.today()))
+        return self.due_between(start, end, types)
+
+
+def templates_due(templates: list, mode: str, today=None) -> list:
+    return ScheduleEngine(templates).for_mode(mode, today)
@@ -1,49 +1,156 @@
-from datetime import datetime
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QMessageBox
+"""
+Report reminders: a min-heap of the next reminder of every template, driven by one
+re-armed QTimer. Each reminder fires on the days the template's schedule is due, at its
+`reminder_time`, and is pushed back with its next occurrence once it fired.
 
+The timer never sleeps longer than MAX_SLEEP_MS, so a suspended machine or a changed system
+clock is noticed within a minute: reminders missed by more than MISSED_GRACE are skipped,
+and a clock that went backwards rebuilds the heap.
 
-_reminder_timers = []
+Due templates are passed to the `on_due` callback of start_schedule; the dashboard shows
+them as notifications.
+"""
+import heapq
+import itertools
+from datetime import datetime, time, timedelta
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
 
-def start_schedule(templates):
-    clear_schedule()
+from engine.schedule import compile_schedule
 
-    for template in templates:
-        reminder = template.get("reminder_time")
-        if not reminder:
-            continue
+MAX_SLEEP_MS = 60 * 1000
+MISSED_GRACE = timedelta(hours=1)
+CLOCK_TOLERANCE = timedelta(seconds=5)
 
-        try:
-            hours, minutes = map(int, reminder.split(":"))
-        except:
-            continue
 
+def parse_reminder_time(value):
+    """Parses "HH:MM" into a datetime.time; YAML 1.1 also reads an unquoted 08:00 as 480 minutes."""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, int):
+            hours, minutes = divmod(value, 60)
+        else:
+            hours, minutes = map(int, str(value).split(":"))
+        return time(hours, minutes)
+    except (ValueError, TypeError):
+        print(f"[WARN] Invalid reminder_time: {value!r}")
+        return None
+
+
+def next_occurrence(schedule, at: time, after: datetime):
+    """First datetime strictly after `after` on a due day of `schedule` at `at`, or None."""
+    day = after.date()
+    if schedule.is_due(day) and datetime.combine(day, at) > after:
+        return datetime.combine(day, at)
+    next_day = schedule.next_due(day)
+    return datetime.combine(next_day, at) if next_day else None
+
+
+class ReminderQueue:
+    """Qt-free heap of (fire_at, seq, template, schedule, time); O(log n) per reminder."""
+
+    def __init__(self, grace: timedelta = MISSED_GRACE):
+        self.grace = grace
+        self.templates = []
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, template, schedule, at, after):
+        fire_at = next_occurrence(schedule, at, after)
+        if fire_at is not None:
+            heapq.heappush(self._heap, (fire_at, next(self._seq), template, schedule, at))
+
+    def rebuild(self, templates: list, now: datetime):
+        self.templates = list(templates)
+        self._heap = []
+        for template in self.templates:
+            at = parse_reminder_time(template.get("reminder_time"))
+            if at is not None:
+                self._push(template, compile_schedule(template.get("schedule", {})), at, now)
+
+    def next_at(self):
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list:
+        """Templates whose reminder is due at `now`; each is re-queued for its next occurrence."""
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, template, schedule, at = heapq.heappop(self._heap)
+            if now - fire_at <= self.grace:
+                fired.append(template)
+            else:
+                print(f"[WARN] Skipping reminder for {template.get('title')} missed at {fire_at:%Y-%m-%d %H:%M}")
+            # From this occurrence rather than `now`, so a later one still within grace is popped too
+            self._push(template, schedule, at, fire_at)
+        return fired
+
+
+class ReminderScheduler(QObject):
+    due = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue = ReminderQueue()
+        self._last_check = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self, templates: list):
+        self.queue.rebuild(templates, datetime.now())
+        print(f"[DEBUG] Scheduled {len(self.queue)} reminder(s), next at {self.queue.next_at()}")
+        self._arm()
+
+    def stop(self):
+        self._timer.stop()
+        self.queue.rebuild([], datetime.now())
+
+    def _arm(self):
+        self._last_check = datetime.now()
+        next_at = self.queue.next_at()
+        if next_at is None:
+            self._timer.stop()
+            return
+        ms = (next_at - self._last_check).total_seconds() * 1000
+        self._timer.start(int(min(max(ms, 0), MAX_SLEEP_MS)))
+
+    def _on_timeout(self):
         now = datetime.now()
-        reminder_time = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
-        if reminder_time < now:
-            reminder_time = reminder_time.replace(day=now.day + 1)
+        if self._last_check is not None and now < self._last_check - CLOCK_TOLERANCE:
+            print(f"[WARN] System clock went back from {self._last_check} to {now}, rescheduling reminders")
+            self.queue.rebuild(self.queue.templates, now)
+            fired = []
+        else:
+            fired = self.queue.pop_due(now)
+        # Re-arm before notifying so a slow slot cannot delay the next reminder
+        self._arm()
+        if fired:
+            self.due.emit(fired)
+
+
+_scheduler = None
+_on_due = None
+
+
+def _emit_due(templates):
+    if _on_due is not None:
+        _on_due(templates)
 
-        ms_until = int((reminder_time - now).total_seconds() * 1000)
 
-        timer = QTimer()
-        timer.setSingleShot(True)
-        timer.timeout.connect(lambda t=template: show_reminder_popup(t))
-        timer.start(ms_until)
+def start_schedule(templates, on_due=None):
+    """(Re)schedules reminders for `templates`; `on_due(templates)` receives the ones that fire."""
+    global _scheduler, _on_due
+    _on_due = on_due
+    if _scheduler is None:
+        _scheduler = ReminderScheduler()
+        _scheduler.due.connect(_emit_due)
+    _scheduler.start(templates)
 
-        _reminder_timers.append(timer)
 
 def clear_schedule():
-    global _reminder_timers
-    for timer in _reminder_timers:
-        if timer.isActive():
-            timer.stop()
-    _reminder_timers.clear()
-
-def show_reminder_popup(template):
-    title = template.get("title", "Unnamed Report")
-    msg = f"⏰ Reminder: It's time to fill the report:\n\n{title}"
-    alert = QMessageBox()
-    alert.setWindowTitle("⏰ Report Reminder")
-    alert.setText(msg)
-    alert.setStandardButtons(QMessageBox.Ok)
-    alert.exec()
+    if _scheduler is not None:
+        _scheduler.stop()
@@ -0,0 +1,115 @@
+"""
+Staged startup for MainWindow.
+
+StartupWorker runs the slow parts of opening the dashboard on a background thread, one stage
+at a time, and reports each stage with its duration so the window can fill in as results
+arrive. Stage timings of every startup are appended to data/startup_times.jsonl.
+"""
+import os
+import json
+import time
+import traceback
+from datetime import datetime
+from PySide6.QtCore import QObject, Signal
+
+from engine.config_snapshot import load_templates
+from engine.database import init_db, get_completed_template_ids
+from engine.i18n import load_language
+from engine.schedule import ScheduleEngine
+
+STARTUP_LOG = os.path.join("data", "startup_times.jsonl")
+STARTUP_LOG_KEEP = 200
+
+
+def template_rows(templates: list, schedules: ScheduleEngine, completed_ids: set, today) -> list:
+    """Everything the dashboard list shows per template, computed off the UI thread:
+    [(template, schedule type, label, tooltip, completed)]."""
+    rows = []
+    for template in templates:
+        tid = str(template["id"])
+        schedule = schedules.schedule_for(template)
+        completed = tid in completed_ids
+
+        label = f"{'✅' if completed else '🔔'} {tid} - {template['title']}"
+        if schedule.is_due(today):
+            label += "   📅 Due Today"
+        next_due = schedule.next_due(today)
+        tooltip = f"{schedule.type.capitalize()} — Next: {next_due.strftime('%Y-%m-%d') if next_due else '-'}"
+        rows.append((template, schedule.type, label, tooltip, completed))
+    return rows
+
+
+def record_startup(timings: dict):
+    """Appends one startup's stage timings (ms) to STARTUP_LOG, keeping the last STARTUP_LOG_KEEP."""
+    entry = {"at": datetime.now().isoformat(timespec="seconds")}
+    entry.update({name: round(ms, 1) for name, ms in timings.items()})
+    try:
+        os.makedirs(os.path.dirname(STARTUP_LOG), exist_ok=True)
+        lines = []
+        if os.path.exists(STARTUP_LOG):
+            with open(STARTUP_LOG, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()[-(STARTUP_LOG_KEEP - 1):]
+        lines.append(json.dumps(entry))
+        with open(STARTUP_LOG, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    except OSError as e:
+        print(f"[WARN] Could not record startup timings: {e}")
+
+
+class StartupWorker(QObject):
+    stage_finished = Signal(str, float, object)   # (stage, ms, result or None)
+    stage_failed = Signal(str, str)
+    finished = Signal(dict)                        # {stage: ms}
+
+    def __init__(self, language: str = "fr"):
+        super().__init__()
+        self.language = language
+        self.templates = []
+        self.schedules = None
+        self._cancelled = False
+
+    def cancel(self):
+        """Stops before the next stage; the running one completes."""
+        self._cancelled = True
+
+    def stages(self):
+        return [
+            ("language", lambda: load_language(self.language)),
+            ("init_db", init_db),
+            ("config", self.load_config),
+            ("list", self.build_list),
+            ("template_index", self.update_template_index),
+        ]
+
+    def load_config(self):
+        # Raises so a broken task_rules.yaml is reported as a failed stage
+        self.templates = load_templates(strict=True)
+        self.schedules = ScheduleEngine(self.templates)
+        return self.templates, self.schedules
+
+    def build_list(self):
+        completed_ids = get_completed_template_ids()
+        today = datetime.today().date()
+        return completed_ids, template_rows(self.templates, self.schedules, completed_ids, today)
+
+    def update_template_index(self):
+        from engine.template_index import update_index  # loads the docx stack
+
+        update_index()
+
+    def run(self):
+        timings = {}
+        for name, stage in self.stages():
+            if self._cancelled:
+                print(f"[DEBUG] Startup cancelled before stage {name}")
+                break
+            started = time.perf_counter()
+            result = None
+            try:
+                result = stage()
+            except Exception as e:
+                traceback.print_exc()
+                self.stage_failed.emit(name, str(e))
+            timings[name] = (time.perf_counter() - started) * 1000
+            self.stage_finished.emit(name, timings[name], result)
+        self.finished.emit(timings)
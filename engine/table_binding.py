@@ -0,0 +1,97 @@
+from docx import Document
+from docx.oxml.ns import qn
+
+from engine.placeholders import placeholder_names
+from engine.template_cache import load_cached
+
+_TBL = qn("w:tbl")
+_TR = qn("w:tr")
+_T = qn("w:t")
+
+
+def _rows(tbl) -> list:
+    return [child for child in tbl if child.tag == _TR]
+
+
+class TableBindings:
+    """
+    Placeholder rows of one template, found once per template version.
+    `rows` holds (table index, row index, placeholder names) where the table index counts every
+    w:tbl of the body in document order, nested tables included.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._resolved = {}
+        self._conflicts = set()
+
+    @classmethod
+    def from_document(cls, doc):
+        rows = []
+        for ti, tbl in enumerate(doc.element.body.iter(_TBL)):
+            for ri, tr in enumerate(_rows(tbl)):
+                text = "".join(t.text or "" for t in tr.iter(_T))
+                names = frozenset(placeholder_names(text))
+                if names:
+                    rows.append((ti, ri, names))
+        return cls(rows)
+
+    def rows_for(self, columns) -> list:
+        """
+        (table index, row index) of the rows a list field with these columns expands into:
+        in each table, the first row sharing the most placeholders with the columns.
+        """
+        key = frozenset(columns)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        best = 0
+        per_table = {}
+        for ti, ri, names in self.rows:
+            score = len(names & key)
+            if score == 0:
+                continue
+            best = max(best, score)
+            if ti not in per_table or score > per_table[ti][1]:
+                per_table[ti] = (ri, score)
+
+        bound = [(ti, ri) for ti, (ri, score) in sorted(per_table.items()) if score == best]
+        self._resolved[key] = bound
+        return bound
+
+    def assign(self, fields: dict, template_filename: str = "") -> dict:
+        """
+        {(table index, row index): field name} for {field name: columns}. A row is expanded
+        once: when several fields bind to it the first keeps it, the others are skipped and
+        reported once per template version.
+        """
+        assigned = {}
+        for name, columns in fields.items():
+            for target in self.rows_for(columns):
+                if target not in assigned:
+                    assigned[target] = name
+                    continue
+                if (target, name) not in self._conflicts:
+                    self._conflicts.add((target, name))
+                    print(f"[WARN] {template_filename}: '{name}' binds to table {target[0]} row {target[1]}, "
+                          f"already used by '{assigned[target]}'; skipped")
+        return assigned
+
+
+def get_table_bindings(template_filename: str) -> TableBindings:
+    return load_cached(
+        template_filename, "table_bindings",
+        lambda path: TableBindings.from_document(load_cached(template_filename, "document", Document)),
+    )
+
+
+def bound_rows(doc, bindings: TableBindings, fields: dict, template_filename: str = "") -> list:
+    """
+    Resolves {field name: columns} against a filled copy of the template.
+    Returns (field name, w:tr element) pairs; all rows are looked up before any is expanded.
+    """
+    tables = list(doc.element.body.iter(_TBL))
+    return [
+        (name, _rows(tables[ti])[ri])
+        for (ti, ri), name in bindings.assign(fields, template_filename).items()
+    ]
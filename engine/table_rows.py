@@ -0,0 +1,136 @@
+import copy
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from engine.placeholders import placeholder_names
+
+_TC = qn("w:tc")
+_TCPR = qn("w:tcPr")
+_TBL = qn("w:tbl")
+_P = qn("w:p")
+_R = qn("w:r")
+_T = qn("w:t")
+_PPR = qn("w:pPr")
+_RPR = qn("w:rPr")
+_JC = qn("w:jc")
+_XML_SPACE = qn("xml:space")
+
+ALIGNMENTS = {"left", "center", "right"}
+
+
+def _in_nested_table(node, tc) -> bool:
+    node = node.getparent()
+    while node is not None and node is not tc:
+        if node.tag == _TBL:
+            return True
+        node = node.getparent()
+    return False
+
+
+def _cell_text(tc) -> str:
+    return "".join(t.text or "" for t in tc.iter(_T))
+
+
+def _own_text(tc) -> str:
+    # Text of the cell itself, without the tables nested in it
+    return "".join(t.text or "" for t in tc.iter(_T) if not _in_nested_table(t, tc))
+
+
+def _first_run_props(tc):
+    for r in tc.iter(_R):
+        if not _in_nested_table(r, tc) and any((t.text or "") for t in r.iter(_T)):
+            return r.find(_RPR)
+    return None
+
+
+def _blank_cell(tc):
+    """
+    Copy of `tc` reduced to a single paragraph holding a single run, keeping the cell,
+    paragraph and run properties of the template cell. The paragraph always carries a w:jc.
+    Everything else in the cell (further paragraphs, nested tables, content controls) is
+    dropped: a dynamic row cell holds one value.
+    """
+    proto = copy.deepcopy(tc)
+    p = proto.find(_P)
+    for child in list(proto):
+        if child.tag != _TCPR and child is not p:
+            proto.remove(child)
+
+    if p is not None:
+        for child in list(p):
+            if child.tag != _PPR:
+                p.remove(child)
+    else:
+        p = OxmlElement("w:p")
+        proto.append(p)
+
+    p.get_or_add_pPr().get_or_add_jc()
+
+    run = OxmlElement("w:r")
+    r_pr = _first_run_props(tc)
+    if r_pr is not None:
+        run.append(copy.deepcopy(r_pr))
+    t = OxmlElement("w:t")
+    t.set(_XML_SPACE, "preserve")
+    run.append(t)
+    p.append(run)
+    return proto
+
+
+def _column_keys(tcs, records) -> list:
+    """
+    Key to read from each record for every cell: the placeholder name when the cell holds
+    exactly one known placeholder, else the record key at the same position.
+    """
+    first = records[0]
+    known = set(first)
+    positional = list(first)
+    keys = []
+    for j, tc in enumerate(tcs):
+        names = placeholder_names(_own_text(tc))
+        if len(names) == 1 and names[0] in known:
+            keys.append(names[0])
+        elif j < len(positional):
+            keys.append(positional[j])
+        else:
+            keys.append(None)
+    return keys
+
+
+def expand_rows(placeholder_tr, records: list) -> set:
+    """
+    Replaces `placeholder_tr` with one copy per record, in place. Each record maps column name
+    to {"text": ..., "align": ...} (see TableInput.get_data). The template row is copied as XML,
+    so cell borders, shading, fonts and sizes come from the template.
+    Returns the placeholder names the row contained.
+    """
+    tcs = [child for child in placeholder_tr if child.tag == _TC]
+    consumed = set(placeholder_names(_cell_text(placeholder_tr)))
+    if not records:
+        placeholder_tr.getparent().remove(placeholder_tr)
+        return consumed
+
+    keys = _column_keys(tcs, records)
+    proto = copy.deepcopy(placeholder_tr)
+    for tc in [child for child in proto if child.tag == _TC]:
+        proto.replace(tc, _blank_cell(tc))
+
+    for record in records:
+        tr = copy.deepcopy(proto)
+        # _blank_cell left exactly one p/r/t and one p/pPr/jc in each direct cell
+        for tc, key in zip(tr.findall(_TC), keys):
+            t = tc.find(f"{_P}/{_R}/{_T}")
+            jc = tc.find(f"{_P}/{_PPR}/{_JC}")
+            cell_data = record.get(key) if key is not None else None
+            if isinstance(cell_data, dict):
+                text = cell_data.get("text", "")
+                align = cell_data.get("align", "left")
+            else:
+                text = "" if cell_data is None else cell_data
+                align = "left"
+            t.text = str(text)
+            jc.set(qn("w:val"), align if align in ALIGNMENTS else "left")
+        placeholder_tr.addprevious(tr)
+
+    placeholder_tr.getparent().remove(placeholder_tr)
+    return consumed
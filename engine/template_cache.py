@@ -0,0 +1,111 @@
+import os
+import copy
+import hashlib
+import threading
+from docx import Document
+
+TEMPLATES_DIR = "templates"
+
+_lock = threading.RLock()
+_entries = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def template_path(template_filename: str) -> str:
+    return os.path.abspath(os.path.join(TEMPLATES_DIR, template_filename))
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fresh_entry(key):
+    """
+    Returns the cached entry for `key` (path, kind) if the file on disk is unchanged.
+    A changed mtime alone triggers a re-hash; the entry is only dropped if the content differs.
+    Must be called with _lock held.
+    """
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+
+    path = key[0]
+    st = os.stat(path)
+    if (st.st_mtime_ns, st.st_size) == (entry["mtime_ns"], entry["size"]):
+        return entry
+
+    digest = file_digest(path)
+    if digest == entry["digest"]:
+        entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+        return entry
+
+    print(f"[DEBUG] Template changed on disk, dropping cache entry: {path} ({key[1]})")
+    del _entries[key]
+    _stats["invalidations"] += 1
+    return None
+
+
+def _load_entry(path: str, kind: str, build) -> dict:
+    key = (path, kind)
+    with _lock:
+        entry = _fresh_entry(key)
+        if entry is not None:
+            _stats["hits"] += 1
+            return entry
+
+        st = os.stat(path)
+        entry = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "digest": file_digest(path),
+            "value": build(path),
+        }
+        _entries[key] = entry
+        _stats["misses"] += 1
+        print(f"[DEBUG] Parsed template into cache: {path} ({kind})")
+        return entry
+
+
+def load_cached(template_filename: str, kind: str, build):
+    """
+    Returns the shared object built by `build(path)` for the template, building it at most
+    once per template version. The result is shared: callers must not mutate it.
+    """
+    return _load_entry(template_path(template_filename), kind, build)["value"]
+
+
+def load_template(template_filename: str):
+    """
+    Returns an independent python-docx Document for the template.
+    The template is parsed once per process; callers get a deep copy they are free to mutate.
+    """
+    return copy.deepcopy(load_cached(template_filename, "document", Document))
+
+
+def template_digest(template_filename: str) -> str:
+    path = template_path(template_filename)
+    with _lock:
+        for (entry_path, kind) in list(_entries):
+            if entry_path == path:
+                entry = _fresh_entry((entry_path, kind))
+                if entry is not None:
+                    return entry["digest"]
+    return file_digest(path)
+
+
+def cache_stats() -> dict:
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_entries)
+    return stats
+
+
+def clear_template_cache():
+    with _lock:
+        _entries.clear()
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,228 @@
+"""
+Persistent index of the placeholders each template contains.
+
+    python -m engine.template_index           rebuild changed templates and print a summary
+    python -m engine.template_index --check   also cross-check against config/template_fields.yaml
+"""
+import os
+import re
+import sys
+import json
+import glob
+import zipfile
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+
+from engine.placeholders import placeholder_names, paragraph_text
+from engine.template_cache import TEMPLATES_DIR, file_digest
+from engine.table_binding import TableBindings
+from engine.field_config import FIELDS_PATH, load_all_fields
+from engine.utils import compute_monthly_summary
+
+INDEX_PATH = os.path.join("data", "template_index.json")
+INDEX_VERSION = 1
+
+_PART_RE = re.compile(r"^word/(document|header\d*|footer\d*)\.xml$")
+_P = qn("w:p")
+_TC = qn("w:tc")
+_TR = qn("w:tr")
+_TBL = qn("w:tbl")
+
+_loaded = {"mtime_ns": None, "index": None}
+
+
+def _empty_index() -> dict:
+    return {"version": INDEX_VERSION, "fields_digest": None, "templates": {}}
+
+
+def _ancestor(node, tag):
+    node = node.getparent()
+    while node is not None and node.tag != tag:
+        node = node.getparent()
+    return node
+
+
+def _scan_part(root, part: str, placeholders: dict, rows: list):
+    tables = {tbl: i for i, tbl in enumerate(root.iter(_TBL))}
+    row_names = {}
+
+    for pi, p in enumerate(root.iter(_P)):
+        names = placeholder_names(paragraph_text(p))
+        if not names:
+            continue
+
+        tc = _ancestor(p, _TC)
+        if tc is None:
+            location = {"part": part, "kind": "paragraph", "paragraph": pi}
+        else:
+            tr = tc.getparent()
+            tbl = tr.getparent()
+            ti = tables[tbl]
+            ri = [c for c in tbl if c.tag == _TR].index(tr)
+            ci = [c for c in tr if c.tag == _TC].index(tc)
+            location = {"part": part, "kind": "cell", "table": ti, "row": ri, "cell": ci}
+            if part == "document":
+                row_names.setdefault((ti, ri), set()).update(names)
+
+        for name in names:
+            placeholders.setdefault(name, []).append(location)
+
+    rows.extend((ti, ri, frozenset(names)) for (ti, ri), names in row_names.items())
+
+
+def scan_template(path: str) -> dict:
+    placeholders = {}
+    rows = []
+    with zipfile.ZipFile(path) as zf:
+        for name in zf.namelist():
+            match = _PART_RE.match(name)
+            if match:
+                _scan_part(parse_xml(zf.read(name)), match.group(1), placeholders, rows)
+    return {
+        "placeholders": placeholders,
+        "rows": sorted([ti, ri, sorted(names)] for ti, ri, names in rows),
+    }
+
+
+def _repeating_fields(entry: dict, template_filename: str, fields: dict) -> dict:
+    """{list field: placeholder names of the rows it repeats} using the table columns in config."""
+    bindings = TableBindings([(ti, ri, frozenset(names)) for ti, ri, names in entry["rows"]])
+    names_at = {(ti, ri): names for ti, ri, names in entry["rows"]}
+    repeating = {}
+    for field in fields.get(template_filename) or []:
+        if field.get("type") != "table":
+            continue
+        columns = [col["name"] for col in field.get("columns", [])]
+        bound = sorted({n for row in bindings.rows_for(columns) for n in names_at[row]})
+        if bound:
+            repeating[field["name"]] = bound
+    return repeating
+
+
+def load_index() -> dict:
+    """Reads the index from disk, re-reading only when the file changed."""
+    try:
+        mtime_ns = os.stat(INDEX_PATH).st_mtime_ns
+    except OSError:
+        return _empty_index()
+
+    if mtime_ns != _loaded["mtime_ns"]:
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except Exception as e:
+            print(f"[ERROR] Failed to load template index: {e}")
+            return _empty_index()
+        if index.get("version") != INDEX_VERSION:
+            return _empty_index()
+        _loaded["mtime_ns"], _loaded["index"] = mtime_ns, index
+    return _loaded["index"]
+
+
+def _save_index(index: dict):
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    tmp_path = INDEX_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, INDEX_PATH)
+
+
+def update_index() -> dict:
+    """
+    Brings the index up to date with templates/*.docx. Unchanged files (same mtime and size)
+    are not opened; a changed file is only re-scanned when its content hash differs.
+    """
+    index = load_index()
+    templates = index["templates"]
+    fields = load_all_fields()
+    fields_digest = file_digest(FIELDS_PATH) if os.path.exists(FIELDS_PATH) else None
+    changed = fields_digest != index.get("fields_digest")
+
+    present = set()
+    for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, "*.docx"))):
+        name = os.path.basename(path)
+        present.add(name)
+        st = os.stat(path)
+        entry = templates.get(name)
+        if entry and (entry["mtime_ns"], entry["size"]) == (st.st_mtime_ns, st.st_size):
+            continue
+
+        digest = file_digest(path)
+        if not entry or entry["digest"] != digest:
+            print(f"[DEBUG] Indexing template: {name}")
+            entry = scan_template(path)
+            entry["digest"] = digest
+            entry["repeating"] = _repeating_fields(entry, name, fields)
+        entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+        templates[name] = entry
+        changed = True
+
+    for name in set(templates) - present:
+        del templates[name]
+        changed = True
+
+    if fields_digest != index.get("fields_digest"):
+        for name, entry in templates.items():
+            entry["repeating"] = _repeating_fields(entry, name, fields)
+        index["fields_digest"] = fields_digest
+
+    if changed:
+        _save_index(index)
+    return index
+
+
+def check_against_fields(index: dict, fields: dict) -> list:
+    """
+    Mismatches between the index and template_fields.yaml as readable lines:
+    fields with no placeholder in the template and placeholders with no field.
+    """
+    problems = []
+    for name in sorted(set(index["templates"]) | set(fields)):
+        entry = index["templates"].get(name)
+        config = fields.get(name) or []
+        if entry is None:
+            problems.append(f"{name}: configured but no such template")
+            continue
+
+        placeholders = set(entry["placeholders"])
+        repeating = entry.get("repeating", {})
+        configured = set()
+        for field in config:
+            if field.get("type") == "table":
+                if field["name"] not in repeating:
+                    problems.append(f"{name}: table field '{field['name']}' is not bound to any table row")
+                columns = {col["name"] for col in field.get("columns", [])}
+                configured |= columns
+                for column in sorted(columns - placeholders):
+                    problems.append(f"{name}: column '{field['name']}.{column}' has no placeholder")
+            elif field.get("type") == "multiweek":
+                # Filled through the monthly summary keys, not its own placeholder
+                configured |= set(compute_monthly_summary([]))
+            else:
+                configured.add(field["name"])
+                if field["name"] not in placeholders:
+                    problems.append(f"{name}: field '{field['name']}' has no placeholder")
+
+        for placeholder in sorted(placeholders - configured):
+            problems.append(f"{name}: placeholder '{{{{{placeholder}}}}}' has no configured field")
+    return problems
+
+
+def main(argv) -> int:
+    index = update_index()
+    for name, entry in sorted(index["templates"].items()):
+        repeating = ", ".join(entry.get("repeating", {})) or "-"
+        print(f"{name}: {len(entry['placeholders'])} placeholders, repeating rows: {repeating}")
+
+    if "--check" not in argv:
+        return 0
+
+    problems = check_against_fields(index, load_all_fields())
+    for line in problems:
+        print(f"[WARN] {line}")
+    print(f"{len(problems)} mismatch(es) with {FIELDS_PATH}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
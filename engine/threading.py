@@ -1,11 +1,10 @@
 
-import time
-from datetime import datetime
 from PySide6.QtCore import QObject, Signal
-from engine.autofill import load_autofill_data
-from engine.docx_filler import fill_template
-from engine.exporter import docx_to_pdf
-from engine.database import log_task_completion
+from engine.template_cache import cache_stats
+from engine.pdf_service import get_pdf_service
+from engine.export_pipeline import run_export, count_statuses
+from engine.schedule import templates_due
+from engine.render_cache import materialize_report, render_pdf, render_cache_stats
 import traceback
 
 
@@ -28,10 +27,8 @@ class ReportGenerationWorker(QObject):
         try:
             self.progress.emit(10)
             if self._cancelled: return
-            docx_path = fill_template(self.data, self.filename)
-            self.progress.emit(50)
-            if self._cancelled: return
-            pdf_path = docx_to_pdf(docx_path)
+            docx_path, pdf_path = materialize_report(self.data, self.filename, progress=self.progress.emit)
+            print(f"[DEBUG] Render cache: {render_cache_stats()}")
             self.progress.emit(100)
             if self._cancelled: return
             self.finished.emit(docx_path, pdf_path)
@@ -40,7 +37,7 @@ class ReportGenerationWorker(QObject):
 
 
 class ReportPreviewWorker(QObject):
-    finished = Signal(str)
+    finished = Signal(object)         # PDF bytes
     failed = Signal(str)
     progress = Signal(int)
 
@@ -57,13 +54,12 @@ class ReportPreviewWorker(QObject):
         try:
             self.progress.emit(20)
             if self._cancel: return
-            docx_path = fill_template(self.data, self.filename, preview_mode=True)
-            self.progress.emit(60)
-            if self._cancel: return
-            pdf_path = docx_to_pdf(docx_path)
+            # Kept in memory: a preview writes no files
+            pdf_bytes = render_pdf(self.data, self.filename, persist=False)
+            print(f"[DEBUG] Render cache: {render_cache_stats()}")
             self.progress.emit(100)
             if self._cancel: return
-            self.finished.emit(pdf_path)
+            self.finished.emit(pdf_bytes)
         except Exception as e:
             self.failed.emit(str(e))
 
@@ -74,10 +70,11 @@ class ExportWorker(QObject):
     failed = Signal(str)
     canceled = Signal()               # emitted if user cancels
 
-    def __init__(self, templates, mode):
+    def __init__(self, templates, mode, jobs=None):
         super().__init__()
         self.templates = templates
         self.mode = mode
+        self.jobs = jobs
         self._cancelled = False
 
     def cancel(self):
@@ -85,87 +82,24 @@ class ExportWorker(QObject):
 
     def run(self):
         try:
-            today = datetime.today()
-            day = today.day
-            weekday = today.weekday()
-            month = today.month
-
-            # ⛳ Filter templates
-            to_export = []
-            for t in self.templates:
-                sched = t.get("schedule", {})
-                if isinstance(sched, str):
-                    sched = {"type": sched}
-
-                s_type = sched.get("type", "daily")
-                s_days = sched.get("days", [])
-                s_months = sched.get("months", [])
-
-                is_due = False
-                if self.mode in ["all_today", "Today"]:
-                    is_due = (
-                        s_type == "daily"
-                        or (s_type == "weekly" and weekday in s_days)
-                        or (s_type == "monthly" and (day in s_days if s_days else day == 1))
-                        or (s_type == "yearly" and day in s_days and month in s_months)
-                        or (s_type == "semi_annual" and month in [1, 7] and day in s_days)
-                    )
-                elif self.mode == "This Week":
-                    is_due = s_type in ["daily", "weekly"]
-                elif self.mode == "Monthly":
-                    is_due = s_type == "monthly"
-
-                if is_due:
-                    to_export.append(t)
+            to_export = templates_due(self.templates, self.mode)
 
             total = len(to_export)
             if total == 0 or self._cancelled:
                 self.canceled.emit()
                 return
 
-            exported = 0
-            skipped = 0
-
-            for i, template in enumerate(to_export):
-                if self._cancelled:
-                    self.canceled.emit()
-                    return
-
-                try:
-                    template_id = str(template["id"])
-                    data = load_autofill_data(template_id)
-
-                    if not data:
-                        skipped += 1
-                        continue
-
-                    data["num2"] = template_id
-
-                    if self._cancelled:
-                        self.canceled.emit()
-                        return
-
-                    docx_path = fill_template(data, template["filename"])
-
-                    if self._cancelled:
-                        self.canceled.emit()
-                        return
-
-                    pdf_path = docx_to_pdf(docx_path)
-
-                    if self._cancelled:
-                        self.canceled.emit()
-                        return
-
-                    log_task_completion(template["id"], docx_path)
-                    exported += 1
-
-                except Exception as e:
-                    print(f"[ERROR] Failed to export {template['filename']}: {e}")
-                    print(traceback.format_exc())
-                    skipped += 1
-
-                self.progress.emit(int((i + 1) / total * 100))
+            results = run_export(
+                to_export,
+                jobs=self.jobs,
+                progress=lambda done, count: self.progress.emit(int(done / count * 100)),
+                is_cancelled=lambda: self._cancelled,
+            )
+            exported = count_statuses(results)["exported"]
+            skipped = len(results) - exported
+
+            print(f"[DEBUG] Template cache after export: {cache_stats()}")
+            print(f"[DEBUG] PDF service after export: {get_pdf_service().metrics()}")
 
             if self._cancelled:
                 self.canceled.emit()
@@ -1,55 +1,138 @@
-import os
-import yaml
+import time
+from collections import OrderedDict
 from datetime import datetime
-from PySide6.QtCore import Qt, QTimer, QTime, QThread
+from PySide6.QtCore import Qt, QTimer, QTime, QThread, QCoreApplication
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
     QMainWindow, QLabel, QPushButton, QVBoxLayout, QWidget, QHBoxLayout,
     QListWidget, QListWidgetItem, QMessageBox, QDialog, QTableWidget, QTableWidgetItem,
     QHeaderView
 )
-from PySide6.QtGui import QPixmap
-
-from engine.threading import ExportWorker
-from engine.utils import get_next_due_date
-from engine.autofill import save_autofill_data, load_autofill_data
-from gui.task_dialog import TaskDialog
-from engine.docx_filler import fill_template
-from engine.exporter import docx_to_pdf, print_file
+
+# The docx stack, PDF preview, xlsx import and export workers are imported where first
+# used so the window can show before they load
+from engine.schedule import ScheduleEngine
+from engine.autofill import load_autofill_data
 from engine.scheduler import start_schedule
 from engine.database import (
-    init_db, log_task_completion,
-    get_completed_template_ids, get_all_completed_tasks, clear_all_completed_tasks
+    get_completed_template_ids, get_all_completed_tasks, clear_all_completed_tasks,
+    HISTORY_LIMIT,
 )
 from engine.i18n import load_language, translate, current_lang
+from engine.field_config import fields_version
+from engine.startup import StartupWorker, template_rows, record_startup
+from gui.reminders import ReminderNotifier
 from widgets.loading_overlay import LoadingOverlay
 
+# Task dialogs kept alive for reuse, most recently opened last
+TASK_DIALOG_CACHE = 8
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        init_db()
-        load_language("fr")
         self.setWindowTitle("📋 DWPT Report Dashboard")
         self.setMinimumSize(1000, 700)
 
         self.loading_overlay = LoadingOverlay(self)
         self.loading_overlay.setVisible(False)
 
-        self.templates = self.load_templates()
+        # Filled in by the startup stages; the window shows as a skeleton until then
+        self.templates = []
+        self.schedules = ScheduleEngine(self.templates)
+        self.completed_ids = None
+        self.list_rows = None
+        self.task_dialogs = OrderedDict()
+        self.startup_timings = {}
+        self._startup_began = time.perf_counter()
+        self.db_buttons = []
+        self.ready_stages = set()
+        self.failed_stages = {}
+        self.reminder_notifier = ReminderNotifier(self)
+        self.reminder_notifier.open_requested.connect(self.open_template)
         self.init_ui()
-        start_schedule(self.templates)
 
-    def load_templates(self):
-        with open("config/task_rules.yaml", "r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
-            print("[DEBUG] Loaded templates:", data)
-            return data.get("templates", [])
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_clock)
+        self.timer.start(1000)
+        self.update_clock()
+
+        self.start_startup()
+
+    def start_startup(self):
+        """Runs database, language, config, list and index loading on a background thread."""
+        self.startup_thread = QThread(self)
+        self.startup_worker = StartupWorker("fr")
+        self.startup_worker.moveToThread(self.startup_thread)
+
+        self.startup_thread.started.connect(self.startup_worker.run)
+        self.startup_worker.stage_finished.connect(self.on_startup_stage)
+        self.startup_worker.stage_failed.connect(self.on_startup_stage_failed)
+        self.startup_worker.finished.connect(self.on_startup_finished)
+        self.startup_worker.finished.connect(self.startup_thread.quit)
+        self.startup_worker.finished.connect(self.startup_worker.deleteLater)
+        self.startup_thread.finished.connect(self.on_startup_thread_finished)
+        self.startup_thread.finished.connect(self.startup_thread.deleteLater)
+        # app.quit() skips closeEvent, so stop the stages on both paths
+        QCoreApplication.instance().aboutToQuit.connect(self.stop_startup)
+        self.startup_thread.start()
+
+    def on_startup_thread_finished(self):
+        self.startup_thread = None
+        self.startup_worker = None
+
+    def stop_startup(self):
+        """Skips the remaining stages and waits for the one that is running."""
+        if self.startup_thread is None:
+            return
+        self.startup_worker.cancel()
+        self.startup_thread.quit()
+        self.startup_thread.wait()
+
+    def closeEvent(self, event):
+        self.stop_startup()
+        super().closeEvent(event)
+
+    def on_startup_stage_failed(self, stage, msg):
+        print(f"[ERROR] Startup stage {stage} failed: {msg}")
+        self.failed_stages[stage] = msg
+
+    def on_startup_stage(self, stage, ms, result):
+        self.startup_timings[stage] = ms
+        print(f"[DEBUG] Startup stage {stage}: {ms:.0f} ms")
+
+        if stage not in self.failed_stages:
+            self.ready_stages.add(stage)
+
+        if stage == "language":
+            self.retranslate_ui()
+        elif stage == "init_db":
+            self.update_db_buttons()
+        elif stage == "config" and stage in self.failed_stages:
+            QMessageBox.critical(self, "❌", f"Could not load the templates:\n{self.failed_stages[stage]}")
+        elif stage == "config" and result is not None:
+            self.templates, self.schedules = result
+            print(f"[DEBUG] Loaded {len(self.templates)} template(s)")
+            started = time.perf_counter()
+            start_schedule(self.templates, on_due=self.reminder_notifier.notify)
+            self.startup_timings["schedule"] = (time.perf_counter() - started) * 1000
+            self.update_db_buttons()
+        elif stage == "list" and result is not None:
+            self.completed_ids, self.list_rows = result
+            self.fill_template_list()
+
+    def on_startup_finished(self, _):
+        self.startup_timings["total"] = (time.perf_counter() - self._startup_began) * 1000
+        summary = ", ".join(f"{name} {ms:.0f}" for name, ms in self.startup_timings.items())
+        print(f"[DEBUG] Startup finished (ms): {summary}")
+        record_startup(self.startup_timings)
+
+    def update_db_buttons(self):
+        # Usable once the tables exist and the templates are loaded
+        ready = {"init_db", "config"} <= self.ready_stages
+        for btn in self.db_buttons:
+            btn.setEnabled(ready)
 
     def init_ui(self):
-        old_widget = self.centralWidget()
-        if old_widget:
-            old_widget.setParent(None)
-
         self.main_widget = QWidget()
         self.layout = QVBoxLayout(self.main_widget)
         self.setCentralWidget(self.main_widget)
@@ -59,24 +142,20 @@ class MainWindow(QMainWindow):
         self.clock_label.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(self.clock_label)
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_clock)
-        self.timer.start(1000)
-        self.update_clock()
-
         self.lang_switch = QPushButton("🇫🇷 / 🇩🇿")
         self.lang_switch.clicked.connect(self.toggle_language)
 
         lang_layout = QHBoxLayout()
-        lang_layout.addWidget(QLabel("🌍 " + translate("language")))
+        self.lang_label = QLabel()
+        lang_layout.addWidget(self.lang_label)
         lang_layout.addWidget(self.lang_switch)
         lang_layout.addStretch()
         self.layout.addLayout(lang_layout)
 
-        title = QLabel(translate("title"))
-        title.setFont(QFont("Segoe UI", 15, QFont.Bold))
-        title.setAlignment(Qt.AlignCenter)
-        self.layout.addWidget(title)
+        self.title_label = QLabel()
+        self.title_label.setFont(QFont("Segoe UI", 15, QFont.Bold))
+        self.title_label.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.title_label)
 
 
 
@@ -95,80 +174,76 @@ class MainWindow(QMainWindow):
         self.list_widget = QListWidget()
         self.layout.addWidget(self.list_widget)
 
-        self.reload_template_list()
+        self.fill_template_list()
 
         batch_layout = QHBoxLayout()
         for label in [("📤 Export All Due Today", "Today"),
                       ("📤 Export This Week", "This Week"),
                       ("📤 Export Monthly Reports", "Monthly")]:
             btn = QPushButton(label[0])
+            self.db_buttons.append(btn)
             btn.clicked.connect(lambda _, m=label[1]: self.export_due(m))
             batch_layout.addWidget(btn)
         self.layout.addLayout(batch_layout)
 
         controls_layout = QHBoxLayout()
-        open_btn = QPushButton("📝 " + translate("open_selected"))
-        open_btn.clicked.connect(self.open_selected_template)
-        history_btn = QPushButton("📊 " + translate("view_history"))
-        history_btn.clicked.connect(self.show_history_view)
-        controls_layout.addWidget(open_btn)
-        controls_layout.addWidget(history_btn)
+        self.open_btn = QPushButton()
+        self.open_btn.clicked.connect(self.open_selected_template)
+        self.history_btn = QPushButton()
+        self.history_btn.clicked.connect(self.show_history_view)
+        controls_layout.addWidget(self.open_btn)
+        controls_layout.addWidget(self.history_btn)
+        self.db_buttons += [self.open_btn, self.history_btn]
+        self.update_db_buttons()
         self.layout.addLayout(controls_layout)
 
+        self.retranslate_ui()
+
+    def retranslate_ui(self):
+        """Applies the current language to the texts that are translated."""
+        self.lang_label.setText("🌍 " + translate("language"))
+        self.title_label.setText(translate("title"))
+        self.open_btn.setText("📝 " + translate("open_selected"))
+        self.history_btn.setText("📊 " + translate("view_history"))
+        self.fill_template_list()
+
     def update_clock(self):
         self.clock_label.setText("🕒 " + QTime.currentTime().toString("hh:mm:ss"))
 
     def toggle_language(self):
         load_language("ar" if current_lang() == "fr" else "fr")
-        self.init_ui()
+        self.retranslate_ui()
 
     def apply_filter(self, filter_name):
         self.active_filter = filter_name
         for name, btn in self.filter_buttons.items():
             btn.setChecked(name == filter_name)
-        self.reload_template_list()
+        self.fill_template_list()
 
     def reload_template_list(self):
+        """Recomputes the list after completions changed; before startup has built it,
+        shows what is known so far."""
+        if self.list_rows is not None:
+            self.completed_ids = get_completed_template_ids()
+            self.list_rows = template_rows(self.templates, self.schedules, self.completed_ids,
+                                           datetime.today().date())
+        self.fill_template_list()
+
+    def fill_template_list(self):
+        self.list_widget.setUpdatesEnabled(False)
         self.list_widget.clear()
-        completed_ids = get_completed_template_ids()
-        now = datetime.today()
-
-        for template in self.templates:
-            tid = str(template["id"])
-            title = template["title"]
-            sched = template.get("schedule", {})
-            if isinstance(sched, str):
-                sched = {"type": sched}
-
-            s_type = sched.get("type", "daily")
-            s_days = sched.get("days", [])
-            s_months = sched.get("months", [])
-
-            show = (self.active_filter == "All") or (self.active_filter.lower() == s_type)
-            if not show:
-                continue
-
-            due_today = (
-                (s_type == "daily") or
-                (s_type == "weekly" and now.weekday() in s_days) or
-                (s_type == "monthly" and (now.day in s_days if s_days else now.day == 1)) or
-                (s_type == "semi_annual" and now.month in [1, 7] and now.day in s_days) or
-                (s_type == "yearly" and now.day in s_days and now.month in s_months)
-            )
-
-            label = f"{'✅' if tid in completed_ids else '🔔'} {tid} - {title}"
-            if due_today:
-                label += "   📅 Due Today"
-
-            item = QListWidgetItem(label)
-            item.setData(Qt.UserRole, template)
-            item.setForeground(Qt.darkGreen if tid in completed_ids else Qt.red)
-
-            next_due = get_next_due_date(sched)
-            tooltip = f"{s_type.capitalize()} — Next: {next_due.strftime('%Y-%m-%d')}"
-            item.setToolTip(tooltip)
-
-            self.list_widget.addItem(item)
+        if self.list_rows is None:
+            self.list_widget.addItem(QListWidgetItem("⏳ " + translate("loading")))
+        else:
+            for template, s_type, label, tooltip, completed in self.list_rows:
+                if self.active_filter != "All" and self.active_filter.lower() != s_type:
+                    continue
+                item = QListWidgetItem(label)
+                item.setData(Qt.UserRole, template)
+                item.setForeground(Qt.darkGreen if completed else Qt.red)
+                item.setToolTip(tooltip)
+                self.list_widget.addItem(item)
+        self.list_widget.setUpdatesEnabled(True)
 
     def open_selected_template(self):
         item = self.list_widget.currentItem()
@@ -176,15 +251,41 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "⚠", translate("no_selection"))
             return
 
-        template = item.data(Qt.UserRole)
+        self.open_template(item.data(Qt.UserRole))
+
+    def open_template(self, template):
+        if self.isMinimized():
+            self.showNormal()
+        self.activateWindow()
+
         tid = str(template["id"])
         last_data = load_autofill_data(tid)
 
-        dialog = TaskDialog(template["filename"], initial_data=last_data)
+        dialog = self.task_dialog(template["filename"], last_data)
         if dialog.exec():
             self.reload_template_list()
 
+    def task_dialog(self, template_filename, initial_data):
+        """A TaskDialog for the template, recycled while the field config is unchanged."""
+        from gui.task_dialog import TaskDialog
+
+        dialogs = self.task_dialogs
+        dialog = dialogs.pop(template_filename, None)
+        if dialog is not None and dialog.fields_version == fields_version():
+            dialog.reuse(initial_data)
+        else:
+            if dialog is not None:
+                dialog.deleteLater()
+            dialog = TaskDialog(template_filename, initial_data=initial_data)
+        dialogs[template_filename] = dialog
+        while len(dialogs) > TASK_DIALOG_CACHE:
+            _, old = dialogs.popitem(last=False)
+            old.deleteLater()
+        return dialog
+
     def export_due(self, mode):
+        from engine.threading import ExportWorker
+
         self.loading_overlay.label.setText(f"⏳ Exporting reports for: {mode}")
         self.loading_overlay.start()
 
@@ -228,7 +329,7 @@ class MainWindow(QMainWindow):
         dialog.resize(800, 450)
 
         table = QTableWidget()
-        history = get_all_completed_tasks()
+        history = get_all_completed_tasks(limit=HISTORY_LIMIT)
         table.setColumnCount(3)
         table.setRowCount(len(history))
         table.setHorizontalHeaderLabels(["Template ID", "Filename", "Completed At"])
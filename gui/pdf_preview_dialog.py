@@ -1,19 +1,127 @@
+import queue
+import itertools
+from collections import OrderedDict
+
 import fitz  # PyMuPDF
 from PySide6.QtWidgets import (
     QDialog, QLabel, QVBoxLayout, QScrollArea,
     QHBoxLayout, QPushButton, QWidget
 )
-from PySide6.QtGui import QPixmap, QImage, QCursor
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtCore import Qt, QObject, QThread, QTimer, Signal
+
+LOW_RES_ZOOM = 0.25
+PIXMAP_CACHE_BYTES = 192 * 1024 * 1024
+# Pages within this fraction of a viewport above/below the visible area are rendered ahead
+PREFETCH = 0.5
+
+
+class RenderedPage:
+    """A finished render; keeps the fitz.Pixmap alive for as long as the QImage points into it."""
+
+    __slots__ = ("page", "zoom", "generation", "image", "pixmap")
+
+    def __init__(self, page, zoom, generation, image, pixmap):
+        self.page = page
+        self.zoom = zoom
+        self.generation = generation
+        self.image = image
+        self.pixmap = pixmap
+
+
+def open_pdf(source):
+    """Opens a PDF given as a path or as bytes; bytes never touch the disk."""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    return fitz.open(source)
+
+
+class PageRenderWorker(QObject):
+    """Renders requested pages with its own fitz document, low-resolution requests first."""
+
+    rendered = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.generation = 0
+        self._jobs = queue.PriorityQueue()
+        self._seq = itertools.count()
+
+    def request(self, page: int, zoom: float, generation: int, low_res: bool = False):
+        self._jobs.put((0 if low_res else 1, next(self._seq), (page, zoom, generation)))
+
+    def stop(self):
+        self._jobs.put((-1, next(self._seq), None))
+
+    def run(self):
+        try:
+            doc = open_pdf(self.source)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        try:
+            while True:
+                _, _, job = self._jobs.get()
+                if job is None:
+                    break
+                page, zoom, generation = job
+                if generation != self.generation and zoom != LOW_RES_ZOOM:
+                    continue  # the zoom level changed since this was requested
+                pix = doc[page].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
+                image = QImage(pix.samples_mv, pix.width, pix.height, pix.stride, fmt)
+                self.rendered.emit(RenderedPage(page, zoom, generation, image, pix))
+        finally:
+            doc.close()
+
+
+class PixmapCache:
+    """LRU of QPixmaps keyed by (page, zoom), capped by pixel memory."""
+
+    def __init__(self, max_bytes: int = PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * 4
+
+    def get(self, key):
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap: QPixmap):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= self._cost(old)
+        self._items[key] = pixmap
+        self.size += self._cost(pixmap)
+        while self.size > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= self._cost(evicted)
+
+    def best_for_page(self, page: int):
+        """Any cached render of `page`, largest first, to stand in while the sharp one renders."""
+        candidates = [(zoom, pixmap) for (p, zoom), pixmap in self._items.items() if p == page]
+        return max(candidates, key=lambda c: c[0])[1] if candidates else None
 
 
 class PDFPreviewDialog(QDialog):
-    def __init__(self, pdf_path: str):
+    def __init__(self, source):
+        """`source` is a PDF path or the PDF content as bytes."""
         super().__init__()
         self.setWindowTitle("📄 PDF Preview")
         self.resize(1000, 800)
-        self.pdf_path = pdf_path
+        self.source = source
         self.zoom_level = 1.0
+        self.generation = 0
+        self.cache = PixmapCache()
+        self._requested = set()
 
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -22,7 +130,29 @@ class PDFPreviewDialog(QDialog):
         self.container_layout = QVBoxLayout(self.container_widget)
         self.scroll.setWidget(self.container_widget)
 
-        self.load_images()
+        self.page_sizes = self.read_page_sizes()
+        self.page_labels = []
+        for i in range(len(self.page_sizes)):
+            lbl = QLabel(f"Page {i + 1}")
+            lbl.setAlignment(Qt.AlignCenter)
+            lbl.setStyleSheet("background-color: white; color: #999;")
+            self.container_layout.addWidget(lbl, alignment=Qt.AlignHCenter)
+            self.page_labels.append(lbl)
+
+        self.render_thread = QThread()
+        self.render_worker = PageRenderWorker(source)
+        self.render_worker.moveToThread(self.render_thread)
+        self.render_thread.started.connect(self.render_worker.run)
+        self.render_worker.rendered.connect(self.on_page_rendered)
+        self.render_worker.failed.connect(lambda msg: print(f"[ERROR] PDF preview failed: {msg}"))
+        self.render_thread.start()
+
+        # Coalesces scroll and resize bursts into one visibility pass
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(30)
+        self.visible_timer.timeout.connect(self.request_visible_pages)
+        self.scroll.verticalScrollBar().valueChanged.connect(lambda _: self.visible_timer.start())
 
         zoom_in_btn = QPushButton("🔍 Zoom In")
         zoom_in_btn.clicked.connect(self.zoom_in)
@@ -42,37 +172,91 @@ class PDFPreviewDialog(QDialog):
         layout.addLayout(btn_layout)
         self.setLayout(layout)
 
+        self.load_images()
+
+    def read_page_sizes(self) -> list:
+        doc = open_pdf(self.source)
+        try:
+            return [(page.rect.width, page.rect.height) for page in doc]
+        finally:
+            doc.close()
+
     def load_images(self):
-        self.setCursor(QCursor(Qt.WaitCursor))
-        doc = fitz.open(self.pdf_path)
-
-        # Clear previous images
-        while self.container_layout.count():
-            child = self.container_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        for page in doc:
-            zoom_matrix = fitz.Matrix(self.zoom_level, self.zoom_level)
-            pix = page.get_pixmap(matrix=zoom_matrix)
-            fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
-            img = QImage(pix.samples, pix.width, pix.height, pix.stride, fmt)
-            lbl = QLabel()
-            lbl.setPixmap(QPixmap.fromImage(img))
-            lbl.setAlignment(Qt.AlignHCenter)
-            self.container_layout.addWidget(lbl)
-
-        doc.close()
-        self.unsetCursor()
+        """Lays the pages out at the current zoom and shows the best cached render of each."""
+        zoom = self.zoom_level
+        for i, lbl in enumerate(self.page_labels):
+            width, height = self.page_sizes[i]
+            lbl.setFixedSize(int(width * zoom), int(height * zoom))
+            self.show_cached(i)
+        self.visible_timer.start()
 
-    def zoom_in(self):
-        self.zoom_level += 0.2
+    def show_cached(self, page: int):
+        lbl = self.page_labels[page]
+        pixmap = self.cache.get((page, self.zoom_level))
+        if pixmap is None:
+            pixmap = self.cache.best_for_page(page)
+            if pixmap is not None:
+                pixmap = pixmap.scaled(lbl.size(), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+        if pixmap is not None:
+            lbl.setPixmap(pixmap)
+        else:
+            lbl.clear()
+            lbl.setText(f"Page {page + 1}")
+
+    def visible_pages(self) -> list:
+        viewport = self.scroll.viewport().height()
+        top = self.scroll.verticalScrollBar().value() - viewport * PREFETCH
+        bottom = self.scroll.verticalScrollBar().value() + viewport * (1 + PREFETCH)
+        return [i for i, lbl in enumerate(self.page_labels)
+                if lbl.y() < bottom and lbl.y() + lbl.height() > top]
+
+    def request_visible_pages(self):
+        for page in self.visible_pages():
+            key = (page, self.zoom_level)
+            if self.cache.get(key) is not None or key in self._requested:
+                continue
+            if self.cache.best_for_page(page) is None and (page, LOW_RES_ZOOM) not in self._requested:
+                self._requested.add((page, LOW_RES_ZOOM))
+                self.render_worker.request(page, LOW_RES_ZOOM, self.generation, low_res=True)
+            self._requested.add(key)
+            self.render_worker.request(page, self.zoom_level, self.generation)
+
+    def on_page_rendered(self, result: RenderedPage):
+        key = (result.page, result.zoom)
+        self._requested.discard(key)
+        self.cache.put(key, QPixmap.fromImage(result.image))
+        if result.zoom == self.zoom_level or self.cache.get((result.page, self.zoom_level)) is None:
+            self.show_cached(result.page)
+
+    def set_zoom(self, zoom: float):
+        bar = self.scroll.verticalScrollBar()
+        position = bar.value() / max(1, bar.maximum())
+        self.zoom_level = round(zoom, 2)
+        self.generation += 1
+        self.render_worker.generation = self.generation
+        self._requested = {key for key in self._requested if key[1] == LOW_RES_ZOOM}
         self.load_images()
+        QTimer.singleShot(0, lambda: bar.setValue(int(position * bar.maximum())))
+
+    def zoom_in(self):
+        self.set_zoom(self.zoom_level + 0.2)
 
     def zoom_out(self):
-        self.zoom_level = max(0.2, self.zoom_level - 0.2)
-        self.load_images()
+        self.set_zoom(max(0.2, self.zoom_level - 0.2))
 
     def reset_zoom(self):
-        self.zoom_level = 1.0
-        self.load_images()
+        self.set_zoom(1.0)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visible_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visible_timer.start()
+
+    def done(self, result):
+        self.render_worker.stop()
+        self.render_thread.quit()
+        self.render_thread.wait(5000)
+        super().done(result)
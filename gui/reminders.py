@@ -0,0 +1,47 @@
+"""
+Reminder notifications for the dashboard. engine.scheduler reports due templates through the
+callback given to start_schedule; ReminderNotifier merges the ones that fire within
+COALESCE_MS of each other into one non-modal notification, from which a template can be
+opened directly.
+"""
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from widgets.reminder_notification import ReminderNotification
+
+COALESCE_MS = 2000
+
+
+class ReminderNotifier(QObject):
+    """Collects due templates for COALESCE_MS, then shows or extends one notification."""
+
+    open_requested = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = []
+        self._popup = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+    def notify(self, templates: list):
+        self._pending.extend(templates)
+        if not self._timer.isActive():
+            self._timer.start(COALESCE_MS)
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        if self._popup is None:
+            self._popup = ReminderNotification()
+            self._popup.open_requested.connect(self._on_open_requested)
+        self._popup.add_reminders(pending)
+
+    def _on_open_requested(self, template):
+        # Deferred so the notification's click handler returns before a dialog runs
+        QTimer.singleShot(0, lambda: self.open_requested.emit(template))
+
+    def dismiss(self):
+        self._timer.stop()
+        self._pending = []
+        if self._popup is not None:
+            self._popup.dismiss()
@@ -1,23 +1,41 @@
-import os, yaml
+import os
+import html
 from PySide6.QtWidgets import (
     QDialog, QFormLayout, QLineEdit, QPushButton, QVBoxLayout,
-    QComboBox, QDateEdit, QHBoxLayout, QMessageBox, QScrollArea, QWidget
+    QComboBox, QDateEdit, QHBoxLayout, QMessageBox, QScrollArea, QWidget,
+    QSplitter, QTextBrowser
 )
 from PySide6.QtCore import QDate, Qt, QThread, QTimer
 from PySide6.QtGui import QFont, QPalette, QColor
 
 from engine.autofill import load_autofill_data, clear_autofill_data, save_autofill_data
+from engine.field_config import field_specs, fields_version
 from widgets.table_input import TableInput
+from widgets.multi_week_input import MultiWeekInput, normalize_weeks
+from widgets.lazy_section import LazySection
 from engine.i18n import translate
-from gui.pdf_preview_dialog import PDFPreviewDialog
 from widgets.loading_overlay import LoadingOverlay
-from engine.threading import ReportGenerationWorker, ReportPreviewWorker
+
+LIVE_PREVIEW_DEBOUNCE_MS = 80
+DATE_FORMATS = ("yyyy/MM/dd", "dd/MM/yyyy")
+
+
+def parse_date(value):
+    """QDate from a stored value, or None."""
+    if not isinstance(value, str):
+        return None
+    for fmt in DATE_FORMATS:
+        date_obj = QDate.fromString(value, fmt)
+        if date_obj.isValid():
+            return date_obj
+    return None
+
 
 class TaskDialog(QDialog):
     def __init__(self, template_filename=None, initial_data=None):
         super().__init__()
         self.template_filename = template_filename
-        self.template_id = initial_data.get("num2") if initial_data else None
+        self.template_id = None
         self.fields = {}
 
         self.setWindowTitle("📝 " + translate("fill_report"))
@@ -33,68 +51,53 @@ class TaskDialog(QDialog):
         self.loading_overlay.setVisible(False)
         self.loading_overlay.cancel_requested.connect(self.cancel_current_operation)
 
-        self.config = self.load_field_config(template_filename)
-        self.build_form(self.config, initial_data)
-
-    def load_field_config(self, template_filename):
-        with open("config/template_fields.yaml", "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-            return data.get(template_filename, [])
-
-    def build_form(self, config, initial_data):
+        self.live_preview = None
+        self._live_html = ""
+        self._dirty = set()
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_PREVIEW_DEBOUNCE_MS)
+        self.live_timer.timeout.connect(self.refresh_live_preview)
+
+        self.config = field_specs(template_filename)
+        self.fields_version = fields_version()
+        self.build_form(self.config)
+        self.load_data(initial_data)
+        self.init_live_preview()
+
+    def build_form(self, config):
         form_layout = QFormLayout()
         form_layout.setSpacing(20)
         form_layout.setLabelAlignment(Qt.AlignRight | Qt.AlignVCenter)
         font = QFont("Segoe UI", 11)
 
         for field in config:
-            name = field["name"]
-            field_type = field["type"]
             widget = None
 
-            if field_type == "text":
+            if field.type == "text":
                 widget = QLineEdit()
                 widget.setFont(font)
                 widget.setMinimumHeight(32)
-                if initial_data and name in initial_data:
-                    widget.setText(initial_data[name])
-            elif field_type == "combo":
+            elif field.type == "combo":
                 widget = QComboBox()
                 widget.setFont(font)
                 widget.setMinimumHeight(32)
                 pal = widget.palette()
                 pal.setColor(QPalette.Base, QColor("white"))
                 widget.setPalette(pal)
-                widget.addItems(field.get("options", []))
-                if initial_data and name in initial_data:
-                    idx = widget.findText(initial_data[name])
-                    if idx >= 0:
-                        widget.setCurrentIndex(idx)
-            elif field_type == "date":
+                widget.addItems(list(field.options))
+            elif field.type == "date":
                 widget = QDateEdit()
                 widget.setFont(font)
                 widget.setMinimumHeight(32)
                 widget.setCalendarPopup(True)
-                widget.setDate(QDate.currentDate())
-                if initial_data and name in initial_data:
-                    for fmt in ["yyyy/MM/dd", "dd/MM/yyyy"]:
-                        date_obj = QDate.fromString(initial_data[name], fmt)
-                        if date_obj.isValid():
-                            widget.setDate(date_obj)
-                            break
-            elif field_type == "table":
-                widget = TableInput(field.get("columns", []))
-                if initial_data and name in initial_data:
-                    widget.set_data(initial_data[name])
-            elif field_type == "multiweek":
-                from widgets.multi_week_input import MultiWeekInput
-                widget = MultiWeekInput()
-                if initial_data and name in initial_data:
-                    widget.set_data(initial_data[name])
+            elif field.heavy:
+                widget = self.lazy_section(field)
 
             if widget:
-                self.fields[name] = widget
-                label = translate(name.replace("_", " ").capitalize())
+                self.fields[field.name] = widget
+                self.watch_field(field.name, widget)
+                label = translate(field.name.replace("_", " ").capitalize())
                 form_layout.addRow(label, widget)
 
         # Buttons
@@ -102,8 +105,12 @@ class TaskDialog(QDialog):
         self.clear_button = QPushButton("🗑️ " + translate("clear_last_values"))
         self.submit_button = QPushButton("✅ " + translate("generate_report"))
         self.preview_button = QPushButton("👁 Preview")
+        self.live_button = QPushButton("📰 Live")
+        self.live_button.setCheckable(True)
+        self.live_button.setChecked(True)
+        self.live_button.toggled.connect(self.toggle_live_preview)
 
-        for btn in [self.autofill_button, self.clear_button, self.submit_button, self.preview_button]:
+        for btn in [self.autofill_button, self.clear_button, self.submit_button, self.preview_button, self.live_button]:
             btn.setFont(font)
             btn.setMinimumHeight(36)
 
@@ -118,6 +125,7 @@ class TaskDialog(QDialog):
         button_layout.addWidget(self.clear_button)
         button_layout.addWidget(self.submit_button)
         button_layout.addWidget(self.preview_button)
+        button_layout.addWidget(self.live_button)
 
         scroll_widget = QWidget()
         scroll_widget.setLayout(form_layout)
@@ -125,24 +133,77 @@ class TaskDialog(QDialog):
         scroll_area.setWidgetResizable(True)
         scroll_area.setWidget(scroll_widget)
 
+        self.preview_browser = QTextBrowser()
+        self.preview_browser.setMinimumWidth(300)
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(scroll_area)
+        splitter.addWidget(self.preview_browser)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(20, 20, 20, 20)
         main_layout.setSpacing(20)
-        main_layout.addWidget(scroll_area)
+        main_layout.addWidget(splitter)
         main_layout.addLayout(button_layout)
         self.setLayout(main_layout)
 
-    def get_data(self):
-        data = {}
-        for key, widget in self.fields.items():
+    def lazy_section(self, field):
+        """Heavy inputs (FieldSpec.heavy) are built when the user first opens them."""
+        if field.type == "table":
+            columns = [col.as_dict() for col in field.columns]
+            return LazySection(
+                lambda: TableInput(columns),
+                lambda value: value if isinstance(value, list) else [],
+                lambda rows: f"📋 {len(rows)} row(s)",
+            )
+        return LazySection(
+            MultiWeekInput,
+            normalize_weeks,
+            lambda weeks: f"📅 {sum(1 for week in weeks if any(week.values()))} week(s) filled",
+        )
+
+    def load_data(self, initial_data):
+        """Puts `initial_data` into the form; fields it does not mention get their defaults."""
+        initial_data = initial_data or {}
+        self.template_id = initial_data.get("num2")
+        for name, widget in self.fields.items():
+            value = initial_data.get(name)
             if isinstance(widget, QLineEdit):
-                data[key] = widget.text()
+                widget.setText("" if value is None else str(value))
             elif isinstance(widget, QComboBox):
-                data[key] = widget.currentText()
+                idx = widget.findText(value) if isinstance(value, str) else -1
+                widget.setCurrentIndex(max(idx, 0))
             elif isinstance(widget, QDateEdit):
-                data[key] = widget.date().toString("dd/MM/yyyy")
-            elif hasattr(widget, 'get_data'):
-                data[key] = widget.get_data()
+                widget.setDate(parse_date(value) or QDate.currentDate())
+            elif isinstance(widget, LazySection):
+                widget.set_data(value)
+
+    def reuse(self, initial_data):
+        """Resets a recycled dialog for another opening of the same template."""
+        self._cancelled = False
+        self.loading_overlay.stop()
+        self.load_data(initial_data)
+        self._dirty = set(self.fields)
+        self.live_timer.start()
+
+    def field_value(self, widget):
+        if isinstance(widget, QLineEdit):
+            return widget.text()
+        elif isinstance(widget, QComboBox):
+            return widget.currentText()
+        elif isinstance(widget, QDateEdit):
+            return widget.date().toString("dd/MM/yyyy")
+        elif hasattr(widget, 'get_data'):
+            return widget.get_data()
+        return None
+
+    def get_data(self):
+        data = {}
+        for key, widget in self.fields.items():
+            value = self.field_value(widget)
+            if value is not None:
+                data[key] = value
 
         if "number" in data and data["number"].isdigit() and not data.get("num2"):
             data["num2"] = str(int(data["number"]) + 1)
@@ -153,6 +214,63 @@ class TaskDialog(QDialog):
 
         return data
 
+    def watch_field(self, name, widget):
+        if isinstance(widget, QLineEdit):
+            signal = widget.textChanged
+        elif isinstance(widget, QComboBox):
+            signal = widget.currentTextChanged
+        elif isinstance(widget, QDateEdit):
+            signal = widget.dateChanged
+        else:
+            signal = getattr(widget, "changed", None)
+        if signal is not None:
+            signal.connect(lambda *_, n=name: self.schedule_live_preview(n))
+
+    def init_live_preview(self):
+        from engine.live_preview import LivePreview
+
+        try:
+            self.live_preview = LivePreview(self.template_filename)
+        except Exception as e:
+            print(f"[ERROR] Live preview unavailable for {self.template_filename}: {e}")
+            self.live_button.setChecked(False)
+            self.live_button.setEnabled(False)
+            return
+        self._dirty = set(self.fields)
+        self.live_timer.start()
+
+    def schedule_live_preview(self, name):
+        self._dirty.add(name)
+        self.live_timer.start()
+
+    def toggle_live_preview(self, checked):
+        self.preview_browser.setVisible(checked)
+        if checked:
+            self.live_timer.start()
+
+    def refresh_live_preview(self):
+        # Edits made while the pane is hidden stay dirty until it is shown again
+        if self.live_preview is None or not self.live_button.isChecked() or not self._dirty:
+            return
+        changes = {}
+        for name in self._dirty:
+            value = self.field_value(self.fields[name])
+            if value is not None:
+                changes[name] = value
+        self._dirty.clear()
+
+        try:
+            self._live_html = self.live_preview.update(changes)
+            content = self._live_html
+        except Exception as e:
+            print(f"[ERROR] Live preview failed for {self.template_filename}: {e}")
+            content = self._live_html + f'<p style="color:#c0392b;">❌ Live preview failed: {html.escape(str(e))}</p>'
+
+        bar = self.preview_browser.verticalScrollBar()
+        position = bar.value()
+        self.preview_browser.setHtml(content)
+        bar.setValue(position)
+
     def apply_autofill(self):
         tid = self.fields.get("num2").text() if "num2" in self.fields else self.template_id
         if not tid:
@@ -170,11 +288,9 @@ class TaskDialog(QDialog):
                 if idx >= 0:
                     widget.setCurrentIndex(idx)
             elif isinstance(widget, QDateEdit):
-                for fmt in ["yyyy/MM/dd", "dd/MM/yyyy"]:
-                    date_obj = QDate.fromString(value, fmt)
-                    if date_obj.isValid():
-                        widget.setDate(date_obj)
-                        break
+                date_obj = parse_date(value)
+                if date_obj is not None:
+                    widget.setDate(date_obj)
 
     def clear_autofill(self):
         tid = self.fields.get("num2").text() if "num2" in self.fields else self.template_id
@@ -192,6 +308,8 @@ class TaskDialog(QDialog):
         QTimer.singleShot(1000, self.loading_overlay.stop)
 
     def generate_report_threaded(self):
+        from engine.threading import ReportGenerationWorker
+
         self._cancelled = False
         data = self.get_data()
         if not data.get("num2"):
@@ -216,6 +334,8 @@ class TaskDialog(QDialog):
         self.thread.start()
 
     def preview_report_threaded(self):
+        from engine.threading import ReportPreviewWorker
+
         self._cancelled = False
         data = self.get_data()
         if not data.get("num2"):
@@ -266,16 +386,14 @@ class TaskDialog(QDialog):
         template_id = self.template_id or self.get_data().get("num2")
         save_autofill_data(template_id, self.get_data())
 
-    def on_preview_ready(self, pdf_path):
+    def on_preview_ready(self, pdf_bytes):
+        from gui.pdf_preview_dialog import PDFPreviewDialog
+
         self.loading_overlay.stop()
         if self._cancelled:
             return
-        dialog = PDFPreviewDialog(pdf_path)
+        dialog = PDFPreviewDialog(pdf_bytes)
         dialog.exec()
-        try:
-            QTimer.singleShot(3000, lambda: os.remove(pdf_path))
-        except Exception:
-            pass
 
     def on_report_failed(self, error_msg):
         self.loading_overlay.stop()
@@ -1,28 +1,10 @@
 import os
 import sys
+import time
 
-import app
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QApplication
-from gui.main_window import MainWindow
+STARTED = time.perf_counter()
 
-def main():
-    app = QApplication(sys.argv)
-
-    # ✅ Set app-wide icon
-    icon_path = os.path.join("assets", "logo.png")
-    if os.path.exists(icon_path):
-        app.setWindowIcon(QIcon(icon_path))
-
-    window = MainWindow()
-    window.show()  # <- This is essential!
-    sys.exit(app.exec())  # <- Keeps the app running
-
-if __name__ == "__main__":
-    main()
-
-
-app.setStyleSheet("""
+STYLE_SHEET = """
     QMainWindow {
         background-color: #f9f9f9;
     }
@@ -39,4 +21,67 @@ app.setStyleSheet("""
         border: 1px solid #ccc;
         border-radius: 4px;
     }
-""")
+"""
+
+# Set to quit as soon as the first window is shown (used by --profile-imports and the startup benchmark)
+EXIT_AFTER_SHOW_ENV = "DWPT_EXIT_AFTER_SHOW"
+PROFILE_TOP = 25
+
+
+def profile_imports() -> int:
+    """Runs the startup under `python -X importtime` and prints the slowest imports."""
+    import subprocess
+
+    env = dict(os.environ, **{EXIT_AFTER_SHOW_ENV: "1"})
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__)],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # column header
+        rows.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+
+    print(proc.stdout, end="")
+    total_us = sum(self_us for self_us, _, _ in rows)
+    print(f"{len(rows)} modules imported in {total_us / 1000:.0f} ms (sum of self times)")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:PROFILE_TOP]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {name}")
+    return proc.returncode
+
+
+def main():
+    if "--profile-imports" in sys.argv:
+        sys.exit(profile_imports())
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    app.setStyleSheet(STYLE_SHEET)
+
+    # ✅ Set app-wide icon
+    icon_path = os.path.join("assets", "logo.png")
+    if os.path.exists(icon_path):
+        app.setWindowIcon(QIcon(icon_path))
+
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    window.show()  # <- This is essential!
+    print(f"[DEBUG] First window after {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+
+    if os.environ.get(EXIT_AFTER_SHOW_ENV):
+        QTimer.singleShot(0, app.quit)
+    sys.exit(app.exec())  # <- Keeps the app running
+
+
+if __name__ == "__main__":
+    main()
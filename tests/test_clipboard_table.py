@@ -0,0 +1,67 @@
+import pytest
+
+from widgets.clipboard_table import convert_block, parse_tsv
+
+
+@pytest.mark.parametrize("text, rows", [
+    ("a\tb\nc\td", [["a", "b"], ["c", "d"]]),
+    ("a\tb\r\nc\td\r\n", [["a", "b"], ["c", "d"]]),
+    ("a\tb\n\n\n", [["a", "b"]]),
+    ("a\t\n\tb\n", [["a", ""], ["", "b"]]),
+    ("", []),
+])
+def test_parse_plain(text, rows):
+    assert parse_tsv(text) == rows
+
+
+def test_parse_quoted_cells_with_tabs_newlines_and_quotes():
+    text = 'x\t"multi\nline"\t"tab\there"\r\n"say ""hi"""\tz\r\n'
+    assert parse_tsv(text) == [["x", "multi\nline", "tab\there"], ['say "hi"', "z"]]
+
+
+def test_parse_quoted_cell_at_end_of_text_and_trailing_empty_line():
+    assert parse_tsv('a\t"b\nc"\n\n') == [["a", "b\nc"]]
+    assert parse_tsv('"only"') == [["only"]]
+
+
+@pytest.mark.parametrize("text, rows", [
+    ('"5" inch\tb', [['"5" inch', "b"]]),
+    ('"abc\tdef\nx', [['"abc', "def"], ["x"]]),
+])
+def test_parse_stray_quotes_are_kept_verbatim(text, rows):
+    assert parse_tsv(text) == rows
+
+
+COLUMNS = [
+    {"name": "date", "type": "date"},
+    {"name": "count", "type": "number"},
+    {"name": "done", "type": "combo", "options": ["Oui", "Non"]},
+    {"name": "notes"},
+]
+
+
+def test_convert_block_by_column_type():
+    rows = [
+        ["2024-05-15", "1 234", " oui ", "free text"],
+        ["15.05.2024", "12,5", "maybe", ""],
+        ["15/05/2024 08:30:00", "1,234", "NON"],
+        ["not a date"],
+    ]
+
+    cells, rejected = convert_block(COLUMNS, rows)
+
+    assert cells == [
+        ["15/05/2024", "1234", "Oui", "free text"],
+        ["15/05/2024", None, None, ""],
+        ["15/05/2024", "1234", "Non", None],
+        [None, None, None, None],
+    ]
+    # 12,5 is not a whole number, maybe is not an option, not a date is not a date;
+    # cells past the end of a short row are not counted
+    assert rejected == 3
+
+
+def test_convert_block_numbers():
+    cells, rejected = convert_block([{"type": "number"}], [["42"], ["3,0"], ["7.0"], ["  "], ["abc"]])
+    assert cells == [["42"], ["3"], ["7"], [""], [None]]
+    assert rejected == 1
@@ -0,0 +1,17 @@
+from engine.live_preview import LivePreview
+
+# What MultiWeekInput.get_data() returns for an empty form
+EMPTY_WEEKS = [{"visits": "", "incidents": "", "repairs": ""} for _ in range(4)]
+
+
+def test_multiweek_update_renders_despite_summary_error():
+    preview = LivePreview("default12.docx")
+    html = preview.update({"weeks": EMPTY_WEEKS})
+    assert html
+    assert preview.last_error
+
+
+def test_multiweek_keeps_rendering_later_edits():
+    preview = LivePreview("default12.docx")
+    preview.update({"weeks": EMPTY_WEEKS})
+    assert preview.update({"number": "7"})
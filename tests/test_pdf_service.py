@@ -0,0 +1,46 @@
+import pytest
+
+from engine.pdf_service import FakeBackend, PdfConversionService, get_pdf_service, set_pdf_service
+
+
+@pytest.fixture
+def scratch(tmp_path, monkeypatch):
+    monkeypatch.setenv("DWPT_SCRATCH", str(tmp_path))
+    return tmp_path
+
+
+def fake_service(crash_after):
+    return PdfConversionService(lambda: FakeBackend(crash_after=crash_after), workers=1, name="fake")
+
+
+def test_crashed_backend_is_restarted_and_the_job_retried(scratch):
+    # Every backend converts one document, then dies on the next
+    service = fake_service(crash_after=1)
+    set_pdf_service(service)
+    try:
+        assert get_pdf_service() is service
+        first = get_pdf_service().convert_bytes(b"docx 1", timeout=10)
+        second = get_pdf_service().convert_bytes(b"docx 2", timeout=10)
+    finally:
+        set_pdf_service(None)
+
+    assert first.startswith(b"%PDF") and second == first
+    metrics = service.metrics()
+    assert {key: metrics[key] for key in ("converted", "failed", "restarts", "backend", "workers", "queued")} == {
+        "converted": 2, "failed": 0, "restarts": 1, "backend": "fake", "workers": 1, "queued": 0,
+    }
+    assert metrics["p50_ms"] <= metrics["max_ms"]
+    assert list(scratch.iterdir()) == []
+
+
+def test_job_fails_when_the_restarted_backend_dies_again(scratch):
+    service = fake_service(crash_after=0)
+    try:
+        with pytest.raises(RuntimeError, match="fake backend crashed"):
+            service.convert_bytes(b"docx", timeout=10)
+    finally:
+        service.shutdown()
+
+    metrics = service.metrics()
+    assert (metrics["converted"], metrics["failed"], metrics["restarts"]) == (0, 1, 2)
+    assert "p50_ms" not in metrics
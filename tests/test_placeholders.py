@@ -0,0 +1,54 @@
+from docx import Document
+
+from engine.placeholders import SubstitutionReport, paragraph_text, substitute_paragraph
+
+
+def make_paragraph(*runs):
+    paragraph = Document().add_paragraph()
+    for text in runs:
+        paragraph.add_run(text)
+    return paragraph
+
+
+def run_texts(paragraph) -> list:
+    return [run.text for run in paragraph.runs]
+
+
+def test_placeholder_split_across_runs():
+    paragraph = make_paragraph("Dear {{na", "me}}, ", "report {{", "number", "}}.")
+    report = SubstitutionReport(["name", "number"])
+
+    filled = substitute_paragraph(paragraph._p, {"name": "Bob", "number": "7"}, report)
+
+    assert filled == 2
+    assert paragraph_text(paragraph._p) == "Dear Bob, report 7."
+    # Each value lands in the run where its placeholder starts
+    assert run_texts(paragraph) == ["Dear Bob", ", ", "report 7", "", "."]
+    assert report.as_dict() == {"used": ["name", "number"], "missing": [], "unused": []}
+
+
+def test_placeholder_inside_extra_braces():
+    paragraph = make_paragraph("{{{a}}}")
+    report = SubstitutionReport(["a"])
+
+    assert substitute_paragraph(paragraph._p, {"a": "X"}, report) == 1
+    assert paragraph_text(paragraph._p) == "{X}"
+    assert report.as_dict() == {"used": ["a"], "missing": [], "unused": []}
+
+
+def test_missing_key_is_left_and_reported():
+    paragraph = make_paragraph("{{ date }} - {{missing}} - ", "{{date}}")
+    report = SubstitutionReport(["date", "extra"])
+
+    assert substitute_paragraph(paragraph._p, {"date": "2026-10-17", "extra": "x"}, report) == 2
+    assert paragraph_text(paragraph._p) == "2026-10-17 - {{missing}} - 2026-10-17"
+    assert report.as_dict() == {"used": ["date"], "missing": ["missing"], "unused": ["extra"]}
+
+
+def test_paragraph_without_placeholders_is_untouched():
+    paragraph = make_paragraph("plain ", "text {", "not one}")
+    report = SubstitutionReport(["a"])
+
+    assert substitute_paragraph(paragraph._p, {"a": "X"}, report) == 0
+    assert run_texts(paragraph) == ["plain ", "text {", "not one}"]
+    assert report.as_dict() == {"used": [], "missing": [], "unused": ["a"]}
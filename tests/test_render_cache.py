@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import engine.render_cache as render_cache
+from engine.pdf_service import FakeBackend, PdfConversionService, set_pdf_service
+from engine.render_cache import (
+    clear_render_cache, materialize_report, render_cache_stats, render_key, render_pdf,
+)
+
+TEMPLATE = "default2.docx"
+DATA = {"number": "42", "date": "17/10/2026"}
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # Reports are written to data/ of the working directory
+    for name in ("config", "templates"):
+        (tmp_path / name).symlink_to(os.path.abspath(name))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DWPT_SCRATCH", str(tmp_path))
+    monkeypatch.setattr(render_cache, "RENDER_CACHE_DIR", str(tmp_path / "render_cache"))
+    monkeypatch.setattr(render_cache, "_index", None)
+    set_pdf_service(PdfConversionService(FakeBackend, workers=1, name="fake"))
+    clear_render_cache()
+    yield tmp_path / "render_cache"
+    clear_render_cache()
+    set_pdf_service(None)
+
+
+def counts() -> tuple:
+    stats = render_cache_stats()
+    return stats["hits"], stats["misses"], stats["entries"], stats["memory_entries"]
+
+
+def test_preview_stays_in_memory_until_generated(cache_dir):
+    pdf = render_pdf(dict(DATA), TEMPLATE, persist=False)
+
+    assert pdf.startswith(b"%PDF")
+    assert os.listdir(cache_dir) == []
+    # The docx rendered for the PDF is part of the same miss
+    assert counts() == (0, 1, 0, 2)
+    assert render_pdf(dict(DATA), TEMPLATE, persist=False) == pdf
+    assert counts() == (1, 1, 0, 2)
+
+    progress = []
+    docx_path, pdf_path = materialize_report(dict(DATA), TEMPLATE, progress=progress.append)
+
+    assert progress == [50]
+    assert os.path.exists(docx_path) and os.path.exists(pdf_path)
+    key = render_key(DATA, TEMPLATE)
+    assert sorted(os.listdir(cache_dir)) == [f"{key}.docx", f"{key}.fake.pdf"]
+    assert counts() == (3, 1, 2, 0)
+
+
+def test_generate_then_preview_reads_from_disk(cache_dir):
+    materialize_report(dict(DATA), TEMPLATE)
+    assert counts() == (0, 2, 2, 0)
+
+    render_pdf(dict(DATA), TEMPLATE, persist=False)
+    assert counts() == (1, 2, 2, 0)
+
+    render_pdf(dict(DATA, number="43"), TEMPLATE, persist=False)
+    assert counts() == (1, 3, 2, 2)
+
+
+def test_clear_render_cache(cache_dir):
+    materialize_report(dict(DATA), TEMPLATE)
+    render_pdf(dict(DATA, number="43"), TEMPLATE, persist=False)
+
+    clear_render_cache()
+
+    assert os.listdir(cache_dir) == []
+    assert counts() == (0, 0, 0, 0)
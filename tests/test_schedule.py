@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+
+import pytest
+
+from engine.schedule import ScheduleEngine, compile_schedule
+
+SCHEDULES = [
+    {"type": "daily"},
+    {"type": "weekly", "days": [0, 4]},
+    {"type": "weekly", "days": [6]},
+    {"type": "monthly"},
+    {"type": "monthly", "days": [15, 31]},
+    {"type": "monthly", "days": [29]},
+    {"type": "yearly", "days": [29], "months": [2]},
+    {"type": "yearly", "days": [1, 31], "months": [3, 12]},
+    {"type": "semi_annual", "days": [1]},
+    {"type": "unknown"},
+]
+
+# Covers a leap year (2024), a common year and two year boundaries
+START, END = date(2023, 11, 1), date(2025, 3, 31)
+
+
+def brute_is_due(schedule: dict, day: date) -> bool:
+    s_type = schedule["type"]
+    days = schedule.get("days") or []
+    if s_type == "daily":
+        return True
+    if s_type == "weekly":
+        return day.weekday() in days
+    if s_type == "monthly":
+        return day.day in (days or [1])
+    if s_type == "yearly":
+        return day.day in days and day.month in schedule["months"]
+    if s_type == "semi_annual":
+        return day.day in days and day.month in (1, 7)
+    return False
+
+
+def brute_next_due(schedule: dict, after: date):
+    day = after + timedelta(days=1)
+    while day.year <= after.year + 9:
+        if brute_is_due(schedule, day):
+            return day
+        day += timedelta(days=1)
+    return None
+
+
+def days_between(start: date, end: date):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+@pytest.mark.parametrize("block", SCHEDULES, ids=lambda b: f"{b['type']}{b.get('days', '')}{b.get('months', '')}")
+def test_bitsets_match_day_by_day(block):
+    schedule = compile_schedule(block)
+    for day in days_between(START, END):
+        assert schedule.is_due(day) == brute_is_due(block, day), day
+        assert schedule.next_due(day) == brute_next_due(block, day), day
+
+
+@pytest.mark.parametrize("block", SCHEDULES, ids=lambda b: f"{b['type']}{b.get('days', '')}{b.get('months', '')}")
+def test_due_between_matches_day_by_day(block):
+    schedule = compile_schedule(block)
+    for start, end in [(date(2023, 12, 25), date(2024, 1, 7)), (date(2024, 2, 26), date(2024, 3, 3)),
+                       (date(2025, 2, 26), date(2025, 3, 3)), (date(2024, 6, 2), date(2024, 6, 2)),
+                       (date(2024, 4, 30), date(2024, 4, 29))]:
+        expected = any(brute_is_due(block, day) for day in days_between(start, end))
+        assert schedule.due_between(start, end) == expected, (start, end)
+
+
+def test_next_due_rollover():
+    assert compile_schedule({"type": "weekly", "days": [0]}).next_due(date(2023, 12, 31)) == date(2024, 1, 1)
+    assert compile_schedule({"type": "monthly", "days": [31]}).next_due(date(2024, 1, 31)) == date(2024, 3, 31)
+    assert compile_schedule({"type": "monthly", "days": [31]}).next_due(date(2025, 12, 31)) == date(2026, 1, 31)
+    feb29 = compile_schedule({"type": "yearly", "days": [29], "months": [2]})
+    assert feb29.next_due(date(2024, 2, 28)) == date(2024, 2, 29)
+    assert feb29.next_due(date(2024, 2, 29)) == date(2028, 2, 29)
+    # 2100 is not a leap year
+    assert feb29.next_due(date(2097, 1, 1)) == date(2104, 2, 29)
+    assert compile_schedule({"type": "yearly", "days": [30], "months": [2]}).next_due(date(2024, 1, 1)) is None
+
+
+def test_engine_keeps_configuration_order_and_filters_types():
+    templates = [
+        {"id": 1, "schedule": {"type": "monthly", "days": [15]}},
+        {"id": 2, "schedule": "daily"},
+        {"id": 3, "schedule": {"type": "monthly", "days": [15]}},
+        {"id": 4, "schedule": {"type": "weekly", "days": [2]}},
+    ]
+    engine = ScheduleEngine(templates)
+
+    assert [t["id"] for t in engine.due_on(date(2024, 5, 15))] == [1, 2, 3, 4]
+    assert [t["id"] for t in engine.due_on(date(2024, 5, 16))] == [2]
+    assert [t["id"] for t in engine.for_mode("This Week", date(2024, 5, 16))] == [1, 2, 3, 4]
+    assert [t["id"] for t in engine.for_mode("Monthly", date(2024, 5, 2))] == [1, 3]
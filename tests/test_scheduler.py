@@ -0,0 +1,75 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from engine.scheduler import ReminderQueue, parse_reminder_time  # noqa: E402
+
+NOW = datetime(2024, 5, 15, 7, 0)  # a Wednesday
+
+TEMPLATES = [
+    {"id": 1, "title": "nine", "schedule": "daily", "reminder_time": "09:00"},
+    {"id": 2, "title": "eight", "schedule": "daily", "reminder_time": "08:00"},
+    {"id": 3, "title": "half past eight", "schedule": "daily", "reminder_time": "08:30"},
+    {"id": 4, "title": "eight too", "schedule": "daily", "reminder_time": 480},
+    {"id": 5, "title": "friday", "schedule": {"type": "weekly", "days": [4]}, "reminder_time": "08:00"},
+    {"id": 6, "title": "no reminder", "schedule": "daily"},
+]
+
+
+def ids(templates) -> list:
+    return [t["id"] for t in templates]
+
+
+def test_parse_reminder_time():
+    assert parse_reminder_time("08:05") == time(8, 5)
+    assert parse_reminder_time(480) == time(8, 0)
+    assert parse_reminder_time("") is None
+    assert parse_reminder_time("soon") is None
+
+
+def test_pops_in_time_order_and_requeues():
+    queue = ReminderQueue()
+    queue.rebuild(TEMPLATES, NOW)
+
+    assert len(queue) == 5
+    assert queue.next_at() == datetime(2024, 5, 15, 8, 0)
+    assert queue.pop_due(NOW) == []
+    # Equal times keep configuration order
+    assert ids(queue.pop_due(datetime(2024, 5, 15, 8, 0))) == [2, 4]
+    assert ids(queue.pop_due(datetime(2024, 5, 15, 9, 0))) == [3, 1]
+    assert len(queue) == 5
+    assert queue.next_at() == datetime(2024, 5, 16, 8, 0)
+
+
+def test_wake_after_a_missed_day_still_fires_todays_reminders():
+    queue = ReminderQueue(grace=timedelta(hours=1))
+    queue.rebuild(TEMPLATES, NOW)
+
+    # Suspended from before the first reminder of the 15th until just after 08:00 on the 17th
+    assert sorted(ids(queue.pop_due(datetime(2024, 5, 17, 8, 0, 30)))) == [2, 4, 5]
+    assert queue.next_at() == datetime(2024, 5, 17, 8, 30)
+
+
+def test_missed_reminders_are_skipped_but_requeued():
+    queue = ReminderQueue(grace=timedelta(hours=1))
+    queue.rebuild(TEMPLATES, NOW)
+
+    assert ids(queue.pop_due(datetime(2024, 5, 15, 9, 45))) == [1]
+    assert len(queue) == 5
+    assert queue.next_at() == datetime(2024, 5, 16, 8, 0)
+
+
+def test_rebuild_cancels_reminders():
+    queue = ReminderQueue()
+    queue.rebuild(TEMPLATES, NOW)
+
+    queue.rebuild([t for t in TEMPLATES if t["id"] != 2], NOW)
+    assert ids(queue.pop_due(datetime(2024, 5, 15, 8, 0))) == [4]
+
+    # What ReminderScheduler.stop() does
+    queue.rebuild([], NOW)
+    assert len(queue) == 0
+    assert queue.next_at() is None
+    assert queue.pop_due(datetime(2024, 5, 20)) == []
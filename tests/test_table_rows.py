@@ -0,0 +1,63 @@
+from docx import Document
+from docx.oxml.ns import qn
+
+from engine.table_rows import expand_rows
+
+RECORDS = [
+    {"date": {"text": "01/10", "align": "center"}, "site": {"text": "North", "align": "left"},
+     "count": {"text": "3", "align": "right"}},
+    {"date": {"text": "02/10", "align": "left"}, "site": {"text": "South", "align": "right"},
+     "count": {"text": "5", "align": "center"}},
+]
+
+
+def make_table():
+    """Header row, then a placeholder row: {{date}} | {{site}} over two merged columns
+    with a nested table under it | {{count}}."""
+    doc = Document()
+    table = doc.add_table(rows=2, cols=4)
+    for cell, text in zip(table.rows[0].cells, ["Date", "Site", "", "Count"]):
+        cell.text = text
+    row = table.rows[1]
+    row.cells[0].text = "{{date}}"
+    site = row.cells[1].merge(row.cells[2])
+    site.text = "{{site}}"
+    nested = site.add_table(rows=1, cols=2)
+    nested.cell(0, 0).text = "inner a"
+    nested.cell(0, 1).text = "inner b"
+    row.cells[3].text = "{{count}}"
+    return table
+
+
+def cells(tr) -> list:
+    """(text, alignment) of each direct cell of a w:tr."""
+    result = []
+    for tc in tr.findall(qn("w:tc")):
+        text = "".join(t.text or "" for t in tc.iter(qn("w:t")))
+        jc = tc.find(f"{qn('w:p')}/{qn('w:pPr')}/{qn('w:jc')}")
+        result.append((text, jc.get(qn("w:val"))))
+    return result
+
+
+def test_expand_rows_with_nested_table_and_merged_cell():
+    table = make_table()
+    tbl = table._tbl
+
+    consumed = expand_rows(tbl.tr_lst[1], RECORDS)
+
+    assert consumed == {"date", "site", "count"}
+    rows = tbl.tr_lst
+    assert len(rows) == 3
+    assert cells(rows[1]) == [("01/10", "center"), ("North", "left"), ("3", "right")]
+    assert cells(rows[2]) == [("02/10", "left"), ("South", "right"), ("5", "center")]
+    # The merged cell keeps its span; the nested table is not copied into the data rows
+    site = rows[1].findall(qn("w:tc"))[1]
+    assert site.find(f"{qn('w:tcPr')}/{qn('w:gridSpan')}").get(qn("w:val")) == "2"
+    assert site.find(qn("w:tbl")) is None
+
+
+def test_expand_rows_without_records_removes_the_row():
+    table = make_table()
+
+    assert expand_rows(table._tbl.tr_lst[1], []) == {"date", "site", "count"}
+    assert len(table._tbl.tr_lst) == 1
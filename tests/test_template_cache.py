@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+import engine.template_cache as template_cache
+from engine.template_cache import cache_stats, clear_template_cache, load_cached, template_digest
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    monkeypatch.setattr(template_cache, "TEMPLATES_DIR", str(tmp_path))
+    clear_template_cache()
+    path = tmp_path / "report.docx"
+    path.write_bytes(b"version 1")
+    yield path
+    clear_template_cache()
+
+
+def build_counter():
+    built = []
+
+    def build(path):
+        with open(path, "rb") as f:
+            built.append(f.read())
+        return len(built)
+
+    return built, build
+
+
+def counts() -> tuple:
+    stats = cache_stats()
+    return stats["hits"], stats["misses"], stats["invalidations"], stats["entries"]
+
+
+def test_built_once_per_template_version(template):
+    built, build = build_counter()
+
+    assert load_cached("report.docx", "kind", build) == 1
+    assert load_cached("report.docx", "kind", build) == 1
+    assert counts() == (1, 1, 0, 1)
+
+    # Touched but unchanged: re-hashed, kept
+    st = os.stat(template)
+    os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert load_cached("report.docx", "kind", build) == 1
+    assert counts() == (2, 1, 0, 1)
+
+    digest = template_digest("report.docx")
+    template.write_bytes(b"version 2")
+    os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert load_cached("report.docx", "kind", build) == 2
+    assert built == [b"version 1", b"version 2"]
+    assert counts() == (2, 2, 1, 1)
+    assert template_digest("report.docx") != digest
+
+
+def test_kinds_are_cached_separately(template):
+    _, build = build_counter()
+    load_cached("report.docx", "a", build)
+    load_cached("report.docx", "b", build)
+    assert counts() == (0, 2, 0, 2)
+
+    clear_template_cache()
+    assert counts() == (0, 0, 0, 0)
@@ -0,0 +1,122 @@
+"""
+Clipboard helpers for TableInput: a one-pass TSV parser that understands the quoting
+Excel uses for multi-line cells, and a column-wise converter to the table's cell texts.
+Kept free of Qt so large pastes can be profiled without a GUI.
+"""
+import re
+from datetime import datetime
+
+DATE_INPUT_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S")
+
+_LINE_BREAK = re.compile(r"\r\n|\n|\r")
+_DELIMITER = re.compile(r"[\t\r\n]")
+# A quoted cell must be followed by a delimiter or the end of the text
+_QUOTED_CELL = re.compile(r'"((?:[^"]|"")*)"(?=[\t\r\n]|\Z)')
+
+
+def parse_tsv(text: str) -> list:
+    """Rows of cell strings. A cell starting with '"' runs to the closing quote and may hold
+    tabs, newlines and doubled quotes, as Excel and LibreOffice copy them. Trailing empty
+    lines are dropped."""
+    if '"' not in text:
+        rows = [line.split("\t") for line in _LINE_BREAK.split(text)]
+    else:
+        rows = _parse_quoted(text)
+    while rows and not any(rows[-1]):
+        rows.pop()
+    return rows
+
+
+def _parse_quoted(text: str) -> list:
+    rows = []
+    row = []
+    i = 0
+    n = len(text)
+    while True:
+        if i < n and text[i] == '"':
+            match = _QUOTED_CELL.match(text, i)
+            if match:
+                row.append(match.group(1).replace('""', '"'))
+                i = match.end(1) + 1
+            else:
+                # Not a quoted cell after all (e.g. '"5" inch' or no closing quote): take it verbatim
+                end = _DELIMITER.search(text, i)
+                j = end.start() if end else n
+                row.append(text[i:j])
+                i = j
+        else:
+            end = _DELIMITER.search(text, i)
+            j = end.start() if end else n
+            row.append(text[i:j])
+            i = j
+
+        if i >= n:
+            rows.append(row)
+            return rows
+        if text[i] == "\t":
+            i += 1
+            continue
+        rows.append(row)
+        row = []
+        i += 2 if text.startswith("\r\n", i) else 1
+        if i >= n:
+            return rows
+
+
+def _convert_date(text: str):
+    text = text.strip()
+    for fmt in DATE_INPUT_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%d/%m/%Y")
+        except ValueError:
+            continue
+    return None
+
+
+def _convert_number(text: str):
+    if text.isdigit():
+        return text
+    cleaned = "".join(text.split()).replace("\u00a0", "").replace("\u202f", "")
+    if not cleaned:
+        return ""
+    head, _, tail = cleaned.rpartition(",")
+    if head and "." not in cleaned and len(tail) != 3:
+        cleaned = f"{head}.{tail}"  # decimal comma
+    try:
+        value = float(cleaned.replace(",", ""))
+    except ValueError:
+        return None
+    return str(int(value)) if value.is_integer() else None
+
+
+def column_converter(col: dict):
+    """text -> cell text, or None when the column type cannot hold it."""
+    col_type = col.get("type", "text")
+    if col_type == "date":
+        return _convert_date
+    if col_type == "number":
+        return _convert_number
+    if col_type == "combo":
+        options = col.get("options", [])
+        lookup = {str(o).strip().casefold(): o for o in options}
+        return lambda text: lookup.get(text.strip().casefold())
+    return lambda text: text
+
+
+def convert_block(columns: list, rows: list) -> tuple:
+    """Converts a parsed block column by column, each distinct value once.
+
+    Returns (cells, rejected) where cells[r][c] is the converted text, or None for a value
+    the column rejected and for positions past the end of a short row.
+    """
+    columns_out = []
+    rejected = 0
+    for c, col in enumerate(columns):
+        raw = [row[c] if c < len(row) else None for row in rows]
+        convert = column_converter(col)
+        converted = {text: convert(text) for text in set(raw) if text is not None}
+        converted[None] = None
+        values = [converted[text] for text in raw]
+        rejected += sum(1 for text, value in zip(raw, values) if value is None and text is not None)
+        columns_out.append(values)
+    return [list(cells) for cells in zip(*columns_out)], rejected
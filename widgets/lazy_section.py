@@ -0,0 +1,66 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PySide6.QtCore import Signal
+
+
+class LazySection(QWidget):
+    """Stands in for a heavy input (table, multi-week) until the user opens it.
+
+    `factory()` builds the real widget; `normalize(value)` gives what get_data() returns while
+    it is not built, so forms can be read, previewed and submitted without building it.
+    """
+
+    changed = Signal()
+
+    def __init__(self, factory, normalize, summary, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.normalize = normalize
+        self.summary = summary
+        self.widget = None
+        self._pending = None
+
+        self.summary_label = QLabel()
+        self.open_button = QPushButton("✏️ Edit")
+        self.open_button.clicked.connect(self.build)
+
+        header = QHBoxLayout()
+        header.setContentsMargins(0, 0, 0, 0)
+        header.addWidget(self.summary_label)
+        header.addStretch()
+        header.addWidget(self.open_button)
+        self.header = QWidget()
+        self.header.setLayout(header)
+
+        self.layout_ = QVBoxLayout()
+        self.layout_.setContentsMargins(0, 0, 0, 0)
+        self.layout_.addWidget(self.header)
+        self.setLayout(self.layout_)
+        self.set_data(None)
+
+    def build(self):
+        if self.widget is not None:
+            return self.widget
+        self.widget = self.factory()
+        if self._pending is not None:
+            self.widget.set_data(self._pending)
+        self._pending = None
+        self.widget.changed.connect(self.changed.emit)
+        self.header.setVisible(False)
+        self.layout_.addWidget(self.widget)
+        return self.widget
+
+    def set_data(self, value):
+        """Replaces the content; a built widget is dropped and rebuilt on the next open."""
+        if self.widget is not None:
+            self.layout_.removeWidget(self.widget)
+            self.widget.deleteLater()
+            self.widget = None
+            self.header.setVisible(True)
+        self._pending = value
+        self.summary_label.setText(self.summary(self.normalize(value)))
+        self.changed.emit()
+
+    def get_data(self):
+        if self.widget is not None:
+            return self.widget.get_data()
+        return self.normalize(self._pending)
@@ -1,13 +1,25 @@
 # widgets/multi_week_input.py
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QGroupBox, QFormLayout, QLineEdit, QLabel
+    QWidget, QVBoxLayout, QGroupBox, QFormLayout, QLineEdit
 )
 from PySide6.QtGui import QFont
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
+
+WEEKS = 4
+WEEK_FIELDS = ("visits", "incidents", "repairs")
+
+
+def normalize_weeks(data_list) -> list:
+    """What MultiWeekInput.get_data() returns after set_data(data_list)."""
+    if not isinstance(data_list, list) or len(data_list) != WEEKS:
+        data_list = [{}] * WEEKS
+    return [{key: week.get(key, "") for key in WEEK_FIELDS} for week in data_list]
 
 
 class MultiWeekInput(QWidget):
+    changed = Signal()
+
     def __init__(self):
         super().__init__()
         self.fields = []  # List of week field dicts
@@ -15,17 +27,18 @@ class MultiWeekInput(QWidget):
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignTop)
 
-        for i in range(4):
+        for i in range(WEEKS):
             group = QGroupBox(f"📅 Week {i + 1}")
             group.setFont(QFont("Segoe UI", 10, QFont.Bold))
             form = QFormLayout()
             week_fields = {}
 
-            for field_name in ["visits", "incidents", "repairs"]:
+            for field_name in WEEK_FIELDS:
                 label = field_name.capitalize()
                 field = QLineEdit()
                 field.setPlaceholderText(f"Enter {field_name}")
                 field.setMinimumHeight(30)
+                field.textChanged.connect(self.changed.emit)
                 form.addRow(label, field)
                 week_fields[field_name] = field
 
@@ -45,7 +58,7 @@ class MultiWeekInput(QWidget):
         return result
 
     def set_data(self, data_list):
-        if not isinstance(data_list, list) or len(data_list) != 4:
+        if not isinstance(data_list, list) or len(data_list) != WEEKS:
             return
         for i, week_fields in enumerate(self.fields):
             for key in week_fields:
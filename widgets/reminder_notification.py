@@ -0,0 +1,88 @@
+from datetime import datetime
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QApplication
+)
+from PySide6.QtCore import Qt, Signal
+
+
+class ReminderNotification(QWidget):
+    """Non-modal digest of due reports, shown in the corner of the screen without taking focus."""
+
+    open_requested = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Tool | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setWindowTitle("⏰ Report Reminder")
+        self.setMinimumWidth(360)
+        self._ids = set()
+
+        self.header = QLabel()
+        self.header.setStyleSheet("font-size: 14px; font-weight: bold;")
+
+        self.list_widget = QListWidget()
+        self.list_widget.itemDoubleClicked.connect(self._open_item)
+
+        open_btn = QPushButton("📝 Open")
+        open_btn.clicked.connect(lambda: self._open_item(self.list_widget.currentItem()))
+        dismiss_btn = QPushButton("✖ Dismiss")
+        dismiss_btn.clicked.connect(self.dismiss)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(open_btn)
+        buttons.addWidget(dismiss_btn)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.header)
+        layout.addWidget(self.list_widget)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+    def add_reminders(self, templates: list):
+        """Merges `templates` into the digest; a template already listed is not repeated."""
+        now = datetime.now().strftime("%H:%M")
+        for template in templates:
+            tid = str(template.get("id"))
+            if tid in self._ids:
+                continue
+            self._ids.add(tid)
+            item = QListWidgetItem(f"🔔 {now}  {tid} - {template.get('title', 'Unnamed Report')}")
+            item.setData(Qt.UserRole, template)
+            self.list_widget.addItem(item)
+
+        if not self.list_widget.count():
+            return
+        if self.list_widget.currentRow() < 0:
+            self.list_widget.setCurrentRow(0)
+        self._update_header()
+        if not self.isVisible():
+            self.adjustSize()
+            self.move_to_corner()
+            self.show()
+        self.raise_()
+
+    def _update_header(self):
+        self.header.setText(f"⏰ It's time to fill {self.list_widget.count()} report(s):")
+
+    def move_to_corner(self):
+        screen = self.screen() or QApplication.primaryScreen()
+        area = screen.availableGeometry()
+        self.move(area.right() - self.width() - 16, area.bottom() - self.height() - 16)
+
+    def _open_item(self, item):
+        if item is None:
+            return
+        template = item.data(Qt.UserRole)
+        self.list_widget.takeItem(self.list_widget.row(item))
+        self._ids.discard(str(template.get("id")))
+        if self.list_widget.count():
+            self._update_header()
+        else:
+            self.hide()
+        self.open_requested.emit(template)
+
+    def dismiss(self):
+        self.list_widget.clear()
+        self._ids.clear()
+        self.hide()
@@ -1,83 +1,231 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QPushButton,
-    QHBoxLayout, QComboBox, QLineEdit, QGridLayout,
-    QFileDialog, QTableWidgetItem, QTableWidget,
+    QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QComboBox, QLineEdit,
+    QFileDialog, QTableView, QHeaderView, QStyledItemDelegate, QAbstractItemView, QMenu,
+    QProgressDialog, QMessageBox,
 )
-from PySide6.QtCore import QDate
+from PySide6.QtCore import Qt, QDate, Signal, QAbstractTableModel, QModelIndex, QThread
 from PySide6.QtGui import QKeySequence, QGuiApplication, QIntValidator, QShortcut
 from PySide6.QtWidgets import QDateEdit
-import openpyxl
 
-
-class CellEditor(QWidget):
-    def __init__(self, text="", align="left", field_type="text",options=None):
-        super().__init__()
-
-        self.options = options or []
-        self.align_combo = QComboBox()
-        self.align_combo.addItems(["left", "center", "right"])
-        self.align_combo.setCurrentText(align)
-
-        if field_type == "date":
-            self.input = QDateEdit()
-            self.input.setCalendarPopup(True)
-            self.input.setDate(QDate.currentDate())
-            if text:
-                parsed = QDate.fromString(text, "dd/MM/yyyy")
-                if parsed.isValid():
-                    self.input.setDate(parsed)
-        elif field_type == "combo":
-            self.input = QComboBox()
-            self.input.addItems(self.options if hasattr(self, "options") else [])
-            self.input.setCurrentText(text)
+from widgets.clipboard_table import convert_block, parse_tsv
+
+DATE_FORMAT = "dd/MM/yyyy"
+ALIGNS = ("left", "center", "right")
+ALIGN_ROLE = Qt.UserRole + 1
+
+_QT_ALIGN = {
+    "left": Qt.AlignLeft | Qt.AlignVCenter,
+    "center": Qt.AlignCenter,
+    "right": Qt.AlignRight | Qt.AlignVCenter,
+}
+
+
+def default_text(col: dict) -> str:
+    """What a fresh cell holds: today for dates, the first option for combos."""
+    col_type = col.get("type", "text")
+    if col_type == "date":
+        return QDate.currentDate().toString(DATE_FORMAT)
+    if col_type == "combo":
+        options = col.get("options", [])
+        return options[0] if options else ""
+    return ""
+
+
+def coerce_text(col: dict, text: str, current: str) -> str:
+    """`text` as the cell would accept it; dates and combos keep `current` for invalid input."""
+    col_type = col.get("type", "text")
+    if col_type == "date":
+        return text if QDate.fromString(text, DATE_FORMAT).isValid() else current
+    if col_type == "combo":
+        return text if text in col.get("options", []) else current
+    return text
+
+
+class TableModel(QAbstractTableModel):
+    """Cell texts and alignments in plain row lists; editors exist only while a cell is edited."""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self._texts = []
+        self._aligns = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._texts)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]["name"].capitalize()
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._texts[r][c]
+        if role == Qt.TextAlignmentRole:
+            return _QT_ALIGN.get(self._aligns[r][c], _QT_ALIGN["left"])
+        if role == ALIGN_ROLE:
+            return self._aligns[r][c]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        r, c = index.row(), index.column()
+        if role == Qt.EditRole:
+            self._texts[r][c] = "" if value is None else str(value)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        elif role == ALIGN_ROLE and value in ALIGNS:
+            self._aligns[r][c] = value
+            self.dataChanged.emit(index, index, [Qt.TextAlignmentRole])
         else:
-            self.input = QLineEdit(text)
-            if field_type == "number":
-                self.input.setValidator(QIntValidator())
+            return False
+        return True
 
+    def blank_row(self):
+        return [default_text(col) for col in self.columns], [col.get("align", "left") for col in self.columns]
 
-        layout = QGridLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.input, 0, 0)
-        layout.addWidget(self.align_combo, 0, 1)
-        self.setLayout(layout)
-
-    def get_text(self):
-        if isinstance(self.input, QDateEdit):
-            return self.input.date().toString("dd/MM/yyyy")
-        elif isinstance(self.input, QComboBox):
-            return self.input.currentText()
-        return self.input.text()
-
-    def set_text(self, text):
-        if isinstance(self.input, QDateEdit):
-            date = QDate.fromString(text, "dd/MM/yyyy")
-            if date.isValid():
-                self.input.setDate(date)
-        elif isinstance(self.input, QComboBox):
-            index = self.input.findText(text)
-            if index >= 0:
-                self.input.setCurrentIndex(index)
-            else:
-                self.input.setCurrentText(text)
+    def insert_rows(self, row: int, texts: list, aligns: list):
+        """Inserts many rows with a single rowsInserted notification."""
+        if not texts:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(texts) - 1)
+        self._texts[row:row] = texts
+        self._aligns[row:row] = aligns
+        self.endInsertRows()
+
+    def append_rows(self, texts: list, aligns: list):
+        self.insert_rows(len(self._texts), texts, aligns)
+
+    def paste_block(self, row: int, column: int, cells: list):
+        """Writes `cells` from (row, column), None leaving a cell as it is. Existing rows are
+        overwritten with one dataChanged, rows past the end are appended with one insert."""
+        row = min(row, len(self._texts))
+        existing = min(len(cells), len(self._texts) - row)
+        for r, values in enumerate(cells[:existing], row):
+            texts = self._texts[r]
+            for c, value in enumerate(values, column):
+                if value is not None:
+                    texts[c] = value
+        if existing:
+            self.dataChanged.emit(self.index(row, column), self.index(row + existing - 1, len(self.columns) - 1),
+                                  [Qt.DisplayRole, Qt.EditRole])
+
+        blank_texts, blank_aligns = self.blank_row()
+        new_texts = []
+        for values in cells[existing:]:
+            texts = list(blank_texts)
+            for c, value in enumerate(values, column):
+                if value is not None:
+                    texts[c] = value
+            new_texts.append(texts)
+        self.insert_rows(len(self._texts), new_texts, [list(blank_aligns) for _ in new_texts])
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self._texts):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._texts[row:row + count]
+        del self._aligns[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def set_aligns(self, indexes, align: str):
+        if align not in ALIGNS or not indexes:
+            return
+        for index in indexes:
+            self._aligns[index.row()][index.column()] = align
+        rows = [i.row() for i in indexes]
+        cols = [i.column() for i in indexes]
+        self.dataChanged.emit(self.index(min(rows), min(cols)), self.index(max(rows), max(cols)),
+                              [Qt.TextAlignmentRole])
+
+    def rows(self) -> list:
+        names = [col["name"] for col in self.columns]
+        return [
+            {name: {"text": text, "align": align} for name, text, align in zip(names, texts, aligns)}
+            for texts, aligns in zip(self._texts, self._aligns)
+        ]
+
+
+class CellDelegate(QStyledItemDelegate):
+    """Creates a QLineEdit, QDateEdit or QComboBox for the column type, only while editing."""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+
+    def createEditor(self, parent, option, index):
+        col = self.columns[index.column()]
+        col_type = col.get("type", "text")
+        if col_type == "date":
+            editor = QDateEdit(parent)
+            editor.setCalendarPopup(True)
+            editor.setDisplayFormat(DATE_FORMAT)
+        elif col_type == "combo":
+            editor = QComboBox(parent)
+            editor.addItems(col.get("options", []))
         else:
-            self.input.setText(text)
-
-    def get_align(self):
-        return self.align_combo.currentText()
+            editor = QLineEdit(parent)
+            if col_type == "number":
+                editor.setValidator(QIntValidator(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        text = index.data(Qt.EditRole) or ""
+        if isinstance(editor, QDateEdit):
+            date = QDate.fromString(text, DATE_FORMAT)
+            editor.setDate(date if date.isValid() else QDate.currentDate())
+        elif isinstance(editor, QComboBox):
+            i = editor.findText(text)
+            if i >= 0:
+                editor.setCurrentIndex(i)
+        else:
+            editor.setText(text)
 
-    def set_align(self, align):
-        self.align_combo.setCurrentText(align)
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QDateEdit):
+            model.setData(index, editor.date().toString(DATE_FORMAT))
+        elif isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText())
+        else:
+            model.setData(index, editor.text())
 
 
 class TableInput(QWidget):
+    changed = Signal()
+
     def __init__(self, columns):
         super().__init__()
         self.columns = columns  # list of dicts: [{name, type, align}]
-        self.table = QTableWidget(0, len(columns))
-
-        headers = [col["name"].capitalize() for col in columns]
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model = TableModel(columns, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(CellDelegate(columns, self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+                                   | QAbstractItemView.AnyKeyPressed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        # Fixed row heights keep layout O(1) per row for large tables
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(28)
+        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self.show_context_menu)
+
+        for signal in (self.model.dataChanged, self.model.rowsInserted, self.model.rowsRemoved, self.model.modelReset):
+            signal.connect(lambda *_: self.changed.emit())
 
         # Buttons
         add_btn = QPushButton("➕ Add Row")
@@ -97,6 +245,12 @@ class TableInput(QWidget):
         btn_layout.addWidget(remove_btn)
         btn_layout.addWidget(paste_btn)
         btn_layout.addWidget(import_btn)
+        for align, label in (("left", "⬅"), ("center", "↔"), ("right", "➡")):
+            btn = QPushButton(label)
+            btn.setToolTip(f"Align selected cells {align}")
+            btn.setFixedWidth(36)
+            btn.clicked.connect(lambda _, a=align: self.align_selected(a))
+            btn_layout.addWidget(btn)
 
         layout = QVBoxLayout()
         layout.addLayout(btn_layout)
@@ -104,99 +258,169 @@ class TableInput(QWidget):
         self.setLayout(layout)
 
         self.enable_paste_shortcut()
+        self._import = None
+        self._import_thread = None
 
     def add_row(self):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-
-        for col in range(self.table.columnCount()):
-            col_info = self.columns[col]
-            col_type = col_info.get("type", "text")
-            default_align = col_info.get("align", "left")
-            options = col_info.get("options", [])
-            cell_widget = CellEditor(field_type=col_type, align=default_align, options=options)
-            self.table.setCellWidget(row, col, cell_widget)
+        texts, aligns = self.model.blank_row()
+        self.model.append_rows([texts], [aligns])
 
     def remove_selected(self):
-        selected = self.table.selectionModel().selectedRows()
-        for index in sorted(selected, reverse=True):
-            self.table.removeRow(index.row())
+        # Fully selected rows only (row header), as before the model rewrite
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()}, reverse=True)
+        # Remove contiguous runs in one call each
+        while rows:
+            end = start = rows.pop(0)
+            while rows and rows[0] == start - 1:
+                start = rows.pop(0)
+            self.model.removeRows(start, end - start + 1)
+
+    def align_selected(self, align: str):
+        self.model.set_aligns(self.table.selectionModel().selectedIndexes(), align)
+
+    def show_context_menu(self, pos):
+        menu = QMenu(self)
+        for align in ALIGNS:
+            menu.addAction(f"Align {align}", lambda a=align: self.align_selected(a))
+        menu.addSeparator()
+        menu.addAction("➖ Remove Selected", self.remove_selected)
+        menu.exec(self.table.viewport().mapToGlobal(pos))
 
     def get_data(self):
-        rows = []
-        for r in range(self.table.rowCount()):
-            row_data = {}
-            for c, col in enumerate(self.columns):
-                name = col["name"]
-                cell_widget = self.table.cellWidget(r, c)
-                if isinstance(cell_widget, CellEditor):
-                    row_data[name] = {
-                        "text": cell_widget.get_text(),
-                        "align": cell_widget.get_align()
-                    }
-            rows.append(row_data)
-        return rows
+        return self.model.rows()
 
-    def set_data(self, rows):
-        for row_data in rows:
-            self.add_row()
-            r = self.table.rowCount() - 1
+    def _rows_from_values(self, rows_values) -> tuple:
+        """(texts, aligns) for new rows from per-column values (str or {"text", "align"})."""
+        all_texts, all_aligns = [], []
+        for values in rows_values:
+            texts, aligns = self.model.blank_row()
             for c, col in enumerate(self.columns):
-                name = col["name"]
-                val = row_data.get(name, "")
-
+                val = values(c, col)
+                if val is None:
+                    continue
                 if isinstance(val, dict):
                     text = val.get("text", "")
                     align = val.get("align", "left")
                 else:
                     text = str(val)
                     align = "left"
+                texts[c] = coerce_text(col, text, texts[c])
+                aligns[c] = align if align in ALIGNS else "left"
+            all_texts.append(texts)
+            all_aligns.append(aligns)
+        return all_texts, all_aligns
 
-                cell_widget = self.table.cellWidget(r, c)
-                if isinstance(cell_widget, CellEditor):
-                    cell_widget.set_text(text)
-                    cell_widget.set_align(align)
+    def set_data(self, rows):
+        texts, aligns = self._rows_from_values(
+            (lambda c, col, row=row: row.get(col["name"], "")) for row in rows
+        )
+        self.model.append_rows(texts, aligns)
 
     def enable_paste_shortcut(self):
         paste = QShortcut(QKeySequence("Ctrl+V"), self)
         paste.activated.connect(self.handle_paste)
 
     def handle_paste(self):
+        """Pastes tab-separated clipboard text at the current cell, or appends it when nothing
+        is selected. Values a column cannot hold are skipped."""
         clipboard = QGuiApplication.clipboard()
         text = clipboard.text()
         if not text:
             return
+        rows = parse_tsv(text)
+        if not rows:
+            return
 
-        rows = [line.split('\t') for line in text.strip().splitlines()]
-        for row_data in rows:
-            self.add_row()
-            r = self.table.rowCount() - 1
-            for c, cell_text in enumerate(row_data):
-                if c >= self.table.columnCount():
-                    break
-                cell_widget = self.table.cellWidget(r, c)
-                field_type = self.columns[c].get("type", "text")
-                if isinstance(cell_widget, CellEditor):
-                    cell_widget.set_text(cell_text.strip())
-                    cell_widget.set_align("left")
+        current = self.table.currentIndex()
+        if current.isValid() and self.table.selectionModel().hasSelection():
+            row, column = current.row(), current.column()
+        else:
+            row, column = self.model.rowCount(), 0
+
+        cells, rejected = convert_block(self.columns[column:], rows)
+        self.model.paste_block(row, column, cells)
+        self.table.scrollTo(self.model.index(min(row, self.model.rowCount() - 1), column))
+        if rejected:
+            print(f"[WARN] Paste: {rejected} value(s) did not match their column type and were skipped")
 
     def import_from_xlsx(self):
+        # openpyxl loads only when an import is started
+        from widgets.xlsx_import import XlsxImportDialog, XlsxImportWorker
+
+        if self._import is not None or self._import_thread is not None:
+            return
         file_path, _ = QFileDialog.getOpenFileName(self, "Open Excel File", "", "Excel Files (*.xlsx)")
         if not file_path:
             return
 
-        wb = openpyxl.load_workbook(file_path)
-        ws = wb.active
-
-        for row in ws.iter_rows(values_only=True):
-            self.add_row()
-            r = self.table.rowCount() - 1
-            for c, cell_value in enumerate(row):
-                if c >= self.table.columnCount():
-                    break
-                text = str(cell_value) if cell_value is not None else ""
-                cell_widget = self.table.cellWidget(r, c)
-                field_type = self.columns[c].get("type", "text")
-                if isinstance(cell_widget, CellEditor):
-                    cell_widget.set_text(text)
-                    cell_widget.set_align("left")
+        try:
+            dialog = XlsxImportDialog(file_path, self.columns, self)
+        except Exception as e:
+            QMessageBox.critical(self, "❌ Error", f"Cannot open {file_path}:\n{e}")
+            return
+        if not dialog.exec():
+            return
+        sheet, first_row, mapping = dialog.options()
+
+        progress = QProgressDialog("📂 Importing rows...", "❌ Cancel", 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+
+        # Parented and referenced until it has finished, so it is never destroyed while running
+        thread = QThread(self)
+        self._import_thread = thread
+        worker = XlsxImportWorker(file_path, sheet, first_row, mapping)
+        worker.moveToThread(thread)
+        self._import = {"thread": thread, "worker": worker, "progress": progress, "start": self.model.rowCount()}
+
+        thread.started.connect(worker.run)
+        worker.chunk.connect(self._append_import_chunk)
+        worker.progress.connect(self._on_import_progress)
+        worker.finished.connect(lambda count: self._finish_import(f"Imported {count} row(s)"))
+        worker.failed.connect(lambda msg: self._finish_import(None, error=msg))
+        worker.canceled.connect(lambda: self._finish_import(None))
+        for signal in (worker.finished, worker.failed, worker.canceled):
+            signal.connect(thread.quit)
+            signal.connect(worker.deleteLater)
+        thread.finished.connect(self._on_import_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+        # Called directly: the worker's own thread is busy streaming the sheet
+        progress.canceled.connect(lambda: worker.cancel())
+
+        self.table.setUpdatesEnabled(False)
+        thread.start()
+
+    def _append_import_chunk(self, rows):
+        if self._import is None:
+            return
+        texts, aligns = self._rows_from_values(
+            (lambda c, col, row=row: row[c]) for row in rows
+        )
+        self.model.append_rows(texts, aligns)
+
+    def _on_import_progress(self, done, expected):
+        if self._import is None:
+            return
+        progress = self._import["progress"]
+        if expected:
+            progress.setMaximum(expected)
+            progress.setValue(min(done, expected))
+        progress.setLabelText(f"📂 Imported {done} row(s)...")
+
+    def _on_import_thread_finished(self):
+        self._import_thread = None
+
+    def _finish_import(self, message, error=None):
+        state, self._import = self._import, None
+        if state is None:
+            return
+        state["progress"].close()
+        if message is None:
+            # Cancelled or failed: drop the partial import
+            start = state["start"]
+            self.model.removeRows(start, self.model.rowCount() - start)
+        self.table.setUpdatesEnabled(True)
+        if error:
+            QMessageBox.critical(self, "❌ Error", f"Import failed:\n{error}")
+        elif message:
+            print(f"[DEBUG] {message}")
@@ -0,0 +1,191 @@
+import re
+import unicodedata
+from datetime import date, datetime
+
+import openpyxl
+from PySide6.QtWidgets import (
+    QDialog, QFormLayout, QComboBox, QSpinBox, QDialogButtonBox, QLabel, QVBoxLayout, QGroupBox
+)
+from PySide6.QtCore import QObject, Signal
+
+CHUNK_ROWS = 500
+NO_COLUMN = "(none)"
+
+
+def normalize_header(text) -> str:
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def cell_text(value) -> str:
+    """Cell value as the table stores it: dates as dd/MM/yyyy, whole floats without '.0'."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def read_sheet_names(path: str) -> list:
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+
+def read_header(path: str, sheet: str, header_row: int) -> list:
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in wb[sheet].iter_rows(min_row=header_row, max_row=header_row, values_only=True):
+            return [cell_text(v) for v in row]
+        return []
+    finally:
+        wb.close()
+
+
+def match_columns(columns: list, headers: list) -> list:
+    """For each table column, the index of the header with the same normalized name, or None."""
+    positions = {}
+    for i, header in enumerate(headers):
+        positions.setdefault(normalize_header(header), i)
+    return [positions.get(normalize_header(col["name"])) for col in columns]
+
+
+class XlsxImportWorker(QObject):
+    """Streams a sheet in read-only mode and hands rows over in chunks of CHUNK_ROWS."""
+
+    chunk = Signal(list)              # rows, each a list of cell texts in table column order
+    progress = Signal(int, int)       # (rows read, rows expected or 0)
+    finished = Signal(int)
+    failed = Signal(str)
+    canceled = Signal()
+
+    def __init__(self, path: str, sheet: str, first_row: int, mapping: list):
+        super().__init__()
+        self.path = path
+        self.sheet = sheet
+        self.first_row = first_row
+        self.mapping = mapping
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        try:
+            ws = wb[self.sheet]
+            expected = max(0, (ws.max_row or 0) - self.first_row + 1)
+            batch = []
+            count = 0
+            for row in ws.iter_rows(min_row=self.first_row, values_only=True):
+                if self._cancelled:
+                    self.canceled.emit()
+                    return
+                if not any(v is not None and str(v).strip() for v in row):
+                    continue
+                batch.append([
+                    cell_text(row[i]) if i is not None and i < len(row) else None
+                    for i in self.mapping
+                ])
+                if len(batch) >= CHUNK_ROWS:
+                    count += len(batch)
+                    self.chunk.emit(batch)
+                    self.progress.emit(count, expected)
+                    batch = []
+            if batch:
+                count += len(batch)
+                self.chunk.emit(batch)
+            self.progress.emit(count, expected)
+            self.finished.emit(count)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            wb.close()
+
+
+class XlsxImportDialog(QDialog):
+    """Picks the sheet, the header row and which spreadsheet column feeds each table column."""
+
+    def __init__(self, path: str, columns: list, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("📂 Import .xlsx")
+        self.path = path
+        self.columns = columns
+        self.headers = []
+
+        self.sheet_combo = QComboBox()
+        self.sheet_combo.addItems(read_sheet_names(path))
+        self.header_spin = QSpinBox()
+        self.header_spin.setRange(0, 1000)
+        self.header_spin.setValue(1)
+        self.header_spin.setSpecialValueText("No header")
+
+        options = QFormLayout()
+        options.addRow("Sheet", self.sheet_combo)
+        options.addRow("Header row", self.header_spin)
+
+        self.mapping_combos = []
+        mapping_form = QFormLayout()
+        for col in columns:
+            combo = QComboBox()
+            self.mapping_combos.append(combo)
+            mapping_form.addRow(col["name"].capitalize(), combo)
+        mapping_box = QGroupBox("Columns")
+        mapping_box.setLayout(mapping_form)
+
+        self.status = QLabel()
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(options)
+        layout.addWidget(mapping_box)
+        layout.addWidget(self.status)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        self.sheet_combo.currentTextChanged.connect(self.reload_headers)
+        self.header_spin.valueChanged.connect(self.reload_headers)
+        self.reload_headers()
+
+    def reload_headers(self, *_):
+        header_row = self.header_spin.value()
+        try:
+            self.headers = read_header(self.path, self.sheet_combo.currentText(), max(1, header_row))
+        except Exception as e:
+            self.headers = []
+            self.status.setText(f"❌ {e}")
+            return
+
+        if header_row:
+            labels = [h or f"Column {i + 1}" for i, h in enumerate(self.headers)]
+            matched = match_columns(self.columns, self.headers)
+        else:
+            # No header: spreadsheet columns are taken in order
+            labels = [f"Column {i + 1}" for i in range(len(self.headers))]
+            matched = [i if i < len(labels) else None for i in range(len(self.columns))]
+
+        for combo, index in zip(self.mapping_combos, matched):
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(NO_COLUMN)
+            combo.addItems(labels)
+            combo.setCurrentIndex(0 if index is None else index + 1)
+            combo.blockSignals(False)
+
+        found = sum(1 for i in matched if i is not None)
+        self.status.setText(f"{found} of {len(self.columns)} column(s) matched")
+
+    def options(self) -> tuple:
+        """(sheet, first data row, spreadsheet column index per table column or None)."""
+        mapping = [combo.currentIndex() - 1 if combo.currentIndex() > 0 else None for combo in self.mapping_combos]
+        return self.sheet_combo.currentText(), self.header_spin.value() + 1, mapping